@@ -1,7 +1,7 @@
 const fs = require("fs");
 const path = require("path");
-const { spawn } = require("child_process");
 const logger = require("../config/logger");
+const { extractMetadata } = require("../services/pythonWorkerPool");
 const { sequelize, File } = require("../models");
 
 const ALLOWED_MIME_TYPES = [
@@ -39,59 +39,8 @@ exports.processFile = async (req, res) => {
   const filePath = path.resolve(req.file.path);
 
   try {
-    const pythonScriptPath = path.resolve(
-      __dirname,
-      "../services/python_scripts/extract_metadata.py"
-    );
-    const pythonExecutablePath =
-      "/home/yael/Desktop/proyectos_web/baseball/Plataform_LMB/backend/back_app_baseball/env/bin/python3";
-
-    const pythonProcess = spawn(pythonExecutablePath, [
-      pythonScriptPath,
-      filePath,
-    ]);
-
-    let pythonOutput = "";
-    let pythonError = "";
-
-    pythonProcess.stdout.on("data", (data) => {
-      const message = data.toString();
-      logger.info(`[Python stdout] ${message}`);
-      pythonOutput += message;
-    });
-
-    pythonProcess.stderr.on("data", (data) => {
-      const message = data.toString();
-      logger.error(`[Python stderr] ${message}`);
-      pythonError += message;
-    });
-
-    await new Promise((resolve, reject) => {
-      pythonProcess.on("close", (code) => {
-        if (code !== 0) {
-          logger.error(
-            `Script de Python salió con código ${code}: ${pythonError}`
-          );
-          reject(
-            new Error(
-              `Error al ejecutar el script de metadatos: ${
-                pythonError || "Código de salida no cero"
-              }`
-            )
-          );
-        } else {
-          resolve();
-        }
-      });
-      pythonProcess.on("error", (err) => {
-        logger.error(`Falló al iniciar el script de Python: ${err.message}`);
-        reject(
-          new Error(`Falló al iniciar el script de Python: ${err.message}`)
-        );
-      });
-    });
-
-    const metadata = JSON.parse(pythonOutput);
+    // Worker de Python persistente (ver services/pythonWorkerPool.js)
+    const metadata = await extractMetadata(filePath);
     const fileKey = Object.keys(metadata)[0];
     const contenido = metadata[fileKey] || {};
 
@@ -0,0 +1,82 @@
+# alias_store.py
+import os
+import json
+import time
+import logging
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Alias confirmados roster -> Trackman
+# -------------------------------
+
+ROLES = ("batters", "pitchers")
+
+
+class AliasStore:
+    """
+    Tabla persistente de alias confirmados, por rol:
+    {'batters': {nombre_roster_normalizado: {'trackman': ..., 'score': ..., 'updated_at': ...}}, 'pitchers': {...}}.
+    Se guarda en JSON; cada escritura relee el archivo para no pisar alias de otros procesos.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {r: {} for r in ROLES}
+        self._mtime: Optional[float] = None
+        self._reload()
+
+    def _reload(self) -> None:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"AliasStore: no se pudo leer {self.path}: {e}")
+            return
+        self._data = {r: dict(data.get(r, {}) or {}) for r in ROLES}
+        self._mtime = mtime
+        # borrar log
+        logger.info(f"AliasStore: {sum(len(v) for v in self._data.values())} alias cargados de {self.path}")
+
+    def _write(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def get(self, rol: str, nombre_norm: str) -> Optional[Dict[str, Any]]:
+        self._reload()
+        return self._data.get(rol, {}).get(nombre_norm)
+
+    def record(self, rol: str, nombre_norm: str, trackman: str, score: float) -> None:
+        """Registra (o reemplaza) el alias confirmado de un nombre de roster."""
+        if rol not in ROLES:
+            raise ValueError(f"Rol inválido para alias: {rol}")
+        if not nombre_norm or not trackman:
+            return
+        self._reload()
+        self._data[rol][nombre_norm] = {
+            "trackman": trackman,
+            "score": float(score),
+            "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._write()
+
+    def remove(self, rol: str, nombre_norm: str) -> bool:
+        self._reload()
+        if self._data.get(rol, {}).pop(nombre_norm, None) is None:
+            return False
+        self._write()
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._data.values())
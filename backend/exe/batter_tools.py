@@ -1,15 +1,19 @@
+import io
 import os
+import sys
+import tempfile
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import fpdf
-from functools import reduce
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 import logging # borrar log
 
 from spray_charts_f import spray_probability_conditional
-import dataframe_image as dfi
+import density
+import vector_pdf
+import table_render
 
 
 # Strike zone aprox. (en pies). Ajusta a tu criterio/ligas.
@@ -124,22 +128,47 @@ def classification_barreled(exitspeed: float, angle: float) -> int:
         return 0
 
 
+def classify_barrels(exit_speed, angle) -> np.ndarray:
+    """Versión vectorizada de classification_barreled: regresa 1/0 por lanzamiento."""
+    es = pd.to_numeric(pd.Series(exit_speed), errors="coerce").to_numpy(dtype=float)
+    an = pd.to_numeric(pd.Series(angle), errors="coerce").to_numpy(dtype=float)
+    dif_class = es - 99
+    barrel = (
+        ((es >= 116) & (an > 8) & (an < 50)) |
+        ((es > 99) & (es < 116) & (an > 25 - dif_class) & (an < 31 + dif_class)) |
+        ((es == 99) & (an > 25) & (an < 31)) |
+        ((es == 98) & (an > 26) & (an < 30))
+    )
+    return barrel.astype(int)
+
+
 def create_stats_table(df_game: pd.DataFrame) -> pd.DataFrame:
-    df_pa = df_game[df_game.PitchofPA == 1].groupby('Batter').size().rename('PA')
-    df_dhr = df_game[df_game.PlayResult == 'HomeRun'].groupby('Batter').size().rename('HR')
-    df_game = df_game.copy()
-    df_game['is_barreled'] = df_game.apply(
-        lambda x: classification_barreled(x['ExitSpeed'], x['Angle']), axis=1
+    """PA, HR, barriles y equipo más reciente por bateador en un solo groupby.agg."""
+    if 'is_barreled' in df_game.columns:
+        barrels = df_game['is_barreled'].to_numpy()
+    else:
+        barrels = classify_barrels(df_game['ExitSpeed'], df_game['Angle'])
+
+    # marco mínimo con índice limpio para el agg
+    df = pd.DataFrame({
+        'Batter': df_game['Batter'].to_numpy(),
+        'is_pa': (df_game.PitchofPA == 1).to_numpy(dtype=int),
+        'is_hr': (df_game.PlayResult == 'HomeRun').to_numpy(dtype=int),
+        'is_barreled': barrels,
+        # en enteros: NaT queda como el mínimo y nunca gana a una fecha válida
+        'fecha_carga': pd.to_datetime(df_game['fecha_carga'], errors='coerce').array.asi8,
+    })
+    df_all = df.groupby('Batter').agg(
+        PA=('is_pa', 'sum'),
+        HR=('is_hr', 'sum'),
+        Barrels=('is_barreled', 'sum'),
+        last_row=('fecha_carga', 'idxmax'),
     )
-    df_barrels = df_game.groupby('Batter').is_barreled.sum().rename('Barrels')
-    df_team = (df_game.sort_values(['Batter', 'fecha_carga'], ascending=[True, False])
-                      .drop_duplicates('Batter')
-                      .groupby('Batter').BatterTeam.first())
-    dfs = [df_pa, df_dhr, df_barrels, df_team]
-    df_all = reduce(lambda l, r: pd.concat([l, r], axis=1), dfs)
-    df_all['Barr%'] = (df_all['Barrels'] / df_all['PA']).map("{:.1%}".format)
-    df_all.HR = df_all.HR.fillna(0).astype(int)
-    df_all.PA = df_all.PA.fillna(0).astype(int)
+    # equipo de la fila con la fecha_carga más reciente
+    df_all['BatterTeam'] = df_game['BatterTeam'].to_numpy()[df_all.pop('last_row').to_numpy()]
+
+    # sin PA queda 'nan%' (igual que antes), no 'inf%'
+    df_all['Barr%'] = (df_all['Barrels'] / df_all['PA'].where(df_all['PA'] > 0)).map("{:.1%}".format)
     df_all = df_all[['PA', 'HR', 'Barrels', 'Barr%', 'BatterTeam']].fillna('')
     df_all.index.name = 'Nombre'
     return df_all
@@ -157,57 +186,101 @@ def get_stats_of_player(name_batter: str, df_stats: pd.DataFrame) -> Tuple[pd.Da
         return pd.DataFrame(), 'SinEquipo'
 
 
-def create_style_batter(df_temp: pd.DataFrame):
-    styles = [
-        dict(selector="th", props=[("font-size", "200%"), ("text-align", "center"),
-                                     ('border-top', '2px solid black'), ('border-bottom', '2px solid black'),
-                                     ('border-left', '2px solid black'), ('border-right', '2px solid black')]),
-        dict(selector="td", props=[("font-size", "200%"), ("text-align", "center"),
-                                     ('border-left', '1px solid black'), ('border-right', '1px solid black'),
-                                     ('border-bottom', '1px solid black')]),
-        dict(selector="caption", props=[("caption-side", "bottom")])
-    ]
-    return df_temp.style.set_table_styles(styles).hide(axis='index')
+# th: borde de 2px en los cuatro lados; td: 1px izquierda/derecha/abajo; texto centrado al 200%
+BATTER_TABLE_STYLE = table_render.TableStyle(header_edges="TBLR", cell_edges="BLR")
 
+def create_style_batter(df_temp: pd.DataFrame) -> table_render.StyledTable:
+    return table_render.StyledTable(df_temp, BATTER_TABLE_STYLE)
 
-def from_df_to_tablepng(batter_name: str, team: str, dir_temp: str, html_temp, name: str):
-    dir_ = os.path.join(dir_temp, team, batter_name)
-    os.makedirs(dir_, exist_ok=True)
-    output_path = os.path.join(dir_, f"{name}.png")
+
+def from_df_to_tablepng(batter_name: str, team: str, dir_temp: str, table: table_render.StyledTable, name: str,
+                        images: Optional[Dict[str, bytes]] = None, render_mode: str = "raster") -> Optional[str]:
+    """Dibuja la tabla con table_render y la entrega como cualquier otra gráfica (ver save_fig)."""
     try:
-        dfi.export(html_temp, output_path, table_conversion="matplotlib")
+        fig = table_render.table_figure(table)
     except Exception as e:
-        print(f"[ERROR] Error al exportar tabla '{name}' a PNG: {e}")
-        try: logger.error(f"Error al exportar tabla '{name}' a PNG: {e}")
+        print(f"[ERROR] Error al dibujar tabla '{name}': {e}")
+        try: logger.error(f"Error al dibujar tabla '{name}': {e}")
         except Exception: pass
-
-
-def save_fig(dir_temp: str, team: str, batter_name: str, chart, chart_name: str, dpi: int = 210) -> str:
-    """Guarda PNG y un JPG (para FPDF). Devuelve la ruta PNG."""
-    dir_ = os.path.join(dir_temp, team, batter_name)
-    os.makedirs(dir_, exist_ok=True)
+        return None
+    return save_fig(dir_temp, team, batter_name, fig, name, images=images, render_mode=render_mode)
+
+
+# Gráficas que además del JPG en memoria se escriben a disco (artefactos que se conservan)
+KEEP_CHARTS = frozenset()
+
+def render_fig(chart, dpi: int = 210) -> bytes:
+    """Codifica la figura una sola vez como JPG (el formato que consume FPDF)."""
+    buf = io.BytesIO()
+    chart.savefig(buf, dpi=dpi, bbox_inches='tight', pad_inches=0.2,
+                  facecolor='white', transparent=False, format='jpg')
+    return buf.getvalue()
+
+def save_fig(dir_temp: str, team: str, batter_name: str, chart, chart_name: str, dpi: int = 210,
+             images: Optional[Dict[str, bytes]] = None, keep: Optional[bool] = None,
+             render_mode: str = "raster") -> Optional[str]:
+    """
+    Codifica la figura una sola vez (JPG). Con `images` el JPG queda en memoria para create_report
+    y solo se escribe a disco si keep=True (por defecto, si está en KEEP_CHARTS); sin `images` siempre se escribe.
+    En render_mode='vector' se guarda la Figure misma (VectorChart) y no se codifica nada, salvo keep.
+    Devuelve la ruta del JPG en disco o, si solo quedó en memoria, su llave.
+    """
     if chart_name == 'slugging_general_left':
         dpi = 150
-
-    base = os.path.join(
-        dir_,
-        chart_name if not chart_name.lower().endswith(('.png', '.jpg', '.jpeg'))
+    stem = chart_name if not chart_name.lower().endswith(('.png', '.jpg', '.jpeg')) \
         else os.path.splitext(chart_name)[0]
-    )
-    png_path = base + '.png'
-    jpg_path = base + '.jpg'
+    key = stem + '.jpg'
+    if keep is None:
+        keep = stem in KEEP_CHARTS
+
+    if render_mode == "vector" and images is not None:
+        images[key] = vector_pdf.VectorChart(chart, 0.2)
+        plt.close(chart)
+        if not keep:
+            return key
 
     try:
-        chart.savefig(png_path, dpi=dpi, bbox_inches='tight', pad_inches=0.2, transparent=False)
-        chart.savefig(jpg_path, dpi=dpi, bbox_inches='tight', pad_inches=0.2,
-                      facecolor='white', transparent=False, format='jpg')
+        data = render_fig(chart, dpi)
         plt.close(chart)
     except Exception as e:
         print(f"[ERROR] Error al guardar gráfico '{chart_name}': {e}")
         try: logger.error(f"Error al guardar gráfico '{chart_name}': {e}")
         except Exception: pass
-        png_path = None
-    return png_path
+        return None
+
+    if images is not None and render_mode != "vector":
+        images[key] = data
+        if not keep:
+            return key
+
+    dir_ = os.path.join(dir_temp, team, batter_name)
+    os.makedirs(dir_, exist_ok=True)
+    jpg_path = os.path.join(dir_, key)
+    with open(jpg_path, 'wb') as f:
+        f.write(data)
+    return jpg_path
+
+
+class MemoryFPDF(fpdf.FPDF):
+    """FPDF 1.7.2 solo lee imágenes de disco; esta variante también toma los JPG en memoria de save_fig."""
+
+    def __init__(self, images: Optional[Dict[str, bytes]] = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buffers = images if images is not None else {}
+
+    def _parsejpg(self, filename):
+        data = self.buffers.get(filename)
+        if data is None:
+            return super()._parsejpg(filename)
+        # FPDF._parsejpg solo abre rutas: los bytes pasan por un temporal y los lee el parser de fpdf
+        fd, tmp = tempfile.mkstemp(suffix='.jpg')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return super()._parsejpg(tmp)
+        finally:
+            try: os.remove(tmp)
+            except OSError: pass
 
 
 def in_strike_zone(row) -> bool:
@@ -272,7 +345,7 @@ def create_heatmap_hit(df_games: pd.DataFrame, name_batter: str, side: str):
                 df_temp["auto_pitch_type_2"] = df_temp["AutoPitchType"]
             else:
                 df_temp["auto_pitch_type_2"] = "ALL"
-        df_temp["auto_pitch_type_2"] = df_temp["auto_pitch_type_2"].fillna("ALL").astype(str)
+        df_temp["auto_pitch_type_2"] = df_temp["auto_pitch_type_2"].astype(object).fillna("ALL").astype(str)
     except Exception as e:
         print(f"[ERROR] Preparando auto_pitch_type_2: {e}")
         try: logger.error(f"Preparando auto_pitch_type_2 en create_heatmap_hit: {e}")
@@ -308,16 +381,14 @@ def create_heatmap_hit(df_games: pd.DataFrame, name_batter: str, side: str):
                     continue
 
                 plotted_any = True
-                sns.kdeplot(
-                    data=df_plot,
-                    x="PlateLocSide",
-                    y="PlateLocHeight",
+                density.kde_fill(
+                    ax,
+                    df_plot["PlateLocSide"],
+                    df_plot["PlateLocHeight"],
                     cmap="coolwarm",
                     levels=15,
                     bw_adjust=0.5,
-                    cbar=False,
                     thresh=0.3,
-                    fill=True,
                     alpha=0.6,
                 )
 
@@ -350,53 +421,28 @@ def create_heatmap_hit(df_games: pd.DataFrame, name_batter: str, side: str):
 def avg_hit_chart(name_batter: str, side: str, df_games: pd.DataFrame):
     sns.set(font_scale=1.2)
 
-    df_games = df_games.copy()
-    if "auto_pitch_type_2" not in df_games.columns:
-        df_games["auto_pitch_type_2"] = None
-        print("[WARN] Columna 'auto_pitch_type_2' no encontrada. Se inicializa a None.")
-        try: logger.warning("Columna 'auto_pitch_type_2' no encontrada. Se inicializa a None.")
-        except Exception: pass
-
-    # Normaliza AutoPitchType y marca FB/Sink
-    try:
-        type_norm = df_games.get("AutoPitchType", "").astype(str).str.strip().str.lower()
-        fb_sink_set = {
-            "four-seam","four seam","ff","fourseam",
-            "sinker","two-seam","two seam","ft","twoseam","sink"
-        }
-        df_games.loc[type_norm.isin(fb_sink_set), "auto_pitch_type_2"] = "Rectas y sinkers"
-    except Exception as e:
-        print(f"[ERROR] Normalizando AutoPitchType: {e}")
-        try: logger.error(f"Normalizando AutoPitchType en avg_hit_chart: {e}")
-        except Exception: pass
-
-    # Columnas requeridas
-    req = {"Batter","PlayResult","PitcherThrows","auto_pitch_type_2","PlateLocHeight","PlateLocSide"}
+    # Columnas requeridas (las derivadas vienen del enriquecimiento en reports)
+    req = {"Batter","PlayResult","PitcherThrows","auto_pitch_type_2","PlateLocHeight","PlateLocSide",
+           "is_atbat","is_hit","in_strike_zone","in_left_strike_zone","in_high_strike_zone"}
     if not req.issubset(df_games.columns):
         missing = req - set(df_games.columns)
         print(f"[ERROR] Faltan columnas requeridas para avg_hit_chart: {missing}")
         try: logger.error(f"Faltan columnas requeridas para avg_hit_chart: {missing}")
         except Exception: pass
         fig = plt.figure(); plt.axis('off'); return fig
-    if "KorBB" not in df_games.columns:
-        df_games["KorBB"] = ""
 
     # --- filtro principal (FB/Sink) ---
-    df_temp = df_games[
+    base = (
         (df_games.Batter == name_batter) &
         (df_games.PlayResult != "Undefined") &
-        (df_games.PitcherThrows == side) &
-        (df_games.auto_pitch_type_2 == "Rectas y sinkers")
-    ].copy()
+        (df_games.PitcherThrows == side)
+    )
+    df_temp = df_games[base & (df_games.auto_pitch_type_2 == "Rectas y sinkers")]
     
     # Fallback si no hay FB/Sink para este jugador/lado
     used_all = False
     if df_temp.empty:
-        df_temp = df_games[
-            (df_games.Batter == name_batter) &
-            (df_games.PlayResult != "Undefined") &
-            (df_games.PitcherThrows == side)
-        ].copy()
+        df_temp = df_games[base]
         used_all = True
         print("[WARN] Sin FB/Sink para este jugador/lado; usando TODOS los lanzamientos para xAVG.")
         try: logger.warning("Sin FB/Sink para este jugador/lado; usando TODOS los lanzamientos para xAVG.")
@@ -404,17 +450,8 @@ def avg_hit_chart(name_batter: str, side: str, df_games: pd.DataFrame):
     
     print(f"[DEBUG] Registros filtrados por jugador/lado/tipo: {len(df_temp)}")
 
-    ab_playresults = ["Single","Double","Triple","HomeRun","Out","Error","FieldersChoice"]
-    df_temp["is_atbat"] = df_temp["PlayResult"].isin(ab_playresults) | (df_temp["KorBB"] == "Strikeout")
-    hit_playresults = ["Single","Double","Triple","HomeRun"]
-    df_temp["is_hit"] = df_temp["PlayResult"].isin(hit_playresults)
-
     # Zonas (tolerante a NaN)
-    df_temp = df_temp.dropna(subset=["PlateLocHeight","PlateLocSide"]).copy()
-    df_temp["in_strike_zone"] = df_temp[["PlateLocHeight","PlateLocSide"]].apply(in_strike_zone, axis=1)
-    df_temp["in_left_strike_zone"] = df_temp["PlateLocSide"].apply(left_strike_zone)
-    df_temp["in_high_strike_zone"] = df_temp["PlateLocHeight"].apply(hilow_strike_zone)
-
+    df_temp = df_temp.dropna(subset=["PlateLocHeight","PlateLocSide"])
     df_temp = df_temp[df_temp["in_strike_zone"]]
     print(f"[DEBUG] Registros dentro de la zona de strike: {len(df_temp)}")
     if df_temp.empty:
@@ -456,49 +493,106 @@ def avg_hit_chart(name_batter: str, side: str, df_games: pd.DataFrame):
     plt.axis('off')
 
     return fig
-def create_slogging_chart_all(name_batter: str, side: str, df_games: pd.DataFrame):
+# -------------------------------------------
+# Cubo de slugging (liga completa)
+# -------------------------------------------
+# Peso de cada PlayResult en slugging; lo que no está en el dict pesa 1
+SLUG_WEIGHTS = {'Single': 1, 'Double': 2, 'Triple': 3, 'HomeRun': 4,
+                'Error': 0, 'FieldersChoice': 0, 'Sacrifice': 0, 'Out': 0}
+
+# mismos intervalos (a, b] que pd.cut(..., bins=_xbin/_ybin) en el enriquecimiento
+_X_ZONAS = pd.IntervalIndex.from_breaks(_xbin)
+_Y_ZONAS = pd.IntervalIndex.from_breaks(_ybin)
+
+SLUG_LEVELS = ['Batter', 'PitcherThrows', 'auto_pitch_type_launch', 'y_bin', 'x_bin', 'PlayResult']
+
+def _zone_codes(values: pd.Series, bins: np.ndarray) -> np.ndarray:
+    """Código entero de zona 0..n-1 como pd.cut (a, b]; -1 fuera de la zona o NaN."""
+    v = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    codes = np.digitize(v, bins, right=True) - 1
+    return np.where((codes >= 0) & (codes < len(bins) - 1), codes, -1).astype(np.int8)
+
+def slugging_counts_by_player(df_games: pd.DataFrame) -> pd.Series:
+    """
+    Conteos InPlay de toda la liga por (Batter, PitcherThrows, auto_pitch_type_launch, y_bin, x_bin, PlayResult).
+    Se arma una vez por corrida; cada heatmap de slugging es una rebanada + ponderación de este cubo.
+    Orden estable: los tipos quedan en orden de aparición, igual que .unique() sobre el jugador.
+    """
+    df = df_games[
+        (df_games.PitchCall == 'InPlay') &
+        (df_games.PlayResult != 'Undefined')
+    ].dropna(subset=['PlateLocHeight', 'PlateLocSide'])
+
+    launch = df['auto_pitch_type_launch'] if 'auto_pitch_type_launch' in df.columns \
+        else pd.Series(None, index=df.index, dtype=object)
+    keys = pd.DataFrame({
+        'Batter': df['Batter'],
+        'PitcherThrows': df['PitcherThrows'],
+        'auto_pitch_type_launch': launch,
+        'y_bin': _zone_codes(df['PlateLocHeight'], _ybin),
+        'x_bin': _zone_codes(df['PlateLocSide'], _xbin),
+        'PlayResult': df['PlayResult'],
+    }, index=df.index)
+
+    counts = keys.groupby(SLUG_LEVELS, sort=False, dropna=False, observed=True).size()
+    # Batter/PitcherThrows ordenados para .loc rápido; el resto conserva el orden de aparición
+    return counts.sort_index(level=[0, 1], sort_remaining=False)
+
+def _slugging_slice(counts: pd.Series, name_batter: str, side: Optional[str] = None) -> Optional[pd.Series]:
+    """Rebanada del cubo para el bateador (y brazo); None si no hay registros."""
+    try:
+        sub = counts.loc[name_batter] if side is None else counts.loc[(name_batter, side)]
+    except KeyError:
+        return None
+    return sub if len(sub) else None
+
+def slugging_grid(sub: pd.Series) -> pd.DataFrame:
+    """
+    Heatmap 8x8 de slugging a partir de una rebanada (y_bin, x_bin, PlayResult) del cubo.
+    Valor por zona = bases ponderadas / batazos del brazo (incluye los fuera de zona) * 8.
+    """
+    y = sub.index.get_level_values('y_bin').to_numpy()
+    x = sub.index.get_level_values('x_bin').to_numpy()
+    result = sub.index.get_level_values('PlayResult')
+    w = np.array([0 if pd.isna(r) else SLUG_WEIGHTS.get(r, 1) for r in result], dtype=float)
+    n = sub.to_numpy()
+
+    grid = np.zeros((len(_Y_ZONAS), len(_X_ZONAS)))
+    dentro = (y >= 0) & (x >= 0)
+    np.add.at(grid, (y[dentro], x[dentro]), n[dentro] * w[dentro])
+
+    denom = int(n.sum()) or 1
+    grid = (grid / denom) * 8
+    return pd.DataFrame(grid, index=_Y_ZONAS, columns=_X_ZONAS).sort_index(ascending=False)
+
+
+def create_slogging_chart_all(name_batter: str, side: str, df_games: pd.DataFrame,
+                              slug_counts: Optional[pd.Series] = None):
     sns.set(font_scale=1.5)
 
-    df_temp = (
-        df_games[
-            (df_games.Batter == name_batter) &
-            (df_games.PitchCall == 'InPlay') &
-            (df_games.PlayResult != 'Undefined')
-        ]
-        .dropna(subset=['PlateLocHeight', 'PlateLocSide'])
-        .copy()
-    )
+    # sin cubo de liga (llamada suelta): se arma con lo que llegue en df_games
+    if slug_counts is None:
+        slug_counts = slugging_counts_by_player(df_games)
 
-    if df_temp.empty:
+    if _slugging_slice(slug_counts, name_batter) is None:
         _notify_skip(f"slugging_general_{side.lower()}", name_batter, side, "sin registros InPlay/definidos")
         fig = plt.figure()
         plt.axis('off')
         return fig
 
-    df_temp['x_estoy'] = pd.cut(df_temp.PlateLocSide, bins=_xbin)
-    df_temp['y_estoy'] = pd.cut(df_temp.PlateLocHeight, bins=_ybin)
-
-    df_side = df_temp[df_temp.PitcherThrows == side]
-    if df_side.empty:
+    sub = _slugging_slice(slug_counts, name_batter, side)
+    if sub is None:
         _notify_skip(f"slugging_general_{side.lower()}", name_batter, side, "sin registros para ese brazo")
         fig = plt.figure()
         plt.axis('off')
         return fig
 
-    weights = {'Single': 1, 'Double': 2, 'Triple': 3, 'HomeRun': 4,
-               'Error': 0, 'FieldersChoice': 0, 'Sacrifice': 0, 'Out': 0}
-
-    df = df_side.groupby(['y_estoy', 'x_estoy', 'PlayResult']).size().unstack()
-    for c in df.columns:
-        if c in weights:
-            df[c] = df[c] * weights[c]
-
-    denom = len(df_side) or 1
-    df['sum_all'] = (df.sum(axis=1) / denom) * 8
+    # el tipo no importa aquí: se suma sobre todos
+    grid = slugging_grid(sub.droplevel('auto_pitch_type_launch'))
 
     fig = plt.figure(figsize=(6, 7))
     sns.heatmap(
-        df['sum_all'].unstack().sort_index(ascending=False),
+        grid,
         cmap='coolwarm',
         annot=True,
         fmt='0.3f',
@@ -520,53 +614,30 @@ def create_slogging_chart_all(name_batter: str, side: str, df_games: pd.DataFram
 # -------------------------------------------
 # Slugging por tipo
 # -------------------------------------------
-def create_slogging_chart_by_type(name_batter: str, side: str, df_games: pd.DataFrame):
+def create_slogging_chart_by_type(name_batter: str, side: str, df_games: pd.DataFrame,
+                                  slug_counts: Optional[pd.Series] = None):
     sns.set(font_scale=1.2)
 
-    # 1) Filtro base (sin exigir AutoPitchType aún)
-    try:
-        df_temp = (
-            df_games[
-                (df_games.Batter == name_batter) &
-                (df_games.PitchCall == 'InPlay') &
-                (df_games.PlayResult != 'Undefined')
-            ]
-            .dropna(subset=['PlateLocHeight', 'PlateLocSide'])
-            .copy()
-        )
-    except Exception as e:
-        print(f"[ERROR] Filtrando df_games en create_slogging_chart_by_type: {e}")
-        try: logger.error(f"Filtrando df_games en create_slogging_chart_by_type: {e}")
-        except Exception: pass
-        return plt.figure(), 0
-
-    # 2) Asegura/normaliza tipos de pitcheo
+    # 1) Rebanada del cubo para el bateador (sin exigir AutoPitchType aún)
     try:
-        df_temp = ensure_pitch_types(df_temp, "auto_pitch_type_2")
+        if slug_counts is None:
+            slug_counts = slugging_counts_by_player(df_games)
+        sub_all = _slugging_slice(slug_counts, name_batter)
     except Exception as e:
-        print(f"[ERROR] Creando/normalizando auto_pitch_type_2: {e}")
-        try: logger.error(f"Creando/normalizando auto_pitch_type_2: {e}")
+        print(f"[ERROR] Armando cubo de slugging en create_slogging_chart_by_type: {e}")
+        try: logger.error(f"Armando cubo de slugging en create_slogging_chart_by_type: {e}")
         except Exception: pass
         return plt.figure(), 0
 
-    if df_temp.empty:
+    if sub_all is None:
         _notify_skip(f"slugging_by_launch_{side.lower()}", name_batter, side, "sin registros InPlay/definidos")
         fig = plt.figure(); plt.axis('off'); return fig, 0
 
-    # 3) Bins de zona
-    try:
-        df_temp['x_estoy'] = pd.cut(df_temp.PlateLocSide, bins=_xbin)
-        df_temp['y_estoy'] = pd.cut(df_temp.PlateLocHeight, bins=_ybin)
-    except Exception as e:
-        print(f"[ERROR] Creando bins de strike zone: {e}")
-        try: logger.error(f"Creando bins de strike zone: {e}")
-        except Exception: pass
-        return plt.figure(), 0
-
-    # 4) Filtra por lado y obtiene tipos
+    # 2) Rebanada por lado; los tipos salen del nivel auto_pitch_type_launch en orden de aparición
     try:
-        df_side_all = df_temp[df_temp.PitcherThrows == side].copy()
-        unique_launch = df_side_all['auto_pitch_type_2'].dropna().unique()
+        sub_side = _slugging_slice(slug_counts, name_batter, side)
+        launch_level = sub_side.index.get_level_values('auto_pitch_type_launch') if sub_side is not None else pd.Index([])
+        unique_launch = pd.unique(launch_level.dropna())
     except Exception as e:
         print(f"[ERROR] Preparando conjuntos por lado/tipo: {e}")
         try: logger.error(f"Preparando conjuntos por lado/tipo: {e}")
@@ -579,34 +650,27 @@ def create_slogging_chart_by_type(name_batter: str, side: str, df_games: pd.Data
         fig = plt.figure(); plt.axis('off'); return fig, 0
 
     num_type_launch = len(unique_launch)
-    dict_cond = {'Single': 1, 'Double': 2, 'Triple': 3, 'HomeRun': 4,
-                 'Error': 0, 'FieldersChoice': 0, 'Sacrifice': 0, 'Out': 0}
 
     fig = plt.figure(figsize=(25, 5))
     plotted_any = False
 
     for idx, launch in enumerate(unique_launch):
         try:
-            df_side = df_side_all[(df_side_all['auto_pitch_type_2'] == launch)]
-            if df_side.empty:
+            sub = sub_side[launch_level == launch]
+            if sub.empty:
                 print(f"[WARN] DataFrame vacío para el lanzamiento '{launch}'. Saltando.")
                 try: logger.warning(f"DataFrame vacío para el lanzamiento '{launch}' en slugging por tipo.")
                 except Exception: pass
                 continue
 
             plotted_any = True
-            df_temp2 = df_side.groupby(['y_estoy', 'x_estoy', 'PlayResult']).size().unstack()
-            for col in df_temp2.columns:
-                if col in dict_cond:
-                    df_temp2[col] = df_temp2[col] * dict_cond[col]
-            denom = len(df_side) if len(df_side) else 1
-            df_temp2['sum_all'] = (df_temp2.sum(axis=1) / denom) * 8
+            grid = slugging_grid(sub.droplevel('auto_pitch_type_launch'))
 
             ax = plt.subplot(1, num_type_launch, idx + 1)
             plt.title(f"{str(launch)} {side}", fontsize=25)
             cbar = (idx == num_type_launch - 1)
             sns.heatmap(
-                df_temp2['sum_all'].unstack().sort_index(ascending=False),
+                grid,
                 cmap='coolwarm', annot=True, fmt='0.3f',
                 vmin=0, vmax=0.5, ax=ax, cbar=cbar, annot_kws=dict(fontsize=20)
             )
@@ -636,8 +700,10 @@ def get_positions(n: int, chart: bool = True):
     return {4: [5, 60, 110, 155], 3: [10, 70, 120], 2: [20, 80], 1: [last_val]}.get(n, [])
 
 
-def create_report(batter_name: str, team: str, dir_images: str, dict_short: dict, n_left: int, n_right: int):
-    pdf = fpdf.FPDF()
+def create_report(batter_name: str, team: str, dir_images: str, dict_short: dict, n_left: int, n_right: int,
+                  images: Optional[Dict[str, bytes]] = None, render_mode: str = "raster"):
+    images = images if images is not None else {}
+    pdf = vector_pdf.VectorPDF(images) if render_mode == "vector" else MemoryFPDF(images)
     pdf.add_page()
     pdf.set_font('Times', 'B', 22)
     pdf.cell(0, 8, f'Batter: {batter_name}', border=0, ln=2, align='C')
@@ -645,6 +711,9 @@ def create_report(batter_name: str, team: str, dir_images: str, dict_short: dict
     hp_ok = os.path.exists(hp_path)
 
     def pick_image(stem: str) -> str:
+        # primero lo que dejó save_fig en memoria (JPG o VectorChart); si no, lo que haya en disco
+        if f"{stem}.jpg" in images:
+            return f"{stem}.jpg"
         p_jpg = os.path.join(dir_images, f"{stem}.jpg")
         p_png = os.path.join(dir_images, f"{stem}.png")
         if os.path.exists(p_jpg):
@@ -731,25 +800,30 @@ def create_report_full(
     df_stats: pd.DataFrame,
     df_games: pd.DataFrame,
     dict_short: dict,
-    work_dir: str = None
+    work_dir: str = None,
+    zone_counts: Optional[pd.Series] = None,
+    slug_counts: Optional[pd.Series] = None,
+    render_mode: str = "raster"
 ):
-    # Normalización mínima y silenciosa (solo errores)
-    try:
-        df_games = df_games.copy()
-        if "auto_pitch_type_2" not in df_games.columns:
-            df_games["auto_pitch_type_2"] = None
-        type_norm = df_games.get("AutoPitchType", pd.Series([], dtype=str)).astype(str).str.strip().str.lower()
-        fb_sink = {
-            "four-seam","four seam","ff","fourseam","four-seam fastball","fastball","fb",
-            "sinker","sink","si","two-seam","two seam","ft","twoseam","2-seam","2 seam"
-        }
-        df_games.loc[type_norm.isin(fb_sink), "auto_pitch_type_2"] = "Rectas y sinkers"
+    # df_games llega enriquecido por reports._enrich_batter_frame (auto_pitch_type_2, is_hit,
+    # in_strike_zone, x_estoy/y_estoy, landingZone, ...); las gráficas solo leen esas columnas.
+    # reports pasa el subconjunto del jugador (PlayerIndex); si llega la liga completa
+    # se recorta una sola vez aquí y no en cada gráfica
+    try:
+        if "Batter" in df_games.columns:
+            # una sola comparación: si todo es del jugador no se copia el frame
+            mask = df_games.Batter.to_numpy() == batter_name
+            if not mask.all():
+                df_games = df_games[mask]
     except Exception as e:
-        print(f"[ERROR] normalizando df_games: {e}")
-        try: logger.error(f"Error normalizando df_games: {e}")
+        print(f"[ERROR] recortando df_games: {e}")
+        try: logger.error(f"Error recortando df_games: {e}")
         except Exception: pass
 
     base_dir = work_dir if work_dir else DIR_TEMP
+    # JPG en memoria de cada gráfica -> create_report (sin pasar por disco);
+    # en render_mode='vector' son las Figures, que create_report dibuja como vectores
+    images: Dict[str, bytes] = {}
 
     # Equipo y carpeta
     try:
@@ -776,8 +850,8 @@ def create_report_full(
 
     # Tabla de perfil
     try:
-        html_temp = create_style_batter(table)
-        from_df_to_tablepng(batter_name, team, base_dir, html_temp, 'table_1')
+        table_1 = create_style_batter(table)
+        from_df_to_tablepng(batter_name, team, base_dir, table_1, 'table_1', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] generando/guardando table_1: {e}")
         try: logger.error(f"Error generando/guardando table_1: {e}")
@@ -785,15 +859,15 @@ def create_report_full(
 
     # Gráficas slugging (general)
     try:
-        fig1 = create_slogging_chart_all(batter_name, 'Left', df_games)
-        p1 = save_fig(base_dir, team, batter_name, fig1, 'slugging_general_left')
+        fig1 = create_slogging_chart_all(batter_name, 'Left', df_games, slug_counts)
+        p1 = save_fig(base_dir, team, batter_name, fig1, 'slugging_general_left', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] slugging_general_left: {e}")
         logger.error(f"Error al generar/guardar slugging_general_left: {e}")
     
     try:
-        fig2 = create_slogging_chart_all(batter_name, 'Right', df_games)
-        p2 = save_fig(base_dir, team, batter_name, fig2, 'slugging_general_right')
+        fig2 = create_slogging_chart_all(batter_name, 'Right', df_games, slug_counts)
+        p2 = save_fig(base_dir, team, batter_name, fig2, 'slugging_general_right', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] slugging_general_right: {e}")
         logger.error(f"Error al generar/guardar slugging_general_right: {e}")
@@ -803,15 +877,15 @@ def create_report_full(
     
     n_left, n_right = 0, 0
     try:
-        fig3, n_left = create_slogging_chart_by_type(batter_name, 'Left', df_games)
-        p3 = save_fig(base_dir, team, batter_name, fig3, 'slugging_by_launch_left')
+        fig3, n_left = create_slogging_chart_by_type(batter_name, 'Left', df_games, slug_counts)
+        p3 = save_fig(base_dir, team, batter_name, fig3, 'slugging_by_launch_left', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] slugging_by_launch_left: {e}")
         logger.error(f"Error al generar/guardar slugging_by_launch_left: {e}")
 
     try:
-        fig4, n_right = create_slogging_chart_by_type(batter_name, 'Right', df_games)
-        p4 = save_fig(base_dir, team, batter_name, fig4, 'slugging_by_launch_right')
+        fig4, n_right = create_slogging_chart_by_type(batter_name, 'Right', df_games, slug_counts)
+        p4 = save_fig(base_dir, team, batter_name, fig4, 'slugging_by_launch_right', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] slugging_by_launch_right: {e}")
         logger.error(f"Error al generar/guardar slugging_by_launch_right: {e}")
@@ -820,14 +894,14 @@ def create_report_full(
     # Tablas xAVG
     try:
         fig5 = avg_hit_chart(batter_name, 'Left', df_games)
-        p5 = save_fig(base_dir, team, batter_name, fig5, 'table_hit_left')
+        p5 = save_fig(base_dir, team, batter_name, fig5, 'table_hit_left', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] table_hit_left: {e}")
         logger.error(f"Error al generar/guardar table_hit_left: {e}")
 
     try:
         fig6 = avg_hit_chart(batter_name, 'Right', df_games)
-        p6 = save_fig(base_dir, team, batter_name, fig6, 'table_hit_right')
+        p6 = save_fig(base_dir, team, batter_name, fig6, 'table_hit_right', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] table_hit_right: {e}")
         logger.error(f"Error al generar/guardar table_hit_right: {e}")
@@ -835,50 +909,62 @@ def create_report_full(
     # Heatmaps
     try:
         fig7 = create_heatmap_hit(df_games, batter_name, 'Left')
-        p7 = save_fig(base_dir, team, batter_name, fig7, 'kde_hit_left')
+        p7 = save_fig(base_dir, team, batter_name, fig7, 'kde_hit_left', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] kde_hit_left: {e}")
         logger.error(f"Error al generar/guardar kde_hit_left: {e}")
 
     try:
         fig8 = create_heatmap_hit(df_games, batter_name, 'Right')
-        p8 = save_fig(base_dir, team, batter_name, fig8, 'kde_hit_right')
+        p8 = save_fig(base_dir, team, batter_name, fig8, 'kde_hit_right', images=images, render_mode=render_mode)
     except Exception as e:
         print(f"[ERROR] kde_hit_right: {e}")
         logger.error(f"Error al generar/guardar kde_hit_right: {e}")
 
-    # Spray charts (esta función guarda internamente)
+    # Spray charts (en raster la función guarda el PNG; en vector se usa la figura que regresa)
     try:
-        spray_probability_conditional(df_games, batter_name, team, side='Left', title="Addi zone probs", display_title=True)
+        ax_spray = spray_probability_conditional(df_games, batter_name, team, side='Left', title="Addi zone probs", display_title=True, zone_counts=zone_counts,
+                                                 save_png=render_mode != "vector")
         p_spl = os.path.join(dir_images, 'spray_chart_general_left.png')
+        if render_mode == "vector" and ax_spray is not None:
+            images['spray_chart_general_left.jpg'] = vector_pdf.VectorChart(ax_spray.figure, 0.0)
     except Exception as e:
         print(f"[ERROR] spray_chart_general_left: {e}")
         logger.error(f"Error al generar spray_chart_general_left: {e}")
 
     try:
-        spray_probability_conditional(df_games, batter_name, team, side='Right', title="Addi zone probs", display_title=True)
+        ax_spray = spray_probability_conditional(df_games, batter_name, team, side='Right', title="Addi zone probs", display_title=True, zone_counts=zone_counts,
+                                                 save_png=render_mode != "vector")
         p_spr = os.path.join(dir_images, 'spray_chart_general_right.png')
+        if render_mode == "vector" and ax_spray is not None:
+            images['spray_chart_general_right.jpg'] = vector_pdf.VectorChart(ax_spray.figure, 0.0)
     except Exception as e:
         print(f"[ERROR] spray_chart_general_right: {e}")
         logger.error(f"Error al generar spray_chart_general_right: {e}")
 
     try:
-        spray_probability_conditional(df_games, batter_name, team, side='Left', strikes=2, title="Strikes = 2", display_title=True)
+        ax_spray = spray_probability_conditional(df_games, batter_name, team, side='Left', strikes=2, title="Strikes = 2", display_title=True, zone_counts=zone_counts,
+                                                 save_png=render_mode != "vector")
         p_spl2 = os.path.join(dir_images, 'spray_chart_general_left_strikes_2.png')
+        if render_mode == "vector" and ax_spray is not None:
+            images['spray_chart_general_left_strikes_2.jpg'] = vector_pdf.VectorChart(ax_spray.figure, 0.0)
     except Exception as e:
         print(f"[ERROR] spray_chart_general_left_strikes_2: {e}")
         logger.error(f"Error al generar spray_chart_general_left_strikes_2: {e}")
 
     try:
-        spray_probability_conditional(df_games, batter_name, team, side='Right', strikes=2, title="Strikes = 2", display_title=True)
+        ax_spray = spray_probability_conditional(df_games, batter_name, team, side='Right', strikes=2, title="Strikes = 2", display_title=True, zone_counts=zone_counts,
+                                                 save_png=render_mode != "vector")
         p_spr2 = os.path.join(dir_images, 'spray_chart_general_right_strikes_2.png')
+        if render_mode == "vector" and ax_spray is not None:
+            images['spray_chart_general_right_strikes_2.jpg'] = vector_pdf.VectorChart(ax_spray.figure, 0.0)
     except Exception as e:
         print(f"[ERROR] spray_chart_general_right_strikes_2: {e}")
         logger.error(f"Error al generar spray_chart_general_right_strikes_2: {e}")
 
     # Crear PDF
     try:
-        out_pdf = create_report(batter_name, team, dir_images, dict_short, n_left, n_right)
+        out_pdf = create_report(batter_name, team, dir_images, dict_short, n_left, n_right, images, render_mode)
         return out_pdf
     except Exception as e:
         print(f"[ERROR] PDF report: {e}")
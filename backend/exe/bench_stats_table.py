@@ -0,0 +1,69 @@
+import sys
+import time
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+import batter_tools as bt
+
+# Benchmark de create_stats_table: implementación anterior (apply fila por fila +
+# cuatro groupbys unidos con reduce) contra la vectorizada de batter_tools.
+# Uso: python bench_stats_table.py [filas]
+
+def create_stats_table_anterior(df_game: pd.DataFrame) -> pd.DataFrame:
+    df_pa = df_game[df_game.PitchofPA == 1].groupby('Batter').size().rename('PA')
+    df_dhr = df_game[df_game.PlayResult == 'HomeRun'].groupby('Batter').size().rename('HR')
+    df_game = df_game.copy()
+    df_game['is_barreled'] = df_game.apply(
+        lambda x: bt.classification_barreled(x['ExitSpeed'], x['Angle']), axis=1
+    )
+    df_barrels = df_game.groupby('Batter').is_barreled.sum().rename('Barrels')
+    df_team = (df_game.sort_values(['Batter', 'fecha_carga'], ascending=[True, False])
+                      .drop_duplicates('Batter')
+                      .groupby('Batter').BatterTeam.first())
+    dfs = [df_pa, df_dhr, df_barrels, df_team]
+    df_all = reduce(lambda l, r: pd.concat([l, r], axis=1), dfs)
+    df_all['Barr%'] = (df_all['Barrels'] / df_all['PA']).map("{:.1%}".format)
+    df_all.HR = df_all.HR.fillna(0).astype(int)
+    df_all.PA = df_all.PA.fillna(0).astype(int)
+    df_all = df_all[['PA', 'HR', 'Barrels', 'Barr%', 'BatterTeam']].fillna('')
+    df_all.index.name = 'Nombre'
+    return df_all
+
+def datos_sinteticos(n: int, n_batters: int = 400, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    in_play = rng.random(n) < 0.3
+    return pd.DataFrame({
+        'Batter': rng.choice([f'Bateador {i}' for i in range(n_batters)], n),
+        'PitchofPA': rng.integers(1, 7, n),
+        'PlayResult': np.where(in_play, rng.choice(['Single', 'Out', 'HomeRun', 'Double'], n), 'Undefined'),
+        # velocidades enteras para pasar por los casos 98/99 exactos
+        'ExitSpeed': np.where(in_play, np.round(rng.normal(92, 12, n)), np.nan),
+        'Angle': np.where(in_play, rng.normal(15, 20, n), np.nan),
+        'BatterTeam': rng.choice(['DIA_ROJ', 'SUL_MON', 'TOR_TIJ', None], n),
+        'fecha_carga': pd.Timestamp('2025-04-01') + pd.to_timedelta(rng.integers(0, 200, n), unit='D'),
+    })
+
+def medir(func, df: pd.DataFrame):
+    t0 = time.perf_counter()
+    out = func(df)
+    return out, time.perf_counter() - t0
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = datos_sinteticos(n)
+
+    # clasificación de barriles: escalar vs vectorizada
+    escalar = np.array([bt.classification_barreled(e, a) for e, a in zip(df.ExitSpeed, df.Angle)])
+    assert np.array_equal(escalar, bt.classify_barrels(df.ExitSpeed, df.Angle)), "classify_barrels difiere"
+
+    anterior, t_ant = medir(create_stats_table_anterior, df)
+    nueva, t_new = medir(bt.create_stats_table, df)
+    iguales = anterior.sort_index().astype(str).equals(nueva.sort_index().astype(str))
+
+    print(f"Filas: {n:,}  Bateadores: {df.Batter.nunique()}")
+    print(f"create_stats_table anterior:   {t_ant:8.3f} s")
+    print(f"create_stats_table vectorizada:{t_new:8.3f} s  ({t_ant / max(t_new, 1e-9):.0f}x)")
+    print(f"Resultados idénticos: {iguales}")
+    sys.exit(0 if iguales else 1)
@@ -0,0 +1,178 @@
+# catalog_cache.py
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Constantes
+# -------------------------------
+
+# sube este número si cambia la limpieza de nombres o el formato del índice
+CATALOG_VERSION = 2
+META_FILE = "_meta.json"
+NAMES_FILE = "nombres.parquet"
+INDEX_FILE = "indice.json"
+LOCK_FILE = "catalogo.lock"
+
+DEFAULT_TTL_HOURS = 24.0
+LOCK_TIMEOUT_S = 120.0
+LOCK_STALE_S = 600.0  # un lock más viejo que esto se considera abandonado
+
+# -------------------------------
+# Caché en disco
+# -------------------------------
+
+def _json_default(value: Any) -> Any:
+    # los bloques del índice son arreglos de posiciones
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.integer):
+        return int(value)
+    raise TypeError(f"{type(value).__name__} no es serializable a JSON")
+
+class CatalogCache:
+    """
+    Catálogo de nombres distintos de Trackman (bateadores/pitchers) en disco, compartido entre procesos.
+    Guarda los nombres en Parquet, el índice de matching ya construido en JSON y un _meta.json
+    con la marca de agua (max fecha_carga) y la hora de la última verificación contra BigQuery.
+    """
+
+    def __init__(self, cache_dir: str, ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.cache_dir = cache_dir
+        self.ttl_s = float(ttl_hours) * 3600.0
+        self.meta_path = os.path.join(cache_dir, META_FILE)
+        self.names_path = os.path.join(cache_dir, NAMES_FILE)
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+        self.lock_path = os.path.join(cache_dir, LOCK_FILE)
+
+    # ---- metadatos ----
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception:
+            return None
+        if meta.get("version") != CATALOG_VERSION:
+            return None
+        return meta
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.meta_path)
+
+    def exists(self) -> bool:
+        return self._read_meta() is not None and os.path.isfile(self.names_path)
+
+    def is_fresh(self) -> bool:
+        """True si existe y se verificó contra BigQuery hace menos del TTL."""
+        meta = self._read_meta()
+        if not meta or not os.path.isfile(self.names_path):
+            return False
+        return (time.time() - float(meta.get("checked_at", 0))) < self.ttl_s
+
+    @property
+    def watermark(self) -> Optional[str]:
+        return (self._read_meta() or {}).get("watermark")
+
+    # ---- lectura/escritura ----
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Regresa {'names': {'batters': [...], 'pitchers': [...]}, 'index': {...} | None}."""
+        if not self.exists():
+            return None
+        try:
+            df = pd.read_parquet(self.names_path)
+            names = {
+                "batters": df.loc[df["role"] == "b", "name"].tolist(),
+                "pitchers": df.loc[df["role"] == "p", "name"].tolist(),
+            }
+        except Exception as e:
+            logger.warning(f"CatalogCache: no se pudo leer {self.names_path}: {e}")
+            return None
+        index = None
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except Exception:
+            # el índice se puede reconstruir a partir de los nombres
+            index = None
+        return {"names": names, "index": index}
+
+    def write(self, names: Dict[str, List[str]], index: Optional[Dict[str, Any]],
+              watermark: Optional[str]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        df = pd.DataFrame(
+            [(n, "b") for n in names.get("batters", [])] + [(n, "p") for n in names.get("pitchers", [])],
+            columns=["name", "role"],
+        )
+        tmp = self.names_path + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.names_path)
+        if index is not None:
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, default=_json_default)
+            os.replace(tmp, self.index_path)
+        now = time.time()
+        self._write_meta({
+            "version": CATALOG_VERSION,
+            "watermark": watermark,
+            "created_at": now,
+            "checked_at": now,
+            "counts": {k: len(v) for k, v in names.items()},
+        })
+        # borrar log
+        logger.info(f"CatalogCache.write: {len(df)} nombres guardados, watermark={watermark}") # borrar log
+
+    def touch(self) -> None:
+        """Marca el catálogo como verificado ahora (la marca de agua no cambió)."""
+        meta = self._read_meta()
+        if meta:
+            meta["checked_at"] = time.time()
+            self._write_meta(meta)
+
+    # ---- lock entre procesos ----
+    @contextmanager
+    def lock(self, timeout: float = LOCK_TIMEOUT_S) -> Iterator[bool]:
+        """
+        Lock por archivo (O_CREAT|O_EXCL) para que un solo proceso consulte BigQuery.
+        Produce True si se obtuvo; False si se agotó el tiempo (el llamador no debe consultar BigQuery).
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        start = time.time()
+        acquired = False
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode("ascii"))
+                os.close(fd)
+                acquired = True
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > LOCK_STALE_S:
+                        os.remove(self.lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.time() - start > timeout:
+                    logger.warning(f"CatalogCache: tiempo agotado esperando {self.lock_path}")
+                    break
+                time.sleep(0.2)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    os.remove(self.lock_path)
+                except OSError:
+                    pass
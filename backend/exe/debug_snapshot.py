@@ -0,0 +1,83 @@
+# debug_snapshot.py
+import os
+import re
+import time
+import logging
+from typing import Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Snapshots de depuración (apagados por defecto)
+# -------------------------------
+# Se activan con REPORTS_DEBUG_SNAPSHOT=1 o con enable() (p. ej. main.py --debug-snapshot).
+# Cada snapshot es el subconjunto del jugador en Parquet comprimido y se escribe
+# una sola vez por corrida: <dir>/<run_id>/<tag>/<jugador>.parquet
+
+ENV_ENABLE = "REPORTS_DEBUG_SNAPSHOT"
+ENV_DIR = "REPORTS_DEBUG_SNAPSHOT_DIR"
+DEFAULT_DIR = os.path.join(os.getcwd(), "debug_snapshots")
+
+_enabled: Optional[bool] = None  # None → decide la variable de entorno
+_run_id: Optional[str] = None
+_written: set = set()
+
+def enable(flag: bool = True) -> None:
+    """Activa/desactiva los snapshots sin depender de la variable de entorno."""
+    global _enabled
+    _enabled = bool(flag)
+
+def is_enabled() -> bool:
+    if _enabled is not None:
+        return _enabled
+    return os.environ.get(ENV_ENABLE, "").strip().lower() in ("1", "true", "yes", "si", "sí")
+
+def start_run(run_id: Optional[str] = None) -> str:
+    """Inicia una corrida nueva; los snapshots de la corrida anterior no se repiten ni se pisan."""
+    global _run_id
+    _run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+    _written.clear()
+    return _run_id
+
+def current_run() -> Optional[str]:
+    return _run_id
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", str(name)).strip("_") or "Sin_nombre"
+
+def _parquet_ready(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte a texto las categorías de intervalos (bins de pd.cut), que Parquet no soporta."""
+    out = df
+    for c in df.columns:
+        dtype = df[c].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and isinstance(dtype.categories, pd.IntervalIndex):
+            if out is df:
+                out = df.copy()
+            out[c] = df[c].astype(str)
+    return out
+
+def snapshot(df: pd.DataFrame, tag: str, player: Optional[str] = None) -> Optional[str]:
+    """Guarda `df` si los snapshots están activos y aún no existe para (run_id, tag, player)."""
+    if not is_enabled():
+        return None
+    run_id = _run_id or start_run()
+    key = (run_id, tag, player)
+    if key in _written:
+        return None
+    _written.add(key)
+
+    out_dir = os.path.join(os.environ.get(ENV_DIR) or DEFAULT_DIR, _safe(run_id), _safe(tag))
+    out_path = os.path.join(out_dir, f"{_safe(player or tag)}.parquet")
+    if os.path.exists(out_path):
+        return out_path
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        _parquet_ready(df).to_parquet(out_path, index=False, compression="zstd")
+        # borrar log
+        logger.info(f"snapshot: {len(df)} filas guardadas en {out_path}") # borrar log
+        return out_path
+    except Exception as e:
+        logger.warning(f"snapshot: no se pudo guardar {out_path}: {e}")
+        return None
@@ -0,0 +1,140 @@
+import numpy as np
+from typing import Optional, Tuple
+
+# Densidad 2D para los heatmaps de ubicación (PlateLocSide / PlateLocHeight).
+# Reemplaza sns.kdeplot(fill=True): los puntos se reparten en una malla fija (binning
+# lineal), se convolucionan con un kernel gaussiano vía FFT y se dibujan con un solo contourf.
+# Mismo ancho de banda que seaborn (Scott * bw_adjust, covarianza completa) y
+# mismos niveles por proporción de masa (levels / thresh).
+
+
+class DensityGrid:
+    """Malla fija (en pies) compartida por todos los buckets; cubre la zona con margen."""
+
+    def __init__(self, x_range: Tuple[float, float] = (-3.0, 3.0),
+                 y_range: Tuple[float, float] = (-0.5, 5.5), step: float = 0.025):
+        nx = int(round((x_range[1] - x_range[0]) / step))
+        ny = int(round((y_range[1] - y_range[0]) / step))
+        self.x_edges = np.linspace(x_range[0], x_range[1], nx + 1)
+        self.y_edges = np.linspace(y_range[0], y_range[1], ny + 1)
+        self.x = (self.x_edges[:-1] + self.x_edges[1:]) / 2
+        self.y = (self.y_edges[:-1] + self.y_edges[1:]) / 2
+        self.dx = self.x_edges[1] - self.x_edges[0]
+        self.dy = self.y_edges[1] - self.y_edges[0]
+
+    def histogram(self, x: np.ndarray, y: np.ndarray, pad: Tuple[int, int] = (0, 0)) -> np.ndarray:
+        """
+        Conteos con binning lineal: cada punto se reparte entre los 4 centros vecinos.
+        La malla se extiende `pad` = (py, px) celdas por lado, forma (ny + 2py, nx + 2px);
+        lo que cae fuera de la malla extendida se ignora.
+        """
+        py, px = pad
+        ny, nx = len(self.y) + 2 * py, len(self.x) + 2 * px
+        # posición en celdas respecto al primer centro de la malla extendida
+        fx = (x - self.x[0]) / self.dx + px
+        fy = (y - self.y[0]) / self.dy + py
+        ix, iy = np.floor(fx).astype(int), np.floor(fy).astype(int)
+        wx, wy = fx - ix, fy - iy
+        counts = np.zeros(ny * nx)
+        for ox, oy, w in ((0, 0, (1 - wx) * (1 - wy)), (1, 0, wx * (1 - wy)),
+                          (0, 1, (1 - wx) * wy), (1, 1, wx * wy)):
+            cx, cy = ix + ox, iy + oy
+            ok = (cx >= 0) & (cx < nx) & (cy >= 0) & (cy < ny)
+            counts += np.bincount(cy[ok] * nx + cx[ok], weights=w[ok], minlength=ny * nx)
+        return counts.reshape(ny, nx)
+
+    def kernel(self, cov: np.ndarray) -> np.ndarray:
+        """Kernel gaussiano (covarianza completa) muestreado en el paso de la malla, hasta 4 sigmas."""
+        hx = max(1, int(np.ceil(4 * np.sqrt(cov[0, 0]) / self.dx)))
+        hy = max(1, int(np.ceil(4 * np.sqrt(cov[1, 1]) / self.dy)))
+        ox, oy = np.meshgrid(np.arange(-hx, hx + 1) * self.dx, np.arange(-hy, hy + 1) * self.dy)
+        inv = np.linalg.inv(cov)
+        q = inv[0, 0] * ox * ox + 2 * inv[0, 1] * ox * oy + inv[1, 1] * oy * oy
+        return np.exp(-0.5 * q) / (2 * np.pi * np.sqrt(np.linalg.det(cov)))
+
+
+# malla por defecto de los heatmaps de bateo y pitcheo
+ZONE_GRID = DensityGrid()
+
+
+def _fft_size(n: int) -> int:
+    """Siguiente tamaño >= n con factores 2, 3 y 5 (rápido para la FFT)."""
+    while True:
+        m = n
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return n
+        n += 1
+
+
+def _fftconvolve_same(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Convolución 2D (modo 'same') vía rfft2."""
+    ky, kx = kernel.shape
+    shape = (_fft_size(image.shape[0] + ky - 1), _fft_size(image.shape[1] + kx - 1))
+    full = np.fft.irfft2(np.fft.rfft2(image, shape) * np.fft.rfft2(kernel, shape), shape)
+    oy, ox = (ky - 1) // 2, (kx - 1) // 2
+    return full[oy:oy + image.shape[0], ox:ox + image.shape[1]]
+
+
+def kde_density(x, y, bw_adjust: float = 1.0, grid: DensityGrid = ZONE_GRID) -> Optional[np.ndarray]:
+    """
+    Densidad en los centros de la malla, forma (ny, nx).
+    None si no se puede estimar (menos de 2 puntos, varianza 0 o covarianza singular), como seaborn.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    n = len(x)
+    if n < 2:
+        return None
+
+    data_cov = np.cov(np.vstack([x, y]))
+    if np.isclose(min(data_cov[0, 0], data_cov[1, 1]), 0):
+        return None
+    # regla de Scott en 2D: n^(-1/6)
+    cov = data_cov * (n ** (-1 / 6) * bw_adjust) ** 2
+    if np.linalg.det(cov) <= 0:
+        return None
+
+    # los puntos fuera de la malla a menos de un radio del kernel también aportan densidad
+    # dentro de ella: se agrupan en la malla extendida y se recorta al final
+    kernel = grid.kernel(cov)
+    hy, hx = (kernel.shape[0] - 1) // 2, (kernel.shape[1] - 1) // 2
+    full = _fftconvolve_same(grid.histogram(x, y, pad=(hy, hx)), kernel)
+    density = full[hy:hy + len(grid.y), hx:hx + len(grid.x)] / n
+    # la FFT deja ruido numérico negativo en las colas
+    return np.clip(density, 0, None)
+
+
+def mass_levels(density: np.ndarray, levels: int = 10, thresh: float = 0.05) -> np.ndarray:
+    """Niveles de densidad que encierran las proporciones de masa np.linspace(thresh, 1, levels)."""
+    isoprop = np.linspace(thresh, 1, levels)
+    sorted_values = np.sort(density, axis=None)[::-1]
+    normalized = np.cumsum(sorted_values) / sorted_values.sum()
+    idx = np.searchsorted(normalized, 1 - isoprop)
+    return np.take(sorted_values, idx, mode="clip")
+
+
+def kde_fill(ax, x, y, bw_adjust: float = 1.0, levels: int = 10, thresh: float = 0.05,
+             cmap: str = "coolwarm", alpha: Optional[float] = None, grid: DensityGrid = ZONE_GRID):
+    """
+    Equivalente a sns.kdeplot(x=x, y=y, fill=True, ...) sobre `ax`.
+    Regresa el QuadContourSet o None si no hubo densidad que dibujar.
+    """
+    density = kde_density(x, y, bw_adjust=bw_adjust, grid=grid)
+    if density is None:
+        return None
+    lv = mass_levels(density, levels, thresh)
+    if not np.all(np.diff(lv) > 0):
+        return None
+
+    # solo se contornea la caja donde la densidad supera el primer nivel
+    rows = np.flatnonzero((density >= lv[0]).any(axis=1))
+    cols = np.flatnonzero((density >= lv[0]).any(axis=0))
+    r0, r1 = max(rows[0] - 1, 0), rows[-1] + 2
+    c0, c1 = max(cols[0] - 1, 0), cols[-1] + 2
+    return ax.contourf(grid.x[c0:c1], grid.y[r0:r1], density[r0:r1, c0:c1],
+                       levels=lv, cmap=cmap, alpha=alpha)
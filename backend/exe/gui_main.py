@@ -11,6 +11,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, TclError
 
 import sys
+import multiprocessing
 from tools import Tools, _rol_desde_title
 import reports
 from google.cloud import bigquery
@@ -36,11 +37,14 @@ class App(tk.Tk):
         self.batters_unmatched, self.pitchers_unmatched = [], []
         self.staff_matched, self.staff_unmatched = [], []
         self.current_file = None
+        self.tools = None
+        self.matched_rows = {}  # id de fila en la tabla -> item matched
 
         # Parámetros de configuración
         self.umbral = 90.0
         self.work_dir = None
         self.clean_temp = True
+        self.workers = 1
 
         # Inicialización de credenciales embebidas
         self.creds_ok = False
@@ -133,6 +137,15 @@ class App(tk.Tk):
                                      command=self.on_generate_p, state="disabled")
         self.btn_gen_b.pack(side="left")
         self.btn_gen_p.pack(side="left", padx=10)
+        self.btn_alias = ttk.Button(bottom, text="Guardar alias",
+                                    command=self.on_save_alias, state="disabled")
+        self.btn_alias.pack(side="left")
+
+        # Procesos para generar reportes (1 = en serie)
+        ttk.Label(bottom, text="Procesos:").pack(side="left", padx=(20, 4))
+        self.var_workers = tk.IntVar(value=self.workers)
+        ttk.Spinbox(bottom, from_=1, to=os.cpu_count() or 1, width=4,
+                    textvariable=self.var_workers).pack(side="left")
 
         self.txt_log = tk.Text(self, height=8, state='disabled')
         self.txt_log.pack(fill="both", expand=False, padx=10, pady=(0, 10))
@@ -172,7 +185,9 @@ class App(tk.Tk):
         self._log("Iniciando procesamiento de archivos...")
 
         try:
-            tools = Tools()
+            if self.tools is None:
+                self.tools = Tools()
+            tools = self.tools
             all_batters_matched, all_pitchers_matched = [], []
             all_batters_unmatched, all_pitchers_unmatched = [], []
             all_roles_by_name = {}
@@ -269,19 +284,21 @@ class App(tk.Tk):
             # borrar log
             print("DEBUG: Llenando tabla con resultados matched y unmatched") # borrar log
             for m in self.batters_matched:
-                self.tree.insert("", "end", values=(
+                iid = self.tree.insert("", "end", values=(
                     m.get("canonico") or m.get("extraido") or "",
                     m.get("rol", "Batter"),
                     f"{m.get('score', 0):.2f}",
                     "Matched"
                 ))
+                self.matched_rows[iid] = m
             for m in self.pitchers_matched:
-                self.tree.insert("", "end", values=(
+                iid = self.tree.insert("", "end", values=(
                     m.get("canonico") or m.get("extraido") or "",
                     m.get("rol", "Pitcher"),
                     f"{m.get('score', 0):.2f}",
                     "Matched"
                 ))
+                self.matched_rows[iid] = m
             for n in self.batters_unmatched:
                 self.tree.insert("", "end", values=(n, all_roles_by_name.get(n, "Unknown"), "-", "Unmatched"))
             for n in self.pitchers_unmatched:
@@ -339,7 +356,11 @@ class App(tk.Tk):
                 return
             # borrar log
             print(f"DEBUG: Llamando a run_batter_reports con {len(nombres)} nombres") # borrar log
-            res = reports.run_batter_reports(nombres)
+            try:
+                workers = max(1, int(self.var_workers.get()))
+            except (TclError, ValueError):
+                workers = 1
+            res = reports.run_batter_reports(nombres, workers=workers)
             processed = res.get("processed", 0)
             generated = res.get("generated", 0)
             paths = res.get("paths", [])
@@ -377,7 +398,11 @@ class App(tk.Tk):
                 return
             # borrar log
             print(f"DEBUG: Llamando a run_pitcher_reports con {len(nombres)} nombres") # borrar log
-            res = reports.run_pitcher_reports(nombres)
+            try:
+                workers = max(1, int(self.var_workers.get()))
+            except (TclError, ValueError):
+                workers = 1
+            res = reports.run_pitcher_reports(nombres, workers=workers)
             processed = res.get("processed", 0)
             generated = res.get("generated", 0)
             paths = res.get("paths", [])
@@ -396,12 +421,39 @@ class App(tk.Tk):
             # borrar log
             print("DEBUG: Saliendo de on_generate_p") # borrar log
 
+    # Guarda como alias los matches seleccionados; sin selección no guarda nada
+    # (un match difuso equivocado quedaría como alias permanente)
+    def on_save_alias(self):
+        # borrar log
+        print("DEBUG: Entrando a on_save_alias") # borrar log
+        if not self.matched_rows:
+            self._log("No hay coincidencias Matched para guardar como alias.")
+            return
+        seleccion = [i for i in self.tree.selection() if i in self.matched_rows]
+        if not seleccion:
+            self._log("Selecciona en la tabla las coincidencias Matched que quieres guardar como alias.")
+            return
+        items = [self.matched_rows[i] for i in seleccion]
+        if self.tools is None:
+            self.tools = Tools()
+        guardados = 0
+        for m in items:
+            if not (m.get("extraido") and m.get("canonico")):
+                continue
+            try:
+                self.tools.registrar_alias(m["extraido"], m["canonico"], m.get("rol", "Batter"), m.get("score", 100.0))
+                guardados += 1
+            except Exception as e:
+                self._log(f"No se pudo guardar el alias de {m.get('extraido')}: {e}")
+        self._log(f"Alias guardados: {guardados}")
+
     # Limpia los datos de la tabla
     def _clear_table(self):
         # borrar log
         print("DEBUG: Entrando a _clear_table") # borrar log
         for i in self.tree.get_children():
             self.tree.delete(i)
+        self.matched_rows = {}
         # borrar log
         print("DEBUG: Tabla limpiada") # borrar log
 
@@ -462,6 +514,7 @@ class App(tk.Tk):
             if busy:
                 _safe_config(getattr(self, "btn_gen_b", None), state="disabled")
                 _safe_config(getattr(self, "btn_gen_p", None), state="disabled")
+                _safe_config(getattr(self, "btn_alias", None), state="disabled")
             else:
                 try:
                     # Llama a _update_buttons solo si la UI sigue viva
@@ -488,7 +541,8 @@ class App(tk.Tk):
         if not (self and self.winfo_exists()):
             return
         for btn in [getattr(self, "btn_gen_b", None),
-                        getattr(self, "btn_gen_p", None)]:
+                        getattr(self, "btn_gen_p", None),
+                        getattr(self, "btn_alias", None)]:
             if btn and btn.winfo_exists():
                 btn.config(state='normal' if not self.is_busy else 'disabled')
         # borrar log
@@ -496,4 +550,5 @@ class App(tk.Tk):
     
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # necesario para el pool de procesos en el .exe
     App().mainloop()
@@ -1,777 +1,364 @@
-# reports.py
-import os
-import re
-import unicodedata
-from typing import List, Optional, Dict, Any, Union
-
 import pandas as pd
 import numpy as np
-import logging
-
-from google.cloud import bigquery
-import google.auth
-from google.cloud import bigquery_storage
+import matplotlib.pyplot as plt
+import seaborn as sns
+from PIL import Image
+import os
+import sys
+import io
+import fpdf
 
 import batter_tools as bt
-import pitcher_tools as pt
-
-logger = logging.getLogger(__name__)
-
-# borrar log
-logger.info("Inicio de reports.py") # borrar log
-
-# -------------------------------
-# Utilidades
-# -------------------------------
-
-def clean_name(name: str) -> str:
-    """Normaliza un nombre para su procesamiento."""
-    # borrar log
-    logger.debug(f"clean_name: Normalizando nombre: '{name}'") # borrar log
-    if not name or str(name).strip() == "":
-        # borrar log
-        logger.debug("clean_name: Nombre vacío, regresando 'Sin_nombre'") # borrar log
-        return "Sin_nombre"
-    parts = [p.strip() for p in str(name).split(",")]
-    rearranged = f"{parts[-1]} {parts[0]}".strip() if len(parts) >= 2 else parts[0]
-    rearranged = " ".join(rearranged.title().split())
-    normalized = unicodedata.normalize("NFKD", rearranged)
-    result = "".join(c for c in normalized if not unicodedata.combining(c))
-    # borrar log
-    logger.debug(f"clean_name: Nombre normalizado a: '{result}'") # borrar log
-    return result
-
-def clean_directory(base_subdir: str, base_path: Optional[str] = None) -> None:
-    """Limpia los archivos .png de un directorio de reportes."""
-    # borrar log
-    logger.info(f"clean_directory: Limpiando directorio {base_subdir}") # borrar log
-    base_path = base_path or os.path.join("BaseballBatterPitcherReports", base_subdir)
-    if not os.path.isdir(base_path):
-        # borrar log
-        logger.debug(f"clean_directory: Directorio no existe: {base_path}") # borrar log
-        return
-
-    for root, _, files in os.walk(base_path, topdown=False):
-        for file in files:
-            is_png = file.lower().endswith(".png")
-            is_batter_non_spray = (base_subdir != "Pitcher") and ("spray_chart" not in file)
-            if is_png and (base_subdir == "Pitcher" or is_batter_non_spray):
-                try:
-                    # borrar log
-                    logger.debug(f"clean_directory: Eliminando archivo: {os.path.join(root, file)}") # borrar log
-                    os.remove(os.path.join(root, file))
-                except OSError:
-                    logger.warning(f"No se pudo eliminar: {os.path.join(root, file)}")
-                    # borrar log
-                    logger.warning(f"clean_directory: Error de OS al eliminar {os.path.join(root, file)}") # borrar log
-        try:
-            if not os.listdir(root):
-                # borrar log
-                logger.debug(f"clean_directory: Eliminando directorio vacío: {root}") # borrar log
-                os.rmdir(root)
-        except OSError:
-            # borrar log
-            logger.warning(f"clean_directory: Error de OS al eliminar directorio {root}") # borrar log
-            pass
-    # borrar log
-    logger.info(f"clean_directory: Limpieza de {base_subdir} finalizada") # borrar log
-
-
-def _normalize_person_list(names: Optional[List[str]]) -> Optional[List[str]]:
-    """Normaliza y elimina duplicados de una lista de nombres."""
-    # borrar log
-    logger.debug(f"_normalize_person_list: Normalizando lista de nombres con {len(names or [])} elementos") # borrar log
-    if names is None:
-        return None
-    normed = [clean_name(str(n).strip()) for n in names if n]
-    return sorted(list(set(normed)))
-
-# -------------------------------
-# Catálogos de equipos
-# -------------------------------
-
-dict_baseball_teams = {
-    "SUL_MON": "Sultanes de Monterrey (Verano)", "GEN_MEX": "Generales de Durango",
-    "ACE_MEX": "Acereros del Norte", "DIA_ROJ": "Diablos Rojos del México",
-    "VAQ_LAG": "Algodoneros Unión Laguna", "AGU_VER": "El Aguila de Veracruz",
-    "GUE_MEX": "Guerreros de Oaxaca", "MAR_GUA": "Mariachis de Guadalajara",
-    "LEO_MEX": "Leones de Yucatán", "REI_MEX": "Rieleros de Aguascalientes",
-    "PER_MEX": "Pericos de Puebla", "SAR_SAL": "Saraperos de Saltillo",
-    "PIR_MEX": "Piratas de Campeche", "TIG_QUI": "Tigres de Quintana Roo",
-    "TOR_TIJ": "Toros de Tijuana", "BRA_MEX": "Bravos de Leon",
-    "OLM_MEX": "Olmecas de Tabasco", "ROJ_MEX": "Tecolotes de los Dos Laredos",
-    "SUL_MON1": "Sultanes de Monterrey (Invierno)", "AGU_MEX": "Águilas de Mexicali",
-    "CHA_JAL1": "Charros de Jalisco (Verano)", "CHA_JAL": "Charros de Jalisco (Invierno)",
-    "YAQ_OBR": "Yaquis Ciudad Obregon", "HER": "Naranjeros de Hermosillo",
-    "CAN_LOS": "Caneros Los Mochis", "VEN_MAZ": "Venados de Mazatlan",
-    "TOM_CUL": "Tomateros de Culiacan", "ALG_GUA": "Algodoneros de Guasave",
-    "MAY_NAV": "Mayos de Navajoa", "LMB_WIN6": "Pericos de Puebla",
-    "DOR_CHI": "Dorados de Chihuahua", "CON_QUE": "Conspiradores de Queretaro",
-    "MXC": "Aguilas de Mexicali", "RAM_ARA": "Ramón Arano", "NEL_BAR": "Nelson Barrera"
-}
-
-dict_baseball_teams_short = {
-    "SUL_MON": "Monterrey (Verano)", "GEN_MEX": "Durango", "ACE_MEX": "Acereros_Norte",
-    "DIA_ROJ": "México", "VAQ_LAG": "Unión_Laguna", "AGU_VER": "Veracruz",
-    "GUE_MEX": "Oaxaca", "MAR_GUA": "Guadalajara", "LEO_MEX": "Yucatán",
-    "REI_MEX": "Aguascalientes", "PER_MEX": "Puebla", "SAR_SAL": "Saltillo",
-    "PIR_MEX": "Campeche", "TIG_QUI": "Quintana_Roo", "TOR_TIJ": "Tijuana",
-    "BRA_MEX": "Leon", "OLM_MEX": "Tabasco", "ROJ_MEX": "Dos_Laredos",
-    "SUL_MON1": "Monterrey (Invernal)", "AGU_MEX": "Mexicali", "CHA_JAL": "Jalisco (Invernal)",
-    "CHA_JAL1": "Jalisco (Verano)", "YAQ_OBR": "Obregon", "HER": "Hermosillo",
-    "CAN_LOS": "Los_Mochis", "VEN_MAZ": "Mazatlan", "TOM_CUL": "Culiacan",
-    "ALG_GUA": "Guasave", "MAY_NAV": "Navajoa", "LMB_WIN6": "Puebla",
-    "DOR_CHI": "Chihuahua", "CON_QUE": "Queretaro", "MXC": "Mexicali",
-    "RAM_ARA": "Ramón Arano", "NEL_BAR": "Nelson Barrera"
-}
-
-# -------------------------------
-# Columnas estándar y alias
-# -------------------------------
-
-STANDARD_COLUMNS = [
-    "Angle", "AutoHitType", "AutoPitchType", "AwayTeam",
-    "BatterId", "Batter", "BatterSide", "BatterTeam", "Bearing",
-    "CatcherTeam", "Date", "Distance", "ExitSpeed", "HomeTeam", "HorzBreak", "KorBB",
-    "InducedVertBreak", "PitcherId", "Pitcher", "PitcherTeam", "PitchCall", "PitcherThrows", "PitchofPA",
-    "PlateLocHeight", "PlateLocSide", "PlayResult", "RelSpeed", "SpinRate", "Strikes", "Temporada",
-    "Temporada_Anio", "id_path", "fecha_carga"
-]
-
-# alias de encabezados frecuentes en PDF/Excel
-COL_ALIASES = {
-    r"^batter\s*id$": "BatterId",
-    r"^(batter|bateador|hitter|player)$": "Batter",
-    r"^(batter\s*side|lado\s*bateador|side)$": "BatterSide",
-    r"^(batter\s*team|equipo\s*bateador)$": "BatterTeam",
-    r"^pitcher\s*id$": "PitcherId",
-    r"^(pitcher|lanzador|thrower|pitcher\s*name)$": "Pitcher",
-    r"^(pitcher\s*team|equipo\s*lanzador)$": "PitcherTeam",
-    r"^(pitcher\s*throws|throws)$": "PitcherThrows",
-
-    r"^auto\s*hit\s*type$": "AutoHitType",
-    r"^auto\s*pitch\s*type$": "AutoPitchType",
-    r"^pitch\s*call$": "PitchCall",
-    r"^pitch\s*of\s*pa$": "PitchofPA",
-    r"^plate\s*loc\s*height$": "PlateLocHeight",
-    r"^plate\s*loc\s*side$": "PlateLocSide",
-    r"^exit\s*speed$": "ExitSpeed",
-    r"^rel\s*speed$": "RelSpeed",
-    r"^spin\s*rate$": "SpinRate",
-    r"^horz\s*break$": "HorzBreak",
-    r"^induced\s*vert\s*break$": "InducedVertBreak",
-    r"^bearing$": "Bearing",
-    r"^angle$": "Angle",
-    r"^distance$": "Distance",
-    r"^korbb$": "KorBB",
-    r"^strikes?$": "Strikes",
-    r"^play\s*result$": "PlayResult",
-
-    r"^away\s*team$": "AwayTeam",
-    r"^home\s*team$": "HomeTeam",
-    r"^catcher\s*team$": "CatcherTeam",
-    r"^temporada$": "Temporada",
-    r"^temporada[_\s-]*(año|anio)$": "Temporada_Anio",
-    r"^id[_\s-]*path$": "id_path",
-    r"^fecha[_\s-]*carga$": "fecha_carga",
-    r"^date$": "Date",
-}
-
-# mapeos de valores típicos en PDF
-BATTER_SIDE_ALIASES = {
-    "l": "Left", "left": "Left", "izq": "Left", "i": "Left",
-    "r": "Right", "right": "Right", "der": "Right", "d": "Right"
-}
-
-PITCHTYPE_ALIASES = {
-    "four-seam": "Four-Seam",
-    "four seam": "Four-Seam",
-    "fs": "Four-Seam",
-    "changeup": "Changeup",
-    "cu": "Curveball",
-    "curve": "Curveball",
-    "curveball": "Curveball",
-    "slider": "Slider",
-    "sl": "Slider",
-}
-
-def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Renombra por alias, agrega faltantes, reordena y formatea tipos/valores."""
-    # borrar log
-    logger.debug("_normalize_columns: Iniciando normalización de columnas") # borrar log
-    # renombrado por alias regex
-    rename_map: Dict[str, str] = {}
-    for col in list(df.columns):
-        key = str(col or "").strip()
-        k_norm = re.sub(r"\s+", " ", key).strip()
-        for patt, target in COL_ALIASES.items():
-            if re.match(patt, k_norm, flags=re.IGNORECASE):
-                rename_map[col] = target
-                break
-    if rename_map:
-        # borrar log
-        logger.debug(f"_normalize_columns: Renombrando columnas: {rename_map}") # borrar log
-        df = df.rename(columns=rename_map)
-
-    # limpia espacios en nombres
-    df.columns = [re.sub(r"\s+", " ", str(c)).strip() for c in df.columns]
-
-    # agrega columnas faltantes
-    for c in STANDARD_COLUMNS:
-        if c not in df.columns:
-            # borrar log
-            logger.debug(f"_normalize_columns: Agregando columna faltante: {c}") # borrar log
-            df[c] = np.nan
-
-    # reordena
-    df = df[STANDARD_COLUMNS]
-    # borrar log
-    logger.debug("_normalize_columns: Columnas reordenadas") # borrar log
-
-    # tipifica numéricas clave
-    numeric_cols = ["ExitSpeed", "RelSpeed", "SpinRate", "Angle", "Distance",
-                     "HorzBreak", "InducedVertBreak", "PitchofPA", "Strikes"]
-    for c in numeric_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    # borrar log
-    logger.debug("_normalize_columns: Columnas numéricas tipificadas") # borrar log
-
-    # fechas
-    if "fecha_carga" in df.columns:
-        df["fecha_carga"] = pd.to_datetime(df["fecha_carga"], errors="coerce")
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    # borrar log
-    logger.debug("_normalize_columns: Columnas de fecha tipificadas") # borrar log
-
-    # normaliza valores de lado del bateador
-    if "BatterSide" in df.columns:
-        df["BatterSide"] = (
-            df["BatterSide"].astype(str).str.strip().str.lower()
-            .map(BATTER_SIDE_ALIASES).fillna(df["BatterSide"])
-        )
-    # borrar log
-    logger.debug("_normalize_columns: 'BatterSide' normalizado") # borrar log
-
-    # normaliza tipos de pitcheo básicos si vienen abreviados
-    if "AutoPitchType" in df.columns:
-        df["AutoPitchType"] = df["AutoPitchType"].astype(str).str.strip()
-        df["AutoPitchType"] = (
-            df["AutoPitchType"].str.lower().map(PITCHTYPE_ALIASES)
-            .fillna(df["AutoPitchType"])
+import density
+import vector_pdf
+import table_render
+
+# -------------------------------------------
+# Conecta BigQuery y descarga datos (solo externo)
+# -------------------------------------------
+
+# os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "baseballlmb-key.json"
+# clientes perezosos: solo el proceso que consulta importa google.cloud y se autentica
+_clients = None
+
+def _get_clients():
+    global _clients
+    if _clients is None:
+        from google.cloud import bigquery, bigquery_storage
+        import google.auth
+        credentials, your_project_id = google.auth.default(
+            scopes=["https://www.googleapis.com/auth/cloud-platform"]
         )
-    # borrar log
-    logger.debug("_normalize_columns: 'AutoPitchType' normalizado") # borrar log
-
-    # limpia nombres
-    if "Batter" in df.columns:
-        df["Batter"] = df["Batter"].apply(clean_name)
-    if "Pitcher" in df.columns:
-        df["Pitcher"] = df["Pitcher"].apply(clean_name)
-    # borrar log
-    logger.debug("_normalize_columns: Nombres de jugadores limpiados") # borrar log
-
-    # bucket uniforme de tipos de pitcheo → auto_pitch_type_2
-    MAP_PITCH_BUCKETS = {
-        "Four-Seam": "Rectas y sinkers",
-        "Two-Seam": "Rectas y sinkers",
-        "Sinker": "Rectas y sinkers",
-        "Cutter": "Cutters y Sliders",
-        "Slider": "Cutters y Sliders",
-        "Sweeper": "Cutters y Sliders",
-        "Curveball": "Curvas",
-        "Knuckle-Curve": "Curvas",
-        "Changeup": "Cambios y Splits",
-        "Splitter": "Cambios y Splits",
-        "Split-Finger": "Cambios y Splits",
-    }
-    df["auto_pitch_type_2"] = df["AutoPitchType"].map(MAP_PITCH_BUCKETS).fillna("Other")
-    # borrar log
-    logger.debug("_normalize_columns: 'auto_pitch_type_2' creado") # borrar log
-    
-    # borrar log
-    logger.info("_normalize_columns: Normalización de columnas finalizada") # borrar log
-    return df
-
-
-# -------------------------------
-# Consulta BigQuery
-# -------------------------------
-
-BQ_DEFAULT_QUERY = """
-SELECT 
-    Angle, AutoHitType, AutoPitchType, AwayTeam,
-    BatterId, Batter, BatterSide, BatterTeam, Bearing,
-    CatcherTeam, Date, Distance, ExitSpeed, HomeTeam, HorzBreak, KorBB,
-    InducedVertBreak, PitcherId, Pitcher, PitcherTeam, PitchCall, PitcherThrows, PitchofPA,
-    PlateLocHeight, PlateLocSide, PlayResult, RelSpeed, SpinRate, Strikes, Temporada,
-    Temporada_Anio, id_path, fecha_carga
-FROM `baseballlmb.trackman_db.trackman_table`
-WHERE Temporada_Anio IN (
-    "Invierno-2025","Verano-2025",
-    "Invierno-2024","Verano-2024"
-)
-"""
-
-def load_trackman_dataframe(query: str = BQ_DEFAULT_QUERY) -> pd.DataFrame:
-    """Carga datos desde BigQuery y aplica limpieza de nombres."""
-    # borrar log
-    logger.info("load_trackman_dataframe: Cargando datos desde BigQuery") # borrar log
-    client = bigquery.Client()
-    query_job = client.query(query)
-    try:
-        credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
-        bqstorageclient = bigquery_storage.BigQueryReadClient(credentials=credentials)
-        # borrar log
-        logger.debug("load_trackman_dataframe: Usando BigQueryReadClient para cargar DataFrame") # borrar log
-        df = query_job.result().to_dataframe(bqstorage_client=bqstorageclient)
-    except Exception:
-        # borrar log
-        logger.warning("load_trackman_dataframe: Fallo al usar BigQueryReadClient. Recurriendo a to_dataframe() normal.") # borrar log
-        df = query_job.result().to_dataframe()
-    if df.empty:
-        # borrar log
-        logger.error("load_trackman_dataframe: BigQuery devolvió un DataFrame vacío") # borrar log
-        raise RuntimeError("BigQuery no devolvió registros.")
-    if "Batter" in df.columns:
-        df["Batter"] = df["Batter"].apply(clean_name)
-    if "Pitcher" in df.columns:
-        df["Pitcher"] = df["Pitcher"].apply(clean_name)
-    # borrar log
-    logger.info("load_trackman_dataframe: Carga desde BigQuery finalizada") # borrar log
-    return df
-
-# -------------------------------
-# Carga desde PDF 
-# -------------------------------
-# crea identificadores únicos basados en el nombre cuando el PDF no trae BatterId o PitcherId
-def _derive_ids_if_missing(df: pd.DataFrame) -> pd.DataFrame:
-    """Genera IDs determinísticos a partir de nombres cuando faltan en PDFs."""
-    # borrar log
-    logger.debug("_derive_ids_if_missing: Derivando IDs de jugadores si es necesario") # borrar log
-    if "BatterId" in df.columns and df["BatterId"].isna().all() and "Batter" in df.columns:
-        vals, _ = pd.factorize(df["Batter"].fillna("Sin_nombre"))
-        df["BatterId"] = vals.astype("Int64")
-        # borrar log
-        logger.debug("_derive_ids_if_missing: IDs de Batter derivados") # borrar log
-    if "PitcherId" in df.columns and df["PitcherId"].isna().all() and "Pitcher" in df.columns:
-        vals, _ = pd.factorize(df["Pitcher"].fillna("Sin_nombre"))
-        df["PitcherId"] = vals.astype("Int64")
-        # borrar log
-        logger.debug("_derive_ids_if_missing: IDs de Pitcher derivados") # borrar log
-    return df
-# asegura que fecha_carga tenga un valor válido, usando prioridad: la columna → columna Date → timestamp del archivo → fecha actual.
-def _fill_fecha_carga(df: pd.DataFrame, source_path: Optional[str]) -> pd.DataFrame:
-    """Asegura 'fecha_carga' válida para no filtrar todo al correr núcleos."""
-    # borrar log
-    logger.debug(f"_fill_fecha_carga: Rellenando 'fecha_carga' para el path: {source_path}") # borrar log
-    if "fecha_carga" not in df.columns:
-        df["fecha_carga"] = pd.NaT
-    df["fecha_carga"] = pd.to_datetime(df["fecha_carga"], errors="coerce")
-    
-    # borrar log
-    logger.debug(f"_fill_fecha_carga: 'fecha_carga' con {df['fecha_carga'].notna().sum()} valores no nulos") # borrar log
-    if df["fecha_carga"].notna().any():
-        return df
-
-    if "Date" in df.columns and df["Date"].notna().any():
-        df["fecha_carga"] = df["Date"]
-        # borrar log
-        logger.debug("_fill_fecha_carga: 'fecha_carga' rellenada desde 'Date'") # borrar log
-        return df
-
-    ts = None
-    if source_path and os.path.isfile(source_path):
-        try:
-            ts = pd.to_datetime(os.path.getmtime(source_path), unit="s")
-            # borrar log
-            logger.debug(f"_fill_fecha_carga: 'fecha_carga' rellenada desde timestamp del archivo: {ts}") # borrar log
-        except Exception:
-            ts = None
-            # borrar log
-            logger.warning("_fill_fecha_carga: Fallo al obtener timestamp del archivo") # borrar log
-    if ts is None:
-        ts = pd.Timestamp("now").normalize()
-        # borrar log
-        logger.debug("_fill_fecha_carga: Usando fecha actual para 'fecha_carga'") # borrar log
-
-    df["fecha_carga"] = ts
-    return df
-# 
-def load_trackman_dataframe_from_pdf(pdf_paths: Union[str, List[str]]) -> pd.DataFrame:
+        _clients = (bigquery.Client(), bigquery_storage.BigQueryReadClient(credentials=credentials))
+    return _clients
+
+def _external_load_pitcher_stats():
+    query = '''
+        SELECT
+            Pitcher,
+            PitcherTeam,
+            AutoPitchType,
+            RelSpeed,
+            SpinRate,
+            BatterSide,
+            PlateLocSide,
+            PlateLocHeight,
+            InducedVertBreak,
+            HorzBreak,
+            Date,
+            fecha_carga,
+            id_path,
+            auto_pitch_type_2
+        FROM baseballlmb.trackman_db.pitchers_stats_2025
+    '''
+    client, bqstorageclient = _get_clients()
+    return client.query(query).result().to_dataframe(bqstorage_client=bqstorageclient)
+
+# Estadísticas de pitchers: una consulta por proceso
+_pitcher_stats = None
+
+def load_pitcher_stats(refresh=False):
+    global _pitcher_stats
+    if _pitcher_stats is None or refresh:
+        _pitcher_stats = _external_load_pitcher_stats()
+    return _pitcher_stats
+
+# -------------------------------------------
+
+# rutas base; reports.py las sobrescribe con las de la app
+BASE = getattr(sys, "_MEIPASS", os.getcwd())
+DIR_TEMP = os.path.join(BASE, "BaseballBatterPitcherReports", "Pitcher")    # Carpeta temporal
+DIR_HOMEPLATE = os.path.join(BASE, "BaseballBatterPitcherReports", "img")  # Carpeta imágenes home plate
+
+_gui_logger = None
+
+def set_gui_logger(func):
+    """La GUI inyecta aquí su función de log (App._log)."""
+    global _gui_logger
+    _gui_logger = func
+
+def _home_plate_path():
+    """home_plate.jpg o .png de DIR_HOMEPLATE; si no hay ninguno, el placeholder de batter_tools."""
+    for ext in ('jpg', 'png'):
+        path = os.path.join(DIR_HOMEPLATE, 'home_plate.' + ext)
+        if os.path.exists(path):
+            return path
+    return bt.ensure_home_plate_asset()
+
+def get_last_games(df_games, pitcher):
+    d_t = df_games[df_games.Pitcher == pitcher].sort_index()
+    last_games = sorted(d_t.id_path.unique())[-5:]
+    return d_t[d_t['id_path'].isin(last_games)]
+
+def get_last_games_all(df_games, n=5):
+    """Igual que get_last_games pero para todos los pitchers a la vez."""
+    d_t = df_games.sort_index()
+    games = d_t[['Pitcher','id_path']].drop_duplicates().sort_values(['Pitcher','id_path'])
+    games = games[games.groupby('Pitcher').cumcount(ascending=False) < n]
+    keep = pd.MultiIndex.from_frame(d_t[['Pitcher','id_path']]).isin(pd.MultiIndex.from_frame(games))
+    return d_t[keep]
+
+def precompute_pitcher_aggregates(df_games):
     """
-    Extrae tablas de PDF y normaliza al esquema estándar.
-    No modifica la lógica de Excel existente.
+    Calcula una sola vez, para toda la liga, lo que create_report_full necesita:
+    últimos juegos, equipo, % de uso y rangos de velocidad/spin por pitcher.
     """
-    # borrar log
-    logger.info(f"load_trackman_dataframe_from_pdf: Iniciando carga desde PDF(s): {pdf_paths}") # borrar log
-    try:
-        import pdfplumber  # type: ignore
-    except Exception as e:
-        # borrar log
-        logger.error("load_trackman_dataframe_from_pdf: Falta pdfplumber") # borrar log
-        raise ImportError("Requiere 'pdfplumber' para leer PDF.") from e
-
-    if isinstance(pdf_paths, str):
-        pdf_paths = [pdf_paths]
-
-    all_chunks: List[pd.DataFrame] = []
-
-    for path in pdf_paths:
-        # borrar log
-        logger.debug(f"load_trackman_dataframe_from_pdf: Procesando archivo: {path}") # borrar log
-        if not os.path.isfile(path):
-            logger.warning(f"PDF no encontrado: {path}")
-            # borrar log
-            logger.warning(f"load_trackman_dataframe_from_pdf: Archivo no encontrado: {path}") # borrar log
-            continue
-        try:
-            with pdfplumber.open(path) as pdf:
-                # borrar log
-                logger.debug(f"load_trackman_dataframe_from_pdf: Abriendo PDF con {len(pdf.pages)} páginas") # borrar log
-                for page in pdf.pages:
-                    # intenta varias estrategias de extracción
-                    tables = page.extract_tables({"horizontal_strategy": "text", "vertical_strategy": "text"}) or []
-                    if not tables:
-                        tables = page.extract_tables() or []
-                    # borrar log
-                    logger.debug(f"load_trackman_dataframe_from_pdf: Página {page.page_number} tiene {len(tables)} tablas") # borrar log
-
-                    for table in tables:
-                        if not table or len(table) < 2:
-                            # borrar log
-                            logger.debug("load_trackman_dataframe_from_pdf: Tabla vacía o muy pequeña, omitiendo") # borrar log
-                            continue
-
-                        # identifica posible fila de encabezados: la primera no vacía con mayor diversidad
-                        candidate_headers = [row for row in table[:3] if row and any(cell for cell in row)]
-                        header = max(candidate_headers, key=lambda r: len([c for c in r if c not in [None, ""]]), default=table[0])
-                        rows = [r for r in table if r is not header]
-
-                        # descarta filas vacías
-                        rows = [r for r in rows if any((cell is not None and str(cell).strip() != "") for cell in r)]
-                        if not rows:
-                            # borrar log
-                            logger.debug("load_trackman_dataframe_from_pdf: No hay filas de datos, omitiendo tabla") # borrar log
-                            continue
-
-                        # normaliza longitudes
-                        max_len = max(len(header), *(len(r) for r in rows))
-                        header = list(header) + [f"col_{i}" for i in range(len(header), max_len)]
-                        norm_rows = [list(r) + [np.nan] * (max_len - len(r)) for r in rows]
-                        # borrar log
-                        logger.debug(f"load_trackman_dataframe_from_pdf: Tabla con {len(norm_rows)} filas y {len(header)} columnas") # borrar log
-
-                        df_tbl = pd.DataFrame(norm_rows, columns=header)
-
-                        # elimina filas que repiten el header
-                        df_tbl = df_tbl[~df_tbl.apply(lambda r: all(str(r.iloc[i]).strip() == str(df_tbl.columns[i]).strip() for i in range(len(df_tbl.columns))), axis=1)]
-
-
-                        # normaliza columnas y valores
-                        df_tbl = _normalize_columns(df_tbl)
-
-                        # rellenos clave para no perder filas al filtrar en los núcleos
-                        df_tbl = _derive_ids_if_missing(df_tbl)
-                        df_tbl = _fill_fecha_carga(df_tbl, source_path=path)
-
-                        # quita filas totalmente vacías de nombres
-                        if {"Batter", "Pitcher"} <= set(df_tbl.columns):
-                            df_tbl = df_tbl[df_tbl["Batter"].notna() | df_tbl["Pitcher"].notna()]
-                            # borrar log
-                            logger.debug(f"load_trackman_dataframe_from_pdf: Tabla filtrada por nombre, quedan {len(df_tbl)} filas") # borrar log
-
-                        if not df_tbl.empty:
-                            all_chunks.append(df_tbl)
-
-        except Exception as e:
-            logger.warning(f"Error leyendo PDF {path}: {e}")
-            # borrar log
-            logger.error(f"load_trackman_dataframe_from_pdf: Fallo al leer PDF {path}: {e}") # borrar log
-            continue
+    last = get_last_games_all(df_games)
+    df_team = last.sort_values(['Pitcher', 'fecha_carga'], ascending=[True, False]).drop_duplicates(subset='Pitcher', keep='first')
+    df_perc = (last.groupby('Pitcher').AutoPitchType.value_counts()/last.groupby('Pitcher').size()*100).round(2).unstack()
+    # cuantiles y medias vectorizados por (Pitcher, AutoPitchType), sin lambdas por grupo
+    grupos = last.groupby(['Pitcher','AutoPitchType'], observed=True)
+    df_rango = grupos.RelSpeed.quantile([0.1, 0.9]).unstack()
+    df_rango.columns = ['min','max']
+    df_medias = grupos.agg({'RelSpeed':'mean', 'SpinRate':'median'})
+    df_medias.columns = ['mean','Spin']
+    df_range_mean_2 = df_rango.join(df_medias).fillna(0).round().astype(int)
+    df_range_mean_2['rango'] = df_range_mean_2['min'].astype(str)+'-'+df_range_mean_2['max'].astype(str)
+    return {
+        'last_games': last,
+        'rows': last.groupby('Pitcher', sort=False).indices,
+        'teams': df_team.set_index('Pitcher')['PitcherTeam'],
+        'perc': df_perc,
+        'range_mean': df_range_mean_2,
+    }
 
-    if not all_chunks:
-        # borrar log
-        logger.warning("load_trackman_dataframe_from_pdf: No se extrajeron tablas de ningún PDF. Regresando DataFrame vacío.") # borrar log
-        return pd.DataFrame(columns=STANDARD_COLUMNS)
-
-    df = pd.concat(all_chunks, ignore_index=True, sort=False)
-    # limpieza final
-    df = _normalize_columns(df)
-    df = _derive_ids_if_missing(df)
-    df = _fill_fecha_carga(df, source_path=None)
-    
-    # borrar log
-    logger.info(f"load_trackman_dataframe_from_pdf: Carga desde PDF finalizada. Total de filas: {len(df)}") # borrar log
-    return df
-
-# -------------------------------
-# Núcleo Batter
-# -------------------------------
-def _run_batter_reports_core(df: pd.DataFrame,
-                             batter_filter: Optional[List[str]] = None,
-                             work_dir: Optional[str] = None,
-                             clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes para bateadores, compatible con batter_tools original."""
-    # borrar log
-    logger.info("_run_batter_reports_core: Iniciando generación de reportes para bateadores") # borrar log
-    df_games = df.copy()
-    print("\n--- DEPURACIÓN: BATTER REPORTS ---")
-    print("Filas totales al inicio:", len(df_games))
-    # borrar log
-    logger.debug(f"_run_batter_reports_core: Filas totales al inicio: {len(df_games)}") # borrar log
-
-    if batter_filter:
-        df_games = df_games[df_games.Batter.isin(batter_filter)]
-        print("Tras aplicar batter_filter:", len(df_games))
-        # borrar log
-        logger.debug(f"_run_batter_reports_core: Filas tras aplicar filtro: {len(df_games)}") # borrar log
-
-    df_games.dropna(subset=["BatterId"], inplace=True)
-    print("Tras eliminar BatterId nulos:", len(df_games))
-    # borrar log
-    logger.debug(f"_run_batter_reports_core: Filas tras eliminar BatterId nulos: {len(df_games)}") # borrar log
-
-    df_games = df_games[df_games.fecha_carga.notna() & (df_games.fecha_carga != "-")]
-    print("Tras filtrar fecha_carga no nula:", len(df_games))
-    # borrar log
-    logger.debug(f"_run_batter_reports_core: Filas tras filtrar fecha_carga no nula: {len(df_games)}") # borrar log
-
-    df_games["fecha_carga"] = pd.to_datetime(df_games["fecha_carga"], errors="coerce")
-    df_games = df_games[df_games["fecha_carga"].notna()]
-    print("Tras convertir fecha_carga a datetime:", len(df_games))
-    # borrar log
-    logger.debug(f"_run_batter_reports_core: Filas tras convertir fecha_carga a datetime: {len(df_games)}") # borrar log
-
-    if df_games.empty:
-        print("Resultado final: DataFrame vacío. No se generarán reportes.")
-        # borrar log
-        logger.warning("_run_batter_reports_core: DataFrame final vacío. No se generarán reportes") # borrar log
-        if clean_temp:
-            base = os.path.join(work_dir, "Batter") if work_dir else None
-            clean_directory("Batter", base)
-        return {"processed": 0, "generated": 0, "paths": []}
-
-    df_stats = bt.create_stats_table(df_games)
-    nombres = df_stats.index.tolist()
-
-    print(f"Total de bateadores con estadísticas: {len(nombres)}")
-    # borrar log
-    logger.info(f"_run_batter_reports_core: Se encontraron {len(nombres)} bateadores para procesar") # borrar log
-
-    generated, artefactos = 0, []
-    for name in nombres:
+def get_pitcher_games(aggregates, pitcher):
+    """Últimos juegos del pitcher a partir de los agregados de liga."""
+    return aggregates['last_games'].iloc[aggregates['rows'][pitcher]]
+
+def get_perc_shot(pitcher, df_perc):
+    return df_perc.loc[pitcher].dropna()
+
+def get_range_mean(pitcher, df_range_mean_2):
+    # [[pitcher]] conserva el nivel Pitcher que usa get_table_1
+    return df_range_mean_2.loc[[pitcher], ['rango','mean','Spin']]
+
+def get_table_1(t1,t2):
+    t3 = t2.join(t1).rename(columns={'rango':'Range','mean':'Común',t2.index[0][0]:'%Uso'})
+    t3 = t3.droplevel(0)
+    t3 = t3.sort_values('%Uso', ascending=False)
+    t3['%Uso'] = t3['%Uso'].apply(lambda x:'{}%'.format(x))
+    t3.index.name='Pitches'
+    return t3
+
+def scatter_pitcher(df_table, pitcher, auto_all, colours):
+    df_pitcher_scatter = df_table[df_table.Pitcher == pitcher].dropna(
+        subset=['InducedVertBreak', 'HorzBreak','AutoPitchType'])
+    if len(df_pitcher_scatter) == 0:
+        print('sin datos')
+        return False
+    fig1, ax = plt.subplots(figsize=(5,5))
+    sns.scatterplot(data=df_pitcher_scatter,
+                    y='InducedVertBreak', x='HorzBreak', hue='AutoPitchType',
+                    alpha=0.7, palette=colours, ax=ax)
+    plt.yticks(range(-30,31,10))
+    plt.ylim(-10,25)
+    ax.tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
+    ax.legend(frameon=False, bbox_to_anchor=(1.5,0.7), ncol=1, fontsize=14)
+    sns.despine(top=True, right=True, left=False, bottom=True, ax=ax)
+    plt.ylabel('')
+    plt.xlabel('')
+    return fig1
+
+def pitch_mix_by_condition(df_table, dict_cond):
+    """
+    Conteos de AutoPitchType por situación en un solo groupby.
+    dict_cond: {título: máscara booleana}; una fila cuenta en cada situación que cumple.
+    Regresa índice (Pitcher, Situacion, AutoPitchType) y columnas BatterSide; por pitcher se lee con .loc.
+    """
+    flags = [f'_cond{i}' for i in range(len(dict_cond))]
+    df_keys = df_table[['Pitcher', 'AutoPitchType', 'BatterSide']].assign(
+        **{flag: mask.to_numpy() for flag, mask in zip(flags, dict_cond.values())})
+    counts = df_keys.groupby(['Pitcher', 'AutoPitchType', 'BatterSide'] + flags, observed=True).size()
+
+    # cada situación suma las combinaciones donde su bandera es True
+    por_situacion = [counts[counts.index.get_level_values(flag)]
+                     .groupby(level=['Pitcher', 'AutoPitchType', 'BatterSide'], observed=True).sum()
+                     for flag in flags]
+    mix = pd.concat(por_situacion, keys=list(dict_cond.keys()), names=['Situacion'])
+    mix = mix.reorder_levels(['Pitcher', 'Situacion', 'AutoPitchType', 'BatterSide'])
+    return mix.unstack('BatterSide').sort_index()
+
+def pie_charts(pitch_mix, dict_cond, pitcher, side):
+    dict_colors = {'Sinker': 'royalblue', 'Cambios': 'darkorange', 'Cutter': 'g', 'Slider': 'firebrick',
+                   'Rectas': 'mediumpurple', 'Curva': 'saddlebrown', 'Splitter': 'grey', 'Other': 'white', np.nan:'white'}
+    plt.rcParams['font.size'] = 25
+    dict_side = {'Left': 'vs Zurdos', 'Right':'vs Derechos'}
+    list_title = list(dict_cond.keys())
+    fig = plt.figure(figsize=(20,10))
+    for i in range(1,4):
+        ax = plt.subplot(1,3,i)
         try:
-            # borrar log
-            logger.debug(f"_run_batter_reports_core: Generando reporte para bateador: {name}") # borrar log
-            r = bt.create_report_full(
-                batter_name=name,
-                df_stats=df_stats,
-                df_games=df_games,
-                dict_short=dict_baseball_teams_short,
-                work_dir=work_dir
-            )
-            if r:
-                artefactos.append(r)
-            generated += 1
-            # borrar log
-            logger.debug(f"_run_batter_reports_core: Reporte para {name} generado exitosamente") # borrar log
-        except Exception as e:
-            logger.warning(f"Error al generar reporte de bateador para {name}: {e}")
-            # borrar log
-            logger.error(f"_run_batter_reports_core: Fallo al generar reporte para {name}: {e}") # borrar log
+            df_plot = pitch_mix.loc[(pitcher, list_title[i-1]), side].dropna()
+        except KeyError:
+            df_plot = pd.Series(dtype=float)
+        total = df_plot.sum()
+        serie_temp = df_plot/total
+        idx_drop = serie_temp[serie_temp < 0.03].index
+        if serie_temp.sum() == 1:
+            serie_temp.iloc[0] -= 0.0001
+        df_plot = serie_temp.drop(idx_drop) if len(idx_drop) else serie_temp.copy()
+        if len(df_plot) == 0:
+            plt.axis('off')
             continue
-
-    if clean_temp:
-        base = os.path.join(work_dir, "Batter") if work_dir else None
-        clean_directory("Batter", base)
-
-    # borrar log
-    logger.info(f"_run_batter_reports_core: Generación de reportes de bateadores finalizada. Procesados: {len(nombres)}, Generados: {generated}") # borrar log
-    return {"processed": len(nombres), "generated": generated, "paths": artefactos}
-
-# -------------------------------
-# Núcleo Pitcher
-# -------------------------------
-
-def _run_pitcher_reports_core(df: pd.DataFrame,
-                              pitcher_filter: Optional[List[str]] = None,
-                              work_dir: Optional[str] = None,
-                              clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes para lanzadores, compatible con pitcher_tools original."""
-    # borrar log
-    logger.info("_run_pitcher_reports_core: Iniciando generación de reportes para lanzadores") # borrar log
-    df_games = df.copy()
-    if pitcher_filter:
-        df_games = df_games[df_games.Pitcher.isin(pitcher_filter)]
-    
-    # borrar log
-    logger.debug(f"_run_pitcher_reports_core: Filas después de aplicar filtro: {len(df_games)}") # borrar log
-
-    df_games = df_games[df_games.BatterSide.isin(["Left", "Right"])]
-    df_games.dropna(subset=["Pitcher"], inplace=True)
-    df_games = df_games[df_games.fecha_carga.notna() & (df_games.fecha_carga != "-")]
-    df_games["fecha_carga"] = pd.to_datetime(df_games["fecha_carga"], errors="coerce")
-    df_games = df_games[df_games["fecha_carga"].notna()]
-    # borrar log
-    logger.debug(f"_run_pitcher_reports_core: Filas después de filtrado y limpieza: {len(df_games)}") # borrar log
-
-    if df_games.empty:
-        # borrar log
-        logger.warning("_run_pitcher_reports_core: DataFrame final vacío. No se generarán reportes") # borrar log
-        if clean_temp:
-            base = os.path.join(work_dir, "Pitcher") if work_dir else None
-            clean_directory("Pitcher", base)
-        return {"processed": 0, "generated": 0, "paths": []}
-
-    df_table = df_games.copy()
-
-    dict_launch = {"Four-Seam": "Rectas", "Changeup": "Cambios", "Curveball": "Curva"}
-    df_table["AutoPitchType"] = df_table.AutoPitchType.apply(lambda x: dict_launch.get(str(x), x))
-    # borrar log
-    logger.debug("_run_pitcher_reports_core: Mapeo de tipos de pitcheo realizado") # borrar log
-
-    cond1 = df_table["PitchofPA"] == 1
-    cond2 = pd.Series(True, index=df_table.index)
-    cond3 = df_table["Strikes"] == 2
-    dict_cond = {"1er Pitcheo": cond1, "General": cond2, "2 Strikes": cond3}
-
-    dict_df_cond: Dict[int, pd.DataFrame] = {}
-    for i, cond in enumerate(dict_cond.values(), start=1):
-        df_cond = df_table[cond]
-        if df_cond.empty:
-            dict_df_cond[i] = pd.DataFrame()
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Condición {i} resultó en un DataFrame vacío") # borrar log
-        else:
-            df_temp_num = df_cond.groupby(["Pitcher", "BatterSide", "AutoPitchType"]).size()
-            dict_df_cond[i] = df_temp_num.unstack(1)
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Condición {i} procesada, DataFrame con {len(df_temp_num)} filas") # borrar log
-
-    name_pitchers = sorted(df_table.Pitcher.dropna().unique().tolist())
-    generated, artefactos = 0, []
-    # borrar log
-    logger.info(f"_run_pitcher_reports_core: Se encontraron {len(name_pitchers)} lanzadores para procesar") # borrar log
-
-    for name in name_pitchers:
         try:
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Generando reporte para lanzador: {name}") # borrar log
-            r = pt.create_report_full(
-                pitcher_name=name,
-                dict_df_cond=dict_df_cond,
-                dict_cond=dict_cond,
-                dict_short=dict_baseball_teams_short,
-                df_table=df_table,
-                work_dir=work_dir
-            )
-            if r:
-                artefactos.append(r)
-            generated += 1
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Reporte para {name} generado exitosamente") # borrar log
-        except Exception as e:
-            logger.warning(f"Error al generar reporte de lanzador para {name}: {e}")
-            # borrar log
-            logger.error(f"_run_pitcher_reports_core: Fallo al generar reporte para {name}: {e}") # borrar log
-            continue
-
-    if clean_temp:
-        base = os.path.join(work_dir, "Pitcher") if work_dir else None
-        clean_directory("Pitcher", base)
-
-    # borrar log
-    logger.info(f"_run_pitcher_reports_core: Generación de reportes de lanzadores finalizada. Procesados: {len(name_pitchers)}, Generados: {generated}") # borrar log
-    return {"processed": len(name_pitchers), "generated": generated, "paths": artefactos}
-
-# -------------------------------
-# API pública compatible con GUI
-# -------------------------------
-
-def run_batter_reports(arg1: Union[pd.DataFrame, List[str]],
-                       df: Optional[pd.DataFrame] = None,
-                       work_dir: Optional[str] = None,
-                       clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes de bateadores. Puede recibir un DataFrame o una lista de nombres."""
-    # borrar log
-    logger.info("run_batter_reports: Llamada a la API pública de reportes de bateadores") # borrar log
-    if isinstance(arg1, pd.DataFrame):
-        # borrar log
-        logger.debug("run_batter_reports: arg1 es un DataFrame. Llamando a _run_batter_reports_core con DataFrame.") # borrar log
-        return _run_batter_reports_core(arg1, batter_filter=None, work_dir=work_dir, clean_temp=clean_temp)
-    nombres: List[str] = arg1 or []
-    if df is None:
-        # borrar log
-        logger.debug("run_batter_reports: df es None. Cargando datos desde BigQuery.") # borrar log
-        df = load_trackman_dataframe()
-    # borrar log
-    logger.debug("run_batter_reports: Llamando a _run_batter_reports_core con filtro de nombres.") # borrar log
-    return _run_batter_reports_core(df, batter_filter=_normalize_person_list(nombres), work_dir=work_dir, clean_temp=clean_temp)
-
-def run_pitcher_reports(arg1: Union[pd.DataFrame, List[str]],
-                        df: Optional[pd.DataFrame] = None,
-                        work_dir: Optional[str] = None,
-                        clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes de lanzadores. Puede recibir un DataFrame o una lista de nombres."""
-    # borrar log
-    logger.info("run_pitcher_reports: Llamada a la API pública de reportes de lanzadores") # borrar log
-    if isinstance(arg1, pd.DataFrame):
-        # borrar log
-        logger.debug("run_pitcher_reports: arg1 es un DataFrame. Llamando a _run_pitcher_reports_core con DataFrame.") # borrar log
-        return _run_pitcher_reports_core(arg1, pitcher_filter=None, work_dir=work_dir, clean_temp=clean_temp)
-    nombres: List[str] = arg1 or []
-    if df is None:
-        # borrar log
-        logger.debug("run_pitcher_reports: df es None. Cargando datos desde BigQuery.") # borrar log
-        df = load_trackman_dataframe()
-    # borrar log
-    logger.debug("run_pitcher_reports: Llamando a _run_pitcher_reports_core con filtro de nombres.") # borrar log
-    return _run_pitcher_reports_core(df, pitcher_filter=_normalize_person_list(nombres), work_dir=work_dir, clean_temp=clean_temp)
-
-# -------------------------------
-# Main (como librería)
-# -------------------------------
-
-def main(df: Optional[pd.DataFrame] = None,
-         query: str = BQ_DEFAULT_QUERY,
-         batter_filter: Optional[List[str]] = None,
-         pitcher_filter: Optional[List[str]] = None,
-         work_dir: Optional[str] = None,
-         clean_temp: bool = True) -> Dict[str, Dict[str, Any]]:
-    """Función principal para generar reportes de bateadores y lanzadores."""
-    # borrar log
-    logger.info("main: Iniciando función principal") # borrar log
-    if df is None:
-        # borrar log
-        logger.debug("main: df es None. Cargando datos desde BigQuery.") # borrar log
-        df = load_trackman_dataframe(query=query)
-
-    batter_summary = _run_batter_reports_core(
-        df, batter_filter=_normalize_person_list(batter_filter), work_dir=work_dir, clean_temp=clean_temp
-    )
-    # borrar log
-    logger.info("main: Reportes de bateadores generados") # borrar log
-    
-    pitcher_summary = _run_pitcher_reports_core(
-        df, pitcher_filter=_normalize_person_list(pitcher_filter), work_dir=work_dir, clean_temp=clean_temp
-    )
-    # borrar log
-    logger.info("main: Reportes de lanzadores generados") # borrar log
-
-    result = {
-        "batter": {
-            "processed": int(batter_summary.get("processed", 0)),
-            "generated": int(batter_summary.get("generated", 0)),
-            "paths": batter_summary.get("paths", []),
-        },
-        "pitcher": {
-            "processed": int(pitcher_summary.get("processed", 0)),
-            "generated": int(pitcher_summary.get("generated", 0)),
-            "paths": pitcher_summary.get("paths", []),
-        },
-    }
-    # borrar log
-    logger.info("main: Función principal finalizada") # borrar log
-    return result
\ No newline at end of file
+            df_plot.plot.pie(autopct='%.0f%%', labels=['' for _ in df_plot.index],
+                             colors=[dict_colors[key] for key in df_plot.index],
+                             textprops=dict(color="w", fontsize=20),
+                             wedgeprops={'linewidth':1.5, 'edgecolor':'grey'},
+                             normalize=False, title=list_title[i-1])
+        except ValueError:
+            df_plot.plot.pie(autopct='%.0f%%', labels=['' for _ in df_plot.index],
+                             colors=[dict_colors[key] for key in df_plot.index],
+                             textprops=dict(color="w", fontsize=20),
+                             wedgeprops={'linewidth':1.5, 'edgecolor':'grey'},
+                             normalize=True, title=list_title[i-1])
+        plt.ylabel(dict_side[side] if i == 1 else '', fontsize=40)
+    markers = [plt.Line2D([0,0],[0,0],color=color, marker='s', linestyle='', markersize=15) for color in dict_colors.values()][:-2]
+    if side == 'Left':
+        plt.legend(markers, dict_colors.keys(), frameon=False, bbox_to_anchor=(1.0,1.2), ncol=10, fontsize=20)
+    return fig
+
+def pitcher_view_scatter(df_table, pitcher, side, colours):
+    dict_colors = {'Rectas y sinkers':'royalblue', 'Cutters y Sliders':'g', 'Curvas':'saddlebrown', 'Cambios y Splits':'darkorange'}
+    df_pitcher_scatter = df_table[(df_table.Pitcher == pitcher) & (df_table.BatterSide == side)].copy()
+    df_pitcher_scatter = df_pitcher_scatter.sort_values('Date', ascending=False).head(100)
+    fig, ax = plt.subplots(figsize=(10,8))
+    plt.suptitle('VS '+side, fontsize=25)
+    i = 0
+    for pitch_type in dict_colors.keys():
+        df_filtered = df_pitcher_scatter[df_pitcher_scatter["auto_pitch_type_2"] == pitch_type]
+        ax = plt.subplot(1, len(dict_colors), i+1)
+        i += 1
+        plt.title(str(pitch_type), fontsize=18)
+        x_radio = 0.83083335
+        y_low, y_high = 1.5442, 3.455833
+        x = np.linspace(-x_radio, x_radio, 10)
+        y = np.linspace(y_low, y_high, 10)
+        plt.plot(np.repeat(-x_radio, len(y)), y, c='black')
+        plt.plot(np.repeat(x_radio, len(y)), y, c='black')
+        plt.plot(x, np.repeat(y_low, len(x)), c='black')
+        plt.plot(x, np.repeat(y_high, len(x)), c='black')
+        plt.xlim(-1.7,1.7)
+        plt.ylim(y_low - 0.5, y_high + 0.5)
+        plt.axis('off')
+        if len(df_filtered) > 0:
+            density.kde_fill(ax, df_filtered["PlateLocSide"], df_filtered["PlateLocHeight"],
+                             cmap='coolwarm', alpha=0.6, bw_adjust=0.4, thresh=0.1)
+            ax.tick_params(axis='both',which='both',bottom=False,top=False,left=False,right=False,
+                           labelbottom=False,labelleft=False)
+            sns.despine(top=True, right=True, left=True, bottom=True, ax=ax)
+        plt.tight_layout()
+    return fig
+
+# th: 2px arriba/izquierda/derecha; td: 1px izquierda/derecha/abajo; columna Pitches en negritas
+PITCHER_TABLE_STYLE = table_render.TableStyle(header_edges="TLR", cell_edges="BLR", bold_columns=('Pitches',))
+
+def create_style_launcherbyteam(df_temp):
+    df_temp = df_temp.reset_index().rename(columns={'index': 'Pitches'})
+    return table_render.StyledTable(df_temp, PITCHER_TABLE_STYLE)
+
+def _savefig_rgb(fig, path, **kwargs):
+    # PNG sin canal alfa (el fondo es opaco): fpdf separa el alfa de un RGBA en Python
+    # píxel por píxel, y eso se llevaba ~90% del tiempo de cada reporte
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', **kwargs)
+    buf.seek(0)
+    Image.open(buf).convert('RGB').save(path, format='PNG')
+
+def from_df_to_tablepng(pitcher_name, dir_temp, table, name, figures=None):
+    fig = table_render.table_figure(table)
+    output_path = os.path.join(dir_temp, name + ".png")
+    if figures is not None:
+        figures[output_path] = vector_pdf.VectorChart(fig, 0)
+        plt.close(fig)
+        return
+    os.makedirs(dir_temp, exist_ok=True)
+    _savefig_rgb(fig, output_path, dpi=200, bbox_inches='tight', pad_inches=0)
+    plt.close(fig)
+
+def save_fig(dir_temp, pitcher_name, chart, chart_name, dpi=200, figures=None):
+    dir_ = os.path.join(dir_temp, pitcher_name)
+    if figures is not None:
+        # modo vectorial: la Figure queda bajo la misma ruta que create_report pediría a disco
+        figures[os.path.join(dir_, chart_name+'.png')] = vector_pdf.VectorChart(chart, 0)
+        plt.close(chart)
+        return
+    os.makedirs(dir_, exist_ok=True)
+    _savefig_rgb(chart, os.path.join(dir_, chart_name+'.png'), dpi=dpi, bbox_inches='tight', pad_inches=0)
+    plt.close(chart)
+
+def get_img_team(team_name):
+    df_temp = pd.read_csv('img/img_equipos.csv')
+    if len(team_name) > 7:
+        return df_temp[df_temp.equipo == team_name]['ruta'].iloc[0]
+    else:
+        return df_temp[df_temp.equipo_abreviado == team_name]['ruta'].iloc[0]
+
+def create_report(pitcher_name, team, dir_images, output_path, tt, dict_short, figures=None):
+    team_temp = dict_short.get(team, team)
+    pdf = vector_pdf.VectorPDF(figures) if figures is not None else fpdf.FPDF()
+    pdf.add_page()
+    pdf.set_font('Times', 'B', 22)
+    pdf.cell(0, 8, 'Pitcher: '+pitcher_name+', '+team_temp, border=0, ln=2, align='C')
+    pdf.image(os.path.join(dir_images,'table_1.png'), x=0.1, y=20, w=90, h=140-tt)
+    pdf.image(os.path.join(dir_images,'pie_right.png'), x=5, y=139, w=180, h=40)
+    pdf.image(os.path.join(dir_images,'pie_left.png'),  x=5, y=100, w=180, h=42)
+    pdf.image(os.path.join(dir_images,'scatter_mov.png'), x=90, y=20, w=110, h=80)
+    pdf.image(os.path.join(dir_images,'scatter_left.png'), x=1, y=185, w=210, h=45)
+    pdf.image(_home_plate_path(), x=90, y=235, w=40, h=12)
+    pdf.image(os.path.join(dir_images,'scatter_right.png'), x=1, y=250, w=210, h=45)
+    dir_output = os.path.dirname(dir_images)
+    os.makedirs(dir_output, exist_ok=True)  # en modo vectorial no se escribió nada antes
+    pdf.output(os.path.join(dir_output, pitcher_name+'.pdf'), dest='F')
+    return os.path.join(output_path, pitcher_name+'.pdf')
+
+# -------------------------------------------
+# create_report_full: usa agregados de liga precalculados
+# -------------------------------------------
+def create_report_full(pitcher_name, pitch_mix, dict_cond, dict_short,
+                       df_table=None, work_dir=None, aggregates=None, render_mode='raster'):
+    """
+    Genera el PDF de un pitcher. `pitch_mix` viene de pitch_mix_by_condition y
+    `aggregates` de precompute_pitcher_aggregates;
+    si no se pasa, se calcula (y se consulta BigQuery) una sola vez por proceso.
+    `df_table` se acepta por compatibilidad: la tabla y los scatter salen de pitchers_stats.
+    Con render_mode='vector' las gráficas no pasan a PNG: se dibujan como vectores en el PDF.
+    """
+    if aggregates is None:
+        aggregates = _league_aggregates()
+    base_dir = os.path.join(work_dir, 'Pitcher') if work_dir else DIR_TEMP
+
+    # Subconjunto del pitcher (últimos juegos) y equipo más reciente
+    df_pitcher = get_pitcher_games(aggregates, pitcher_name)
+    team = aggregates['teams'].loc[pitcher_name]
+
+    # Tabla de % uso y rangos
+    t1 = get_perc_shot(pitcher_name, aggregates['perc'])
+    t2 = get_range_mean(pitcher_name, aggregates['range_mean'])
+
+    figures = {} if render_mode == 'vector' else None
+    table_1 = create_style_launcherbyteam(get_table_1(t1,t2))
+    from_df_to_tablepng(pitcher_name, os.path.join(base_dir, team, pitcher_name), table_1, 'table_1', figures=figures)
+
+    auto_all = df_pitcher.AutoPitchType.unique().tolist()
+    colours = dict(zip(auto_all, plt.cm.tab10.colors[:len(auto_all)]))
+
+    save_fig(os.path.join(base_dir, team), pitcher_name, scatter_pitcher(df_pitcher,pitcher_name,auto_all,colours), 'scatter_mov', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pie_charts(pitch_mix,dict_cond,pitcher_name,'Left'), 'pie_left', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pie_charts(pitch_mix,dict_cond,pitcher_name,'Right'), 'pie_right', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pitcher_view_scatter(df_pitcher,pitcher_name,'Left',colours), 'scatter_left', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pitcher_view_scatter(df_pitcher,pitcher_name,'Right',colours), 'scatter_right', figures=figures)
+
+    num_pitches = df_pitcher.AutoPitchType.nunique()
+    tt = 60 if num_pitches <= 4 else num_pitches*12
+    dir_images = os.path.join(base_dir, team, pitcher_name)
+    return create_report(pitcher_name, team, dir_images, dir_images, tt, dict_short, figures)
+
+_aggregates = None
+
+def _league_aggregates():
+    global _aggregates
+    if _aggregates is None:
+        _aggregates = precompute_pitcher_aggregates(load_pitcher_stats())
+    return _aggregates
@@ -0,0 +1,35 @@
+# player_names.py
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Limpieza de nombres de jugadores
+# -------------------------------
+# Una sola definición para la app de escritorio y para services/python_scripts
+# (que la importa vía shared_modules): los nombres limpios son las llaves de
+# PlayerIndex, de las carpetas y de los PDF, y deben coincidir en ambos árboles.
+
+@lru_cache(maxsize=65536)
+def clean_name(name: str) -> str:
+    """'Apellido, Nombre' -> 'Nombre Apellido' en título, sin acentos; vacío -> 'Sin_nombre'."""
+    if not name or str(name).strip() == "":
+        return "Sin_nombre"
+    parts = [p.strip() for p in str(name).split(",")]
+    rearranged = f"{parts[-1]} {parts[0]}".strip() if len(parts) >= 2 else parts[0]
+    rearranged = " ".join(rearranged.title().split())
+    normalized = unicodedata.normalize("NFKD", rearranged)
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+def clean_name_series(s: pd.Series) -> pd.Series:
+    """clean_name sobre los valores distintos de la columna y mapeado de regreso (O(nombres distintos))."""
+    codes, uniques = pd.factorize(s)
+    limpios = np.array([clean_name(u) for u in uniques], dtype=object)
+    out = limpios[codes] if len(limpios) else np.empty(len(s), dtype=object)
+    # None/NaN no son iguales para clean_name ('Sin_nombre' vs 'Nan'): se limpian uno a uno
+    na = codes < 0
+    if na.any():
+        out[na] = [clean_name(v) for v in s.to_numpy(dtype=object)[na]]
+    return pd.Series(out, index=s.index, name=s.name)
@@ -1,8 +1,12 @@
 # reports.py
 import os
 import re
-import unicodedata
-from typing import List, Optional, Dict, Any, Union
+import sys
+import shutil
+import tempfile
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Dict, Any, Union, Tuple
 
 
 import matplotlib.pyplot as plt
@@ -10,12 +14,13 @@ import pandas as pd
 import numpy as np
 import logging
 
-from google.cloud import bigquery
-import google.auth
-from google.cloud import bigquery_storage
-
 import batter_tools as bt
 import pitcher_tools as pt
+import spray_chart_constructors_f as scc
+import trackman_cache as tc
+import debug_snapshot as ds
+from player_names import clean_name, clean_name_series
+import vector_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +55,10 @@ DIR_BATTER = os.path.join(_BASE_ROOT, 'Batter')
 DIR_PITCHER = os.path.join(_BASE_ROOT, 'Pitcher')
 DIR_HOMEPLATE = os.path.join(_BASE_ROOT, 'img')
 
+# caché local de trackman_table; en el .exe se guarda junto al ejecutable para que persista entre corridas
+_CACHE_BASE = os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else _BASE_ROOT
+TRACKMAN_CACHE_DIR = os.environ.get("TRACKMAN_CACHE_DIR") or os.path.join(_CACHE_BASE, "cache", "trackman")
+
 os.makedirs(DIR_BATTER, exist_ok=True)
 os.makedirs(DIR_PITCHER, exist_ok=True)
 os.makedirs(DIR_HOMEPLATE, exist_ok=True)
@@ -71,23 +80,6 @@ except Exception:
 # Utilidades
 # -------------------------------
 
-def clean_name(name: str) -> str:
-    """Normaliza un nombre para su procesamiento."""
-    # borrar log
-    logger.debug(f"clean_name: Normalizando nombre: '{name}'") # borrar log
-    if not name or str(name).strip() == "":
-        # borrar log
-        logger.debug("clean_name: Nombre vacío, regresando 'Sin_nombre'") # borrar log
-        return "Sin_nombre"
-    parts = [p.strip() for p in str(name).split(",")]
-    rearranged = f"{parts[-1]} {parts[0]}".strip() if len(parts) >= 2 else parts[0]
-    rearranged = " ".join(rearranged.title().split())
-    normalized = unicodedata.normalize("NFKD", rearranged)
-    result = "".join(c for c in normalized if not unicodedata.combining(c))
-    # borrar log
-    logger.debug(f"clean_name: Nombre normalizado a: '{result}'") # borrar log
-    return result
-
 def clean_directory(base_subdir: str, base_path: Optional[str] = None) -> None:
     """Limpia los archivos .png de un directorio de reportes."""
     logger.info(f"clean_directory: Limpiando directorio {base_subdir}")
@@ -307,9 +299,9 @@ def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
 
     # limpia nombres
     if "Batter" in df.columns:
-        df["Batter"] = df["Batter"].apply(clean_name)
+        df["Batter"] = clean_name_series(df["Batter"])
     if "Pitcher" in df.columns:
-        df["Pitcher"] = df["Pitcher"].apply(clean_name)
+        df["Pitcher"] = clean_name_series(df["Pitcher"])
     # borrar log
     logger.debug("_normalize_columns: Nombres de jugadores limpiados") # borrar log
 
@@ -336,10 +328,49 @@ def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# -------------------------------
+# Esquema de tipos (memoria)
+# -------------------------------
+
+# texto de baja cardinalidad -> category (sobre STANDARD_COLUMNS)
+CATEGORICAL_COLUMNS = [
+    "AutoHitType", "AutoPitchType", "AwayTeam", "Batter", "BatterSide", "BatterTeam",
+    "CatcherTeam", "HomeTeam", "KorBB", "Pitcher", "PitcherTeam", "PitchCall", "PitcherThrows",
+    "PlayResult", "Temporada", "Temporada_Anio", "id_path", "auto_pitch_type_2"
+]
+# mediciones Trackman: float32 alcanza (2-3 decimales en origen); conteos enteros son exactos en float32
+FLOAT32_COLUMNS = [
+    "Angle", "Bearing", "Distance", "ExitSpeed", "HorzBreak", "InducedVertBreak",
+    "PlateLocHeight", "PlateLocSide", "RelSpeed", "SpinRate", "PitchofPA", "Strikes"
+]
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte el frame de Trackman a tipos compactos: category para los textos repetidos y
+    float32 para las mediciones. Los filtros ==/isin funcionan igual sobre category.
+    """
+    if df.empty:
+        return df
+    before = df.memory_usage(deep=True).sum()
+    for c in CATEGORICAL_COLUMNS:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    for c in FLOAT32_COLUMNS:
+        if c in df.columns and df[c].dtype != np.float32:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype(np.float32)
+    # borrar log
+    logger.info(f"apply_schema: memoria {before / 1e6:.1f} MB -> {df.memory_usage(deep=True).sum() / 1e6:.1f} MB") # borrar log
+    return df
+
 # -------------------------------
 # Consulta BigQuery
 # -------------------------------
 
+def _bigquery():
+    """google.cloud.bigquery al primer uso: con caché local o PDF no se importa."""
+    from google.cloud import bigquery
+    return bigquery
+
 BQ_DEFAULT_QUERY = """
 SELECT 
     Angle, AutoHitType, AutoPitchType, AwayTeam,
@@ -355,32 +386,242 @@ WHERE Temporada_Anio IN (
 )
 """
 
-def load_trackman_dataframe(query: str = BQ_DEFAULT_QUERY) -> pd.DataFrame:
-    """Carga datos desde BigQuery y aplica limpieza de nombres."""
-    # borrar log
-    logger.info("load_trackman_dataframe: Cargando datos desde BigQuery") # borrar log
-    client = bigquery.Client()
-    query_job = client.query(query)
+TRACKMAN_TABLE = "`baseballlmb.trackman_db.trackman_table`"
+DEFAULT_SEASONS = ["Invierno-2025", "Verano-2025", "Invierno-2024", "Verano-2024"]
+
+# columnas que realmente usan los reportes de cada rol
+BATTER_COLUMNS = [
+    "Angle", "AutoHitType", "AutoPitchType", "BatterId", "Batter", "BatterTeam", "Bearing",
+    "Date", "Distance", "ExitSpeed", "KorBB", "PitchCall", "PitcherThrows", "PitchofPA",
+    "PlateLocHeight", "PlateLocSide", "PlayResult", "Strikes", "Temporada_Anio", "id_path", "fecha_carga"
+]
+PITCHER_COLUMNS = [
+    "AutoPitchType", "BatterSide", "Date", "HorzBreak", "InducedVertBreak", "PitcherId", "Pitcher",
+    "PitcherTeam", "PitcherThrows", "PitchofPA", "PlateLocHeight", "PlateLocSide", "RelSpeed",
+    "SpinRate", "Strikes", "Temporada_Anio", "id_path", "fecha_carga"
+]
+
+def build_trackman_query(columns: Optional[List[str]] = None,
+                         filter_names: bool = False,
+                         date_from: Optional[Any] = None,
+                         date_to: Optional[Any] = None) -> str:
+    """
+    Arma la consulta parametrizada sobre trackman_table.
+    Parámetros: @seasons, @batters/@pitchers (si filter_names) y @date_from/@date_to.
+    Los filtros de nombres se combinan con OR: se trae una fila si el bateador o el lanzador está en la lista.
+    """
+    cols = [c for c in (columns or STANDARD_COLUMNS) if c in STANDARD_COLUMNS]
+    where = ["Temporada_Anio IN UNNEST(@seasons)"]
+    if filter_names:
+        where.append("(Batter IN UNNEST(@batters) OR Pitcher IN UNNEST(@pitchers))")
+    if date_from is not None:
+        where.append("SAFE_CAST(Date AS DATE) >= @date_from")
+    if date_to is not None:
+        where.append("SAFE_CAST(Date AS DATE) <= @date_to")
+    return (
+        f"SELECT {', '.join(cols)}\n"
+        f"FROM {TRACKMAN_TABLE}\n"
+        f"WHERE {' AND '.join(where)}"
+    )
+
+# parámetro de consulta independiente del cliente: (nombre, tipo BigQuery, valor); una lista es ARRAY
+QueryParam = Tuple[str, str, Any]
+
+def _bigquery_job_config(params: Optional[List[QueryParam]]) -> Optional[Any]:
+    """Convierte los parámetros a QueryJobConfig; solo lo usa el cliente real de BigQuery."""
+    if not params:
+        return None
+    bigquery = _bigquery()
+    return bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ArrayQueryParameter(name, type_, list(value)) if isinstance(value, (list, tuple))
+        else bigquery.ScalarQueryParameter(name, type_, value)
+        for name, type_, value in params
+    ])
+
+def _run_query(query: str,
+               params: Optional[List[QueryParam]] = None,
+               client: Optional[Any] = None) -> pd.DataFrame:
+    """Ejecuta una consulta (con parámetros opcionales) y regresa un DataFrame."""
+    if client is not None:
+        # cliente inyectado (p. ej. tc.LocalTrackmanClient): recibe los parámetros tal cual, sin google.cloud
+        return client.query(query, params=params).result().to_dataframe()
+
+    client = _bigquery().Client()
+    query_job = client.query(query, job_config=_bigquery_job_config(params))
     try:
+        import google.auth
+        from google.cloud import bigquery_storage
         credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
         bqstorageclient = bigquery_storage.BigQueryReadClient(credentials=credentials)
         # borrar log
-        logger.debug("load_trackman_dataframe: Usando BigQueryReadClient para cargar DataFrame") # borrar log
-        df = query_job.result().to_dataframe(bqstorage_client=bqstorageclient)
+        logger.debug("_run_query: Usando BigQueryReadClient para cargar DataFrame") # borrar log
+        return query_job.result().to_dataframe(bqstorage_client=bqstorageclient)
     except Exception:
         # borrar log
-        logger.warning("load_trackman_dataframe: Fallo al usar BigQueryReadClient. Recurriendo a to_dataframe() normal.") # borrar log
-        df = query_job.result().to_dataframe()
+        logger.warning("_run_query: Fallo al usar BigQueryReadClient. Recurriendo a to_dataframe() normal.") # borrar log
+        return query_job.result().to_dataframe()
+
+def _clean_player_names(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica clean_name a Batter/Pitcher."""
+    if "Batter" in df.columns:
+        df["Batter"] = clean_name_series(df["Batter"])
+    if "Pitcher" in df.columns:
+        df["Pitcher"] = clean_name_series(df["Pitcher"])
+    return df
+
+def _resolve_raw_names(names: List[str], role: str, seasons: List[str],
+                       client: Optional[Any] = None) -> List[str]:
+    """
+    Traduce nombres normalizados (clean_name) a los valores crudos de BigQuery ('Apellido, Nombre').
+    Consulta solo la columna DISTINCT del rol, que es barata en BigQuery.
+    """
+    sql = f"SELECT DISTINCT {role} FROM {TRACKMAN_TABLE} WHERE Temporada_Anio IN UNNEST(@seasons)"
+    params = [("seasons", "STRING", list(seasons))]
+    df_names = _run_query(sql, params=params, client=client)
+    wanted = set(names)
+    raw = [v for v in df_names[role].dropna().unique().tolist() if clean_name(v) in wanted]
+    # borrar log
+    logger.debug(f"_resolve_raw_names: {len(raw)} valores crudos de {role} para {len(wanted)} nombres") # borrar log
+    return sorted(raw)
+
+def _filter_loaded(df: pd.DataFrame,
+                   batters: Optional[List[str]] = None,
+                   pitchers: Optional[List[str]] = None,
+                   seasons: Optional[List[str]] = None,
+                   date_from: Optional[Any] = None,
+                   date_to: Optional[Any] = None,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Aplica en pandas los mismos filtros que la consulta parametrizada (para la caché local)."""
+    mask = pd.Series(True, index=df.index)
+    if seasons is not None and "Temporada_Anio" in df.columns:
+        mask &= df["Temporada_Anio"].isin(seasons)
+    if batters is not None or pitchers is not None:
+        by_name = pd.Series(False, index=df.index)
+        if batters and "Batter" in df.columns:
+            by_name |= df["Batter"].isin(batters)
+        if pitchers and "Pitcher" in df.columns:
+            by_name |= df["Pitcher"].isin(pitchers)
+        mask &= by_name
+    if (date_from is not None or date_to is not None) and "Date" in df.columns:
+        fechas = pd.to_datetime(df["Date"], errors="coerce")
+        if date_from is not None:
+            mask &= fechas >= pd.Timestamp(date_from)
+        if date_to is not None:
+            mask &= fechas <= pd.Timestamp(date_to)
+    df = df[mask]
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df.reset_index(drop=True)
+
+def load_trackman_dataframe(query: str = BQ_DEFAULT_QUERY,
+                            client: Optional[Any] = None,
+                            use_cache: bool = True,
+                            cache_dir: Optional[str] = None,
+                            batters: Optional[List[str]] = None,
+                            pitchers: Optional[List[str]] = None,
+                            seasons: Optional[List[str]] = None,
+                            date_from: Optional[Any] = None,
+                            date_to: Optional[Any] = None,
+                            columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Carga datos de Trackman y aplica limpieza de nombres.
+    Con caché: lee el Parquet local y solo trae de BigQuery las filas con fecha_carga
+    posterior a la marca de agua. En frío (o sin pyarrow) hace la consulta completa.
+    Sin caché y con filtros (nombres normalizados, temporadas, fechas, columnas) los
+    empuja a una consulta parametrizada; una corrida filtrada no llena la caché.
+    `client` permite sustituir bigquery.Client (p. ej. tc.LocalTrackmanClient); recibe
+    query(sql, params=[(nombre, tipo, valor), ...]) y nunca importa google.cloud.
+    """
+    # borrar log
+    logger.info("load_trackman_dataframe: Cargando datos de Trackman") # borrar log
+    batters = batters or None
+    pitchers = pitchers or None
+    filtered = any(v is not None for v in (batters, pitchers, seasons, date_from, date_to, columns))
+    filters = dict(batters=batters, pitchers=pitchers, seasons=seasons,
+                   date_from=date_from, date_to=date_to, columns=columns)
+
+    cache = None
+    if use_cache:
+        if tc.parquet_available():
+            cache = tc.TrackmanCache(cache_dir or TRACKMAN_CACHE_DIR, query)
+        else:
+            # borrar log
+            logger.warning("load_trackman_dataframe: pyarrow no disponible, se omite la caché local") # borrar log
+
+    cache_ok = cache is not None and cache.is_valid()
+    if cache_ok and seasons is not None and not set(seasons) <= set(cache.partitions):
+        # borrar log
+        logger.info("load_trackman_dataframe: Temporadas fuera de la caché, se consulta BigQuery") # borrar log
+        cache_ok = False
+
+    if cache_ok:
+        watermark = cache.watermark
+        # borrar log
+        logger.info(f"load_trackman_dataframe: Caché local encontrada, watermark={watermark}") # borrar log
+        try:
+            params = [("watermark", "TIMESTAMP", watermark.to_pydatetime())]
+            delta = _run_query(tc.build_delta_query(query), params=params, client=client)
+            if not delta.empty:
+                cache.merge_delta(_clean_player_names(delta))
+            # borrar log
+            logger.info(f"load_trackman_dataframe: Delta de {len(delta)} filas integrado") # borrar log
+        except Exception as e:
+            # sin conexión se sigue con lo que haya en disco, pero la caché queda atrasada: se reporta como error
+            msg = f"load_trackman_dataframe: No se pudo traer el delta ({e}). Los datos llegan solo hasta {watermark}."
+            logger.error(msg, exc_info=True)
+            if _gui_logger:
+                _gui_logger(msg)
+        read_cols = None
+        if columns is not None:
+            read_cols = list(dict.fromkeys(list(columns) + ["Batter", "Pitcher", "Temporada_Anio", "Date"]))
+        df = cache.load(seasons=seasons, columns=read_cols)
+        if filtered:
+            df = _filter_loaded(df, **filters)
+    elif filtered and query == BQ_DEFAULT_QUERY:
+        seasons_q = list(seasons) if seasons is not None else list(DEFAULT_SEASONS)
+        params = [("seasons", "STRING", seasons_q)]
+        filter_names = batters is not None or pitchers is not None
+        if filter_names:
+            raw_batters = _resolve_raw_names(batters, "Batter", seasons_q, client) if batters else []
+            raw_pitchers = _resolve_raw_names(pitchers, "Pitcher", seasons_q, client) if pitchers else []
+            params += [("batters", "STRING", raw_batters), ("pitchers", "STRING", raw_pitchers)]
+        if date_from is not None:
+            params.append(("date_from", "DATE", pd.Timestamp(date_from).date()))
+        if date_to is not None:
+            params.append(("date_to", "DATE", pd.Timestamp(date_to).date()))
+        sql = build_trackman_query(columns=columns, filter_names=filter_names,
+                                   date_from=date_from, date_to=date_to)
+        # borrar log
+        logger.info("load_trackman_dataframe: Consulta parametrizada con filtros en BigQuery") # borrar log
+        df = _run_query(sql, params=params, client=client)
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        df = _clean_player_names(df)
+    else:
+        df = _run_query(query, client=client)
+        if not df.empty:
+            df = _clean_player_names(df)
+            if cache is not None:
+                try:
+                    cache.write_full(df)
+                except Exception as e:
+                    # borrar log
+                    logger.warning(f"load_trackman_dataframe: No se pudo escribir la caché local: {e}") # borrar log
+        if filtered:
+            df = _filter_loaded(df, **filters)
+
     if df.empty:
+        if filtered:
+            # con filtros un resultado vacío es válido: los núcleos lo reportan sin generar nada
+            # borrar log
+            logger.warning("load_trackman_dataframe: Ningún registro coincide con los filtros") # borrar log
+            return df
         # borrar log
         logger.error("load_trackman_dataframe: BigQuery devolvió un DataFrame vacío") # borrar log
         raise RuntimeError("BigQuery no devolvió registros.")
-    if "Batter" in df.columns:
-        df["Batter"] = df["Batter"].apply(clean_name)
-    if "Pitcher" in df.columns:
-        df["Pitcher"] = df["Pitcher"].apply(clean_name)
+    df = apply_schema(df)
     # borrar log
-    logger.info("load_trackman_dataframe: Carga desde BigQuery finalizada") # borrar log
+    logger.info(f"load_trackman_dataframe: Carga finalizada. Total de filas: {len(df)}") # borrar log
     return df
 
 # -------------------------------
@@ -542,19 +783,298 @@ def load_trackman_dataframe_from_pdf(pdf_paths: Union[str, List[str]]) -> pd.Dat
     df = _normalize_columns(df)
     df = _derive_ids_if_missing(df)
     df = _fill_fecha_carga(df, source_path=None)
+    df = apply_schema(df)
     
     # borrar log
     logger.info(f"load_trackman_dataframe_from_pdf: Carga desde PDF finalizada. Total de filas: {len(df)}") # borrar log
     return df
 
+# -------------------------------
+# Enriquecimiento de df_games
+# -------------------------------
+
+FB_SINK_TYPES = {
+    "four-seam", "four seam", "ff", "fourseam", "four-seam fastball", "fastball", "fb",
+    "sinker", "sink", "si", "two-seam", "two seam", "ft", "twoseam", "2-seam", "2 seam"
+}
+AB_PLAYRESULTS = ["Single", "Double", "Triple", "HomeRun", "Out", "Error", "FieldersChoice"]
+HIT_PLAYRESULTS = ["Single", "Double", "Triple", "HomeRun"]
+
+def _enrich_batter_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega una sola vez, vectorizado, las columnas derivadas que leen las gráficas de bateo:
+    auto_pitch_type_2/auto_pitch_type_launch, is_atbat/is_hit, zonas de strike, bins x/y,
+    is_barreled, landingZone e infieldOutfield.
+    """
+    # borrar log
+    logger.debug(f"_enrich_batter_frame: Enriqueciendo {len(df)} filas") # borrar log
+    idx = df.index
+    height = pd.to_numeric(df["PlateLocHeight"], errors="coerce")
+    side = pd.to_numeric(df["PlateLocSide"], errors="coerce")
+    h, s = height.to_numpy(dtype=float), side.to_numpy(dtype=float)
+    play = df["PlayResult"]
+    korbb = df["KorBB"] if "KorBB" in df.columns else pd.Series("", index=idx)
+    pitch_type = df["AutoPitchType"] if "AutoPitchType" in df.columns else pd.Series(None, index=idx, dtype=object)
+
+    # FB/Sink → "Rectas y sinkers"; lo demás conserva auto_pitch_type_2 (o None)
+    type_norm = pitch_type.astype(str).str.strip().str.lower()
+    apt2 = df["auto_pitch_type_2"].astype(object) if "auto_pitch_type_2" in df.columns else pd.Series(None, index=idx, dtype=object)
+    apt2 = apt2.where(~type_norm.isin(FB_SINK_TYPES), "Rectas y sinkers")
+
+    cols = {
+        "auto_pitch_type_2": apt2,
+        # para slugging por tipo: lo no FB/Sink toma el AutoPitchType original
+        "auto_pitch_type_launch": apt2.where(apt2.notna(), pitch_type),
+        "is_atbat": play.isin(AB_PLAYRESULTS).to_numpy() | (korbb == "Strikeout").to_numpy(),
+        "is_hit": play.isin(HIT_PLAYRESULTS).to_numpy(),
+        "in_strike_zone": (h >= bt._y_low) & (h <= bt._y_high) & (s >= bt._x_low) & (s <= bt._x_high),
+        "in_left_strike_zone": s < 0,
+        "in_high_strike_zone": h > ((bt._y_low + bt._y_high) / 2),
+        "x_estoy": pd.cut(side, bins=bt._xbin),
+        "y_estoy": pd.cut(height, bins=bt._ybin),
+        "is_barreled": bt.classify_barrels(df["ExitSpeed"], df["Angle"]),
+    }
+    if "Date" in df.columns:
+        cols["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df = df.assign(**cols)
+
+    if {"Bearing", "Distance"}.issubset(df.columns):
+        df = scc.add_landing_zone_columns(df)
+    # borrar log
+    logger.debug("_enrich_batter_frame: Columnas derivadas agregadas") # borrar log
+    return df
+
+# -------------------------------
+# Índice por jugador
+# -------------------------------
+
+class PlayerIndex:
+    """
+    Índice de df_games por jugador: un solo sort estable + groupby().indices.
+    Cada jugador queda en una rebanada contigua, así los constructores de gráficas
+    reciben su subconjunto sin volver a escanear toda la liga.
+    """
+
+    def __init__(self, df: pd.DataFrame, key: str = "Batter"):
+        self.key = key
+        self.df = df.sort_values(key, kind="mergesort").reset_index(drop=True)
+        positions = self.df.groupby(key, sort=False, observed=True).indices
+        self._slices = {name: slice(int(pos[0]), int(pos[-1]) + 1) for name, pos in positions.items()}
+        # borrar log
+        logger.debug(f"PlayerIndex: {len(self._slices)} jugadores indexados por {key}") # borrar log
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slices
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+    def names(self) -> List[str]:
+        return list(self._slices)
+
+    def get(self, name: str) -> pd.DataFrame:
+        """Subconjunto del jugador (vacío si no existe)."""
+        sl = self._slices.get(name)
+        if sl is None:
+            return self.df.iloc[0:0]
+        return self.df.iloc[sl]
+
+# -------------------------------
+# Pool de procesos (bateadores y lanzadores)
+# -------------------------------
+
+# Estado por proceso: lo llena el padre antes del fork o el initializer del worker
+_POOL_STATE: Dict[str, Any] = {}
+
+def _batter_report_inputs(df_games: pd.DataFrame) -> Dict[str, Any]:
+    """Arma, desde el DataFrame ya enriquecido (_enrich_batter_frame), las tablas que comparten todos los reportes."""
+    return {
+        "df_stats": bt.create_stats_table(df_games),
+        "player_index": PlayerIndex(df_games, key="Batter"),
+        "zone_counts": scc.zone_counts_by_player(df_games),
+        "slug_counts": bt.slugging_counts_by_player(df_games),
+    }
+
+def _batter_report_one(name: str, inputs: Dict[str, Any], work_dir: Optional[str],
+                       render_mode: str = "raster") -> Optional[str]:
+    return bt.create_report_full(
+        batter_name=name,
+        df_stats=inputs["df_stats"],
+        df_games=inputs["player_index"].get(name),
+        dict_short=dict_baseball_teams_short,
+        work_dir=work_dir,
+        zone_counts=inputs["zone_counts"],
+        slug_counts=inputs["slug_counts"],
+        render_mode=render_mode
+    )
+
+def _pitcher_table(df_games: pd.DataFrame) -> pd.DataFrame:
+    """Copia de df_games con AutoPitchType traducido a las etiquetas de los pie charts."""
+    df_table = df_games.copy()
+
+    dict_launch = {"Four-Seam": "Rectas", "Changeup": "Cambios", "Curveball": "Curva"}
+    df_table["AutoPitchType"] = df_table.AutoPitchType.apply(lambda x: dict_launch.get(str(x), x))
+    # borrar log
+    logger.debug("_pitcher_table: Mapeo de tipos de pitcheo realizado") # borrar log
+    return df_table
+
+def _pitcher_report_inputs(df_table: pd.DataFrame, df_pitcher_stats: pd.DataFrame) -> Dict[str, Any]:
+    """Conteos por condición (pie charts) y agregados de liga de pitcher_tools, calculados una vez desde _pitcher_table."""
+    cond1 = df_table["PitchofPA"] == 1
+    cond2 = pd.Series(True, index=df_table.index)
+    cond3 = df_table["Strikes"] == 2
+    dict_cond = {"1er Pitcheo": cond1, "General": cond2, "2 Strikes": cond3}
+
+    # una sola pasada: la situación es otra llave del conteo (índice Pitcher, Situacion, AutoPitchType)
+    pitch_mix = pt.pitch_mix_by_condition(df_table, dict_cond)
+    # borrar log
+    logger.debug(f"_pitcher_report_inputs: Mezcla de pitcheos por situación con {len(pitch_mix)} filas") # borrar log
+
+    return {
+        "df_table": df_table,
+        "dict_cond": dict_cond,
+        "pitch_mix": pitch_mix,
+        "aggregates": pt.precompute_pitcher_aggregates(df_pitcher_stats),
+    }
+
+def _pitcher_report_one(name: str, inputs: Dict[str, Any], work_dir: Optional[str],
+                        render_mode: str = "raster") -> Optional[str]:
+    return pt.create_report_full(
+        pitcher_name=name,
+        pitch_mix=inputs["pitch_mix"],
+        dict_cond=inputs["dict_cond"],
+        dict_short=dict_baseball_teams_short,
+        df_table=inputs["df_table"],
+        work_dir=work_dir,
+        aggregates=inputs["aggregates"],
+        render_mode=render_mode
+    )
+
+# tipo de reporte -> (armado de entradas, generación de un reporte)
+_POOL_KINDS = {
+    "batter": (_batter_report_inputs, _batter_report_one),
+    "pitcher": (_pitcher_report_inputs, _pitcher_report_one),
+}
+
+def _effective_workers(workers: Optional[int], n_players: int) -> int:
+    """Número de procesos a usar: 0/None = todos los núcleos; nunca más que jugadores."""
+    if not workers:
+        workers = os.cpu_count() or 1
+    return max(1, min(int(workers), n_players))
+
+def _write_arrow_frame(frame: pd.DataFrame, path: str) -> Dict[str, pd.IntervalIndex]:
+    """
+    Escribe `frame` a un archivo Arrow IPC. Arrow no guarda categóricas de intervalos
+    (x_estoy/y_estoy de pd.cut): van como códigos y se regresan sus categorías.
+    """
+    frame = frame.reset_index(drop=True)
+    interval_cats = {}
+    for col in frame.columns:
+        dtype = frame[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and isinstance(dtype.categories, pd.IntervalIndex):
+            interval_cats[col] = dtype.categories
+            frame[col] = frame[col].cat.codes
+    frame.to_feather(path)
+    return interval_cats
+
+def _read_arrow_frame(path: str, interval_cats: Dict[str, pd.IntervalIndex]) -> pd.DataFrame:
+    """Inverso de _write_arrow_frame (se ejecuta en cada worker)."""
+    frame = pd.read_feather(path)
+    for col, categories in interval_cats.items():
+        frame[col] = pd.Categorical.from_codes(frame[col], categories=categories)
+    return frame
+
+def _init_pool_worker(kind: str, arrow_inputs: Optional[Dict[str, Tuple[str, Dict[str, pd.IntervalIndex]]]],
+                      work_dir: Optional[str], render_mode: str, snapshot_enabled: bool, run_id: Optional[str]) -> None:
+    """
+    Initializer del pool. Con fork el estado ya viene heredado; si no, se arma desde
+    los archivos Arrow, que ya traen las columnas derivadas (no se vuelve a enriquecer).
+    """
+    set_gui_logger(None)  # la GUI vive en el proceso padre
+    ds.enable(snapshot_enabled)
+    ds.start_run(run_id)
+    if arrow_inputs is not None:
+        frames = {key: _read_arrow_frame(path, cats) for key, (path, cats) in arrow_inputs.items()}
+        _POOL_STATE.update(_POOL_KINDS[kind][0](**frames))
+    _POOL_STATE["kind"] = kind
+    _POOL_STATE["work_dir"] = work_dir
+    _POOL_STATE["render_mode"] = render_mode
+
+def _pool_worker(name: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Genera un reporte dentro del pool. Regresa (nombre, ruta, error)."""
+    try:
+        report_one = _POOL_KINDS[_POOL_STATE["kind"]][1]
+        return name, report_one(name, _POOL_STATE, _POOL_STATE["work_dir"], _POOL_STATE["render_mode"]), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+def _run_reports_pool(kind: str,
+                      names: List[str],
+                      inputs: Dict[str, Any],
+                      frames: Dict[str, pd.DataFrame],
+                      work_dir: Optional[str],
+                      workers: int,
+                      render_mode: str = "raster") -> Optional[Tuple[int, List[str]]]:
+    """
+    Reparte `names` en un ProcessPoolExecutor sin serializar los DataFrames:
+    con fork los workers heredan `inputs` (copy-on-write); en Windows/spawn
+    `frames` (ya enriquecidos por el padre) se escriben una vez a archivos Arrow IPC
+    y cada worker solo arma las tablas de `inputs` a partir de ellos.
+    Regresa (generados, rutas) en el orden de `names`, o None si los DataFrames
+    no pudieron compartirse (el llamador sigue en serie).
+    """
+    use_fork = "fork" in mp.get_all_start_methods()
+    tmp_dir, arrow_inputs = None, None
+    if use_fork:
+        _POOL_STATE.update(inputs)
+    else:
+        tmp_dir = tempfile.mkdtemp(prefix=f"{kind}_pool_")
+        try:
+            arrow_inputs = {}
+            for key, frame in frames.items():
+                path = os.path.join(tmp_dir, f"{key}.arrow")
+                arrow_inputs[key] = (path, _write_arrow_frame(frame, path))
+        except Exception as e:
+            # columnas con tipos mezclados que Arrow no acepta: se sigue en serie
+            logger.warning(f"_run_reports_pool: no se pudo escribir el archivo Arrow ({e}); se generará en serie")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None
+
+    # borrar log
+    logger.info(f"_run_reports_pool: {len(names)} reportes ({kind}) en {workers} procesos (fork={use_fork})") # borrar log
+    generated, artefactos = 0, []
+    try:
+        ctx = mp.get_context("fork" if use_fork else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_pool_worker,
+                                 initargs=(kind, arrow_inputs, work_dir, render_mode, ds.is_enabled(), ds.current_run())) as pool:
+            for name, r, err in pool.map(_pool_worker, names):
+                if err:
+                    logger.warning(f"Error al generar reporte ({kind}) para {name}: {err}")
+                    continue
+                if r:
+                    artefactos.append(r)
+                generated += 1
+    finally:
+        _POOL_STATE.clear()
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return generated, artefactos
+
 # -------------------------------
 # Núcleo Batter
 # -------------------------------
 def _run_batter_reports_core(df: pd.DataFrame,
                              batter_filter: Optional[List[str]] = None,
                              work_dir: Optional[str] = None,
-                             clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes para bateadores, compatible con batter_tools original."""
+                             clean_temp: bool = True,
+                             workers: int = 1,
+                             render_mode: str = "raster") -> Dict[str, Any]:
+    """
+    Genera reportes para bateadores, compatible con batter_tools original.
+    Con `workers` > 1 los reportes se reparten en un pool de procesos.
+    `render_mode` = "raster" (imágenes en el PDF) o "vector" (gráficas vectoriales, ver vector_pdf).
+    """
     # borrar log
     logger.info("_run_batter_reports_core: Iniciando generación de reportes para bateadores") # borrar log
     df_games = df.copy()
@@ -594,35 +1114,37 @@ def _run_batter_reports_core(df: pd.DataFrame,
             clean_directory("Batter", base)
         return {"processed": 0, "generated": 0, "paths": []}
 
-    df_stats = bt.create_stats_table(df_games)
-    nombres = df_stats.index.tolist()
-
+    # se enriquece una sola vez aquí; con spawn los workers reciben este frame ya enriquecido
+    df_games = _enrich_batter_frame(df_games)
+    inputs = _batter_report_inputs(df_games)
+    nombres = inputs["df_stats"].index.tolist()
     print(f"Total de bateadores con estadísticas: {len(nombres)}")
     # borrar log
     logger.info(f"_run_batter_reports_core: Se encontraron {len(nombres)} bateadores para procesar") # borrar log
 
-    generated, artefactos = 0, []
-    for name in nombres:
-        try:
-            # borrar log
-            logger.debug(f"_run_batter_reports_core: Generando reporte para bateador: {name}") # borrar log
-            r = bt.create_report_full(
-                batter_name=name,
-                df_stats=df_stats,
-                df_games=df_games,
-                dict_short=dict_baseball_teams_short,
-                work_dir=work_dir
-            )
-            if r:
-                artefactos.append(r)
-            generated += 1
-            # borrar log
-            logger.debug(f"_run_batter_reports_core: Reporte para {name} generado exitosamente") # borrar log
-        except Exception as e:
-            logger.warning(f"Error al generar reporte de bateador para {name}: {e}")
-            # borrar log
-            logger.error(f"_run_batter_reports_core: Fallo al generar reporte para {name}: {e}") # borrar log
-            continue
+    workers = _effective_workers(workers, len(nombres))
+    pooled = None
+    if workers > 1:
+        pooled = _run_reports_pool("batter", nombres, inputs, {"df_games": inputs["player_index"].df}, work_dir, workers, render_mode)
+    if pooled is not None:
+        generated, artefactos = pooled
+    else:
+        generated, artefactos = 0, []
+        for name in nombres:
+            try:
+                # borrar log
+                logger.debug(f"_run_batter_reports_core: Generando reporte para bateador: {name}") # borrar log
+                r = _batter_report_one(name, inputs, work_dir, render_mode)
+                if r:
+                    artefactos.append(r)
+                generated += 1
+                # borrar log
+                logger.debug(f"_run_batter_reports_core: Reporte para {name} generado exitosamente") # borrar log
+            except Exception as e:
+                logger.warning(f"Error al generar reporte de bateador para {name}: {e}")
+                # borrar log
+                logger.error(f"_run_batter_reports_core: Fallo al generar reporte para {name}: {e}") # borrar log
+                continue
 
     if clean_temp:
         base = os.path.join(work_dir, "Batter") if work_dir else None
@@ -639,8 +1161,14 @@ def _run_batter_reports_core(df: pd.DataFrame,
 def _run_pitcher_reports_core(df: pd.DataFrame,
                               pitcher_filter: Optional[List[str]] = None,
                               work_dir: Optional[str] = None,
-                              clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes para lanzadores, compatible con pitcher_tools original."""
+                              clean_temp: bool = True,
+                              workers: int = 1,
+                              render_mode: str = "raster") -> Dict[str, Any]:
+    """
+    Genera reportes para lanzadores, compatible con pitcher_tools original.
+    Con `workers` > 1 los reportes se reparten en un pool de procesos.
+    `render_mode` = "raster" (imágenes en el PDF) o "vector" (gráficas vectoriales, ver vector_pdf).
+    """
     # borrar log
     logger.info("_run_pitcher_reports_core: Iniciando generación de reportes para lanzadores") # borrar log
     df_games = df.copy()
@@ -666,58 +1194,46 @@ def _run_pitcher_reports_core(df: pd.DataFrame,
             clean_directory("Pitcher", base)
         return {"processed": 0, "generated": 0, "paths": []}
 
-    df_table = df_games.copy()
-
-    dict_launch = {"Four-Seam": "Rectas", "Changeup": "Cambios", "Curveball": "Curva"}
-    df_table["AutoPitchType"] = df_table.AutoPitchType.apply(lambda x: dict_launch.get(str(x), x))
-    # borrar log
-    logger.debug("_run_pitcher_reports_core: Mapeo de tipos de pitcheo realizado") # borrar log
-
-    cond1 = df_table["PitchofPA"] == 1
-    cond2 = pd.Series(True, index=df_table.index)
-    cond3 = df_table["Strikes"] == 2
-    dict_cond = {"1er Pitcheo": cond1, "General": cond2, "2 Strikes": cond3}
-
-    dict_df_cond: Dict[int, pd.DataFrame] = {}
-    for i, cond in enumerate(dict_cond.values(), start=1):
-        df_cond = df_table[cond]
-        if df_cond.empty:
-            dict_df_cond[i] = pd.DataFrame()
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Condición {i} resultó en un DataFrame vacío") # borrar log
-        else:
-            df_temp_num = df_cond.groupby(["Pitcher", "BatterSide", "AutoPitchType"]).size()
-            dict_df_cond[i] = df_temp_num.unstack(1)
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Condición {i} procesada, DataFrame con {len(df_temp_num)} filas") # borrar log
+    # una sola consulta y una sola agregación para toda la liga; si fallan,
+    # se reporta igual que cuando fallaba cada lanzador, sin tumbar la corrida
+    try:
+        df_pitcher_stats = pt.load_pitcher_stats()
+        inputs = _pitcher_report_inputs(_pitcher_table(df_games), df_pitcher_stats)
+    except Exception as e:
+        logger.warning(f"No se pudieron preparar los datos de lanzadores: {e}")
+        if clean_temp:
+            base = os.path.join(work_dir, "Pitcher") if work_dir else None
+            clean_directory("Pitcher", base)
+        return {"processed": int(df_games.Pitcher.nunique()), "generated": 0, "paths": []}
 
-    name_pitchers = sorted(df_table.Pitcher.dropna().unique().tolist())
-    generated, artefactos = 0, []
+    name_pitchers = sorted(inputs["df_table"].Pitcher.dropna().unique().tolist())
     # borrar log
     logger.info(f"_run_pitcher_reports_core: Se encontraron {len(name_pitchers)} lanzadores para procesar") # borrar log
 
-    for name in name_pitchers:
-        try:
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Generando reporte para lanzador: {name}") # borrar log
-            r = pt.create_report_full(
-                pitcher_name=name,
-                dict_df_cond=dict_df_cond,
-                dict_cond=dict_cond,
-                dict_short=dict_baseball_teams_short,
-                df_table=df_table,
-                work_dir=work_dir
-            )
-            if r:
-                artefactos.append(r)
-            generated += 1
-            # borrar log
-            logger.debug(f"_run_pitcher_reports_core: Reporte para {name} generado exitosamente") # borrar log
-        except Exception as e:
-            logger.warning(f"Error al generar reporte de lanzador para {name}: {e}")
-            # borrar log
-            logger.error(f"_run_pitcher_reports_core: Fallo al generar reporte para {name}: {e}") # borrar log
-            continue
+    workers = _effective_workers(workers, len(name_pitchers))
+    pooled = None
+    if workers > 1:
+        frames = {"df_table": inputs["df_table"], "df_pitcher_stats": df_pitcher_stats}
+        pooled = _run_reports_pool("pitcher", name_pitchers, inputs, frames, work_dir, workers, render_mode)
+    if pooled is not None:
+        generated, artefactos = pooled
+    else:
+        generated, artefactos = 0, []
+        for name in name_pitchers:
+            try:
+                # borrar log
+                logger.debug(f"_run_pitcher_reports_core: Generando reporte para lanzador: {name}") # borrar log
+                r = _pitcher_report_one(name, inputs, work_dir, render_mode)
+                if r:
+                    artefactos.append(r)
+                generated += 1
+                # borrar log
+                logger.debug(f"_run_pitcher_reports_core: Reporte para {name} generado exitosamente") # borrar log
+            except Exception as e:
+                logger.warning(f"Error al generar reporte de lanzador para {name}: {e}")
+                # borrar log
+                logger.error(f"_run_pitcher_reports_core: Fallo al generar reporte para {name}: {e}") # borrar log
+                continue
 
     if clean_temp:
         base = os.path.join(work_dir, "Pitcher") if work_dir else None
@@ -734,42 +1250,58 @@ def _run_pitcher_reports_core(df: pd.DataFrame,
 def run_batter_reports(arg1: Union[pd.DataFrame, List[str]],
                        df: Optional[pd.DataFrame] = None,
                        work_dir: Optional[str] = None,
-                       clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes de bateadores. Puede recibir un DataFrame o una lista de nombres."""
+                       clean_temp: bool = True,
+                       workers: int = 1,
+                       render_mode: str = "raster") -> Dict[str, Any]:
+    """
+    Genera reportes de bateadores. Puede recibir un DataFrame o una lista de nombres.
+    `workers` > 1 reparte los reportes en procesos (0 = todos los núcleos).
+    `render_mode` = "raster" o "vector" (PDF con gráficas vectoriales).
+    """
     # borrar log
     logger.info("run_batter_reports: Llamada a la API pública de reportes de bateadores") # borrar log
+    ds.start_run()
     if isinstance(arg1, pd.DataFrame):
         # borrar log
         logger.debug("run_batter_reports: arg1 es un DataFrame. Llamando a _run_batter_reports_core con DataFrame.") # borrar log
-        return _run_batter_reports_core(arg1, batter_filter=None, work_dir=work_dir, clean_temp=clean_temp)
+        return _run_batter_reports_core(arg1, batter_filter=None, work_dir=work_dir, clean_temp=clean_temp, workers=workers, render_mode=render_mode)
     nombres: List[str] = arg1 or []
+    batter_filter = _normalize_person_list(nombres)
     if df is None:
         # borrar log
         logger.debug("run_batter_reports: df es None. Cargando datos desde BigQuery.") # borrar log
-        df = load_trackman_dataframe()
+        df = load_trackman_dataframe(batters=batter_filter, columns=BATTER_COLUMNS)
     # borrar log
     logger.debug("run_batter_reports: Llamando a _run_batter_reports_core con filtro de nombres.") # borrar log
-    return _run_batter_reports_core(df, batter_filter=_normalize_person_list(nombres), work_dir=work_dir, clean_temp=clean_temp)
+    return _run_batter_reports_core(df, batter_filter=batter_filter, work_dir=work_dir, clean_temp=clean_temp, workers=workers, render_mode=render_mode)
 
 def run_pitcher_reports(arg1: Union[pd.DataFrame, List[str]],
                         df: Optional[pd.DataFrame] = None,
                         work_dir: Optional[str] = None,
-                        clean_temp: bool = True) -> Dict[str, Any]:
-    """Genera reportes de lanzadores. Puede recibir un DataFrame o una lista de nombres."""
+                        clean_temp: bool = True,
+                        workers: int = 1,
+                        render_mode: str = "raster") -> Dict[str, Any]:
+    """
+    Genera reportes de lanzadores. Puede recibir un DataFrame o una lista de nombres.
+    `workers` > 1 reparte los reportes en procesos (0 = todos los núcleos).
+    `render_mode` = "raster" o "vector" (PDF con gráficas vectoriales).
+    """
     # borrar log
     logger.info("run_pitcher_reports: Llamada a la API pública de reportes de lanzadores") # borrar log
+    ds.start_run()
     if isinstance(arg1, pd.DataFrame):
         # borrar log
         logger.debug("run_pitcher_reports: arg1 es un DataFrame. Llamando a _run_pitcher_reports_core con DataFrame.") # borrar log
-        return _run_pitcher_reports_core(arg1, pitcher_filter=None, work_dir=work_dir, clean_temp=clean_temp)
+        return _run_pitcher_reports_core(arg1, pitcher_filter=None, work_dir=work_dir, clean_temp=clean_temp, workers=workers, render_mode=render_mode)
     nombres: List[str] = arg1 or []
+    pitcher_filter = _normalize_person_list(nombres)
     if df is None:
         # borrar log
         logger.debug("run_pitcher_reports: df es None. Cargando datos desde BigQuery.") # borrar log
-        df = load_trackman_dataframe()
+        df = load_trackman_dataframe(pitchers=pitcher_filter, columns=PITCHER_COLUMNS)
     # borrar log
     logger.debug("run_pitcher_reports: Llamando a _run_pitcher_reports_core con filtro de nombres.") # borrar log
-    return _run_pitcher_reports_core(df, pitcher_filter=_normalize_person_list(nombres), work_dir=work_dir, clean_temp=clean_temp)
+    return _run_pitcher_reports_core(df, pitcher_filter=pitcher_filter, work_dir=work_dir, clean_temp=clean_temp, workers=workers, render_mode=render_mode)
 
 # -------------------------------
 # Main (como librería)
@@ -780,23 +1312,52 @@ def main(df: Optional[pd.DataFrame] = None,
          batter_filter: Optional[List[str]] = None,
          pitcher_filter: Optional[List[str]] = None,
          work_dir: Optional[str] = None,
-         clean_temp: bool = True) -> Dict[str, Dict[str, Any]]:
-    """Función principal para generar reportes de bateadores y lanzadores."""
+         clean_temp: bool = True,
+         local_file: Optional[str] = None,
+         debug_snapshot: bool = False,
+         run_id: Optional[str] = None,
+         workers: int = 1,
+         render_mode: str = "raster") -> Dict[str, Dict[str, Any]]:
+    """
+    Función principal para generar reportes de bateadores y lanzadores.
+    `debug_snapshot` guarda en Parquet el subconjunto de cada jugador (una vez por `run_id`).
+    `workers` > 1 genera los reportes en un pool de procesos.
+    `render_mode` = "vector" arma los PDF con matplotlib (gráficas vectoriales, sin imágenes
+    intermedias); "raster" conserva el flujo JPG/PNG + FPDF.
+    """
     # borrar log
     logger.info("main: Iniciando función principal") # borrar log
+    if render_mode not in vector_pdf.RENDER_MODES:
+        raise ValueError(f"render_mode inválido: {render_mode!r} (opciones: {', '.join(vector_pdf.RENDER_MODES)})")
+    if debug_snapshot:
+        ds.enable(True)
+    ds.start_run(run_id)
+    batter_filter = _normalize_person_list(batter_filter)
+    pitcher_filter = _normalize_person_list(pitcher_filter)
+    # los nombres solo se empujan a la consulta si ambos roles vienen filtrados;
+    # si uno no trae filtro, su núcleo necesita toda la liga
+    name_filters = {}
+    if batter_filter and pitcher_filter:
+        name_filters = {"batters": batter_filter, "pitchers": pitcher_filter}
+    if df is None and local_file:
+        # borrar log
+        logger.debug(f"main: Cargando datos desde archivo local: {local_file}") # borrar log
+        df = load_trackman_dataframe(query=query, client=tc.LocalTrackmanClient(local_file), use_cache=False, **name_filters)
     if df is None:
         # borrar log
         logger.debug("main: df es None. Cargando datos desde BigQuery.") # borrar log
-        df = load_trackman_dataframe(query=query)
+        df = load_trackman_dataframe(query=query, **name_filters)
 
     batter_summary = _run_batter_reports_core(
-        df, batter_filter=_normalize_person_list(batter_filter), work_dir=work_dir, clean_temp=clean_temp
+        df, batter_filter=batter_filter, work_dir=work_dir, clean_temp=clean_temp, workers=workers,
+        render_mode=render_mode
     )
     # borrar log
     logger.info("main: Reportes de bateadores generados") # borrar log
     
     pitcher_summary = _run_pitcher_reports_core(
-        df, pitcher_filter=_normalize_person_list(pitcher_filter), work_dir=work_dir, clean_temp=clean_temp
+        df, pitcher_filter=pitcher_filter, work_dir=work_dir, clean_temp=clean_temp, workers=workers,
+        render_mode=render_mode
     )
     # borrar log
     logger.info("main: Reportes de lanzadores generados") # borrar log
@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.collections import LineCollection, PolyCollection
 import pandas as pd
 import numpy as np
 import seaborn as sns
@@ -20,123 +21,167 @@ mycmap = LinearSegmentedColormap.from_list('my_cmap', lcol, N=1000)
 ###########################################################################################
 
 def elipse_parametric(t, u, v, a, b):
-    logger.debug("Calculando coordenadas de elipse paramétrica.") # borrar log
     return u + a * np.cos(t), v + b * np.sin(t)
 
-def draw_lines():
-    logger.info("Dibujando líneas de foul.") # borrar log
-    x = [325 * np.cos(np.pi / 4), 0, -325 * np.cos(np.pi / 4)]
-    y = [325 * 0.7071, 0, 325 * 0.7071]
-    plt.plot(x, y, '-', color='black')
-    x = [63, 0, -63]
-    y = [63, 127, 63]
-    plt.plot(x, y, '-', color='black')
-
-def field_lines():
-    logger.info("Dibujando líneas de referencia del outfield.") # borrar log
-    # líneas de referencia del outfield
-    x = [-100, 0, 100]; y = [382, 0, 382]; plt.plot(x, y, "-", color="k")
-    x = [-185, 0, 185]; y = [305, 0, 305]; plt.plot(x, y, "-", color="k")
-
-def draw_zones():
-    logger.info("Dibujando líneas divisorias de zonas.") # borrar log
-    a, b, u, v = 277, 410, 0, 0
-    t1, t2 = 0.6, 2.54
-    angles = np.linspace(t1, t2, 9)
-    points = [elipse_parametric(t, u, v, a, b) for t in angles]
-    for px, py in points:
-        plt.plot([0, px], [0, py], '-', color='gray', alpha=0.5)
-
-def draw_outfield():
-    logger.info("Dibujando línea del outfield.") # borrar log
-    a, b, u, v = 277, 410, 0, 0
-    t = np.linspace(0.6, 2.54, 100)
-    x, y = elipse_parametric(t, u, v, a, b)
-    plt.plot(x, y, 'black')
-
-def draw_infield():
-    logger.info("Dibujando línea del infield.") # borrar log
-    a, b, u, v = 110, 165, 0, 0
-    t = np.linspace(0.6, 2.54, 200)
-    x, y = elipse_parametric(t, u, v, a, b)
-    plt.plot(x, y, 'black')
-
-def draw_mound():
-    logger.info("Dibujando el montículo.") # borrar log
-    a, b, u, v = 8, 8, 0, 60
-    t = np.linspace(0, 2 * np.pi, 100)
-    x, y = elipse_parametric(t, u, v, a, b)
-    plt.plot(x, y, 'black')
-
-def draw_field():
-    logger.info("Dibujando el campo completo.") # borrar log
-    draw_lines()
-    draw_outfield()
-    draw_infield()
-    draw_mound()
-    draw_zones()
+def line_origin(m, x):
+    return m * x
+
+# elipses (a, b, u, v) y fronteras angulares de las 8 zonas
+OUTFIELD_ELIPSE = (277, 410, 0, 0)
+INFIELD_ELIPSE = (110, 165, 0, 0)
+MOUND_ELIPSE = (8, 8, 0, 60)
+ZONE_ANGLES = np.linspace(0.6, 2.54, 9)
+
+def _arc(elipse, t):
+    a, b, u, v = elipse
+    return np.column_stack(elipse_parametric(t, u, v, a, b))
+
+def _zone_polygons(elipse):
+    """Los 8 polígonos de zona (rayo inferior, arco, rayo superior) de una elipse."""
+    points = _arc(elipse, ZONE_ANGLES)
+    polys = []
+    for i in range(len(ZONE_ANGLES) - 1):
+        arc = _arc(elipse, np.linspace(ZONE_ANGLES[i], ZONE_ANGLES[i + 1], 50))
+        x_down = np.linspace(0, points[i][0], 50)
+        x_up = np.linspace(0, points[i + 1][0], 50)
+        polys.append(np.concatenate((
+            np.column_stack((x_down, line_origin(points[i][1] / points[i][0], x_down))),
+            arc,
+            np.column_stack((x_up, line_origin(points[i + 1][1] / points[i + 1][0], x_up))),
+        )))
+    return polys
+
+# Geometría estática del campo, calculada una sola vez al importar.
+# Líneas negras en el orden original: foul, diamante, outfield, infield y montículo
+FIELD_LINES = [
+    np.array([[325 * np.cos(np.pi / 4), 325 * 0.7071], [0, 0], [-325 * np.cos(np.pi / 4), 325 * 0.7071]]),
+    np.array([[63, 63], [0, 127], [-63, 63]]),
+    _arc(OUTFIELD_ELIPSE, np.linspace(0.6, 2.54, 100)),
+    _arc(INFIELD_ELIPSE, np.linspace(0.6, 2.54, 200)),
+    _arc(MOUND_ELIPSE, np.linspace(0, 2 * np.pi, 100)),
+]
+# divisiones de zona (grises), del home al arco del outfield
+ZONE_LINES = [np.array([[0, 0], p]) for p in _arc(OUTFIELD_ELIPSE, ZONE_ANGLES)]
+INFIELD_ZONES = _zone_polygons(INFIELD_ELIPSE)
+OUTFIELD_ZONES = _zone_polygons(OUTFIELD_ELIPSE)
+
+# mismo trazo que plt.plot / plt.fill para que el dibujo no cambie
+_LINE_STYLE = dict(capstyle='projecting', joinstyle='round')
+_PATCH_STYLE = dict(capstyle='butt', joinstyle='miter')
+
+def _add(ax, collection):
+    ax.add_collection(collection, autolim=True)
+    ax.autoscale_view()
+    return collection
+
+def draw_field(ax=None):
+    """Campo completo con dos LineCollection sobre la geometría precalculada."""
+    logger.debug("Dibujando el campo completo.") # borrar log
+    ax = ax if ax is not None else plt.gca()
+    _add(ax, LineCollection(FIELD_LINES, colors='black', **_LINE_STYLE))
+    _add(ax, LineCollection(ZONE_LINES, colors='gray', alpha=0.5, **_LINE_STYLE))
+
+def fill_zones(zones, probabilities: np.ndarray, alpha: float, ax=None):
+    """Rellena los 8 polígonos de zona con el color de su probabilidad (una PolyCollection)."""
+    ax = ax if ax is not None else plt.gca()
+    colors = mycmap(probabilities)
+    return _add(ax, PolyCollection(zones, facecolors=colors, edgecolors=colors, alpha=alpha,
+                                   linewidths=plt.rcParams['patch.linewidth'], **_PATCH_STYLE))
 
 ###########################################################################################
 # Landing zone classifier
 ###########################################################################################
 
+# fronteras angulares de las 8 zonas y radio del infield (mismas que la geometría del campo)
+LANDING_ANGLES = ZONE_ANGLES
+INFIELD_RADIUS = 165
+
+def add_landing_zone_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega MathTheta, landingZone (1..8) e infieldOutfield a todo el DataFrame de una vez.
+    Vectorizado con np.digitize; sin Bearing (NaN) el lanzamiento cae en zona 8 / outfield,
+    igual que la clasificación fila por fila anterior.
+    """
+    bearing = pd.to_numeric(df['Bearing'], errors='coerce').to_numpy(dtype=float)
+    distance = pd.to_numeric(df['Distance'], errors='coerce').to_numpy(dtype=float)
+
+    # Ángulo matemático en radianes
+    theta = np.where(
+        bearing >= 0,
+        (np.pi / 2) - np.deg2rad(bearing),
+        (np.pi / 2) + np.deg2rad(np.abs(bearing))
+    )
+    # normaliza theta al rango [0, pi]
+    th = np.where(theta < 0, np.pi - theta, theta)
+    # zona 1: th < angles[1]; zona i+1: angles[i] <= th < angles[i+1]; el resto (y NaN) zona 8
+    zone = np.digitize(th, LANDING_ANGLES[1:8]) + 1
+
+    # Infield / Outfield por distancia euclidiana
+    n = np.sqrt(bearing ** 2 + distance ** 2)
+    in_out = np.where((n >= 0) & (n <= INFIELD_RADIUS), 'infield', 'outfield')
+
+    return df.assign(MathTheta=theta, landingZone=zone, infieldOutfield=in_out)
+
 def landing_zone_classifier(df: pd.DataFrame, player_name: str) -> pd.DataFrame:
     """Clasifica cada batazo del jugador por zona (1..8) y si es infield/outfield."""
     logger.info(f"Clasificando zonas de aterrizaje para el jugador: {player_name}") # borrar log
-    playerdf = df[df.Batter == player_name].copy()
+    playerdf = df[df.Batter == player_name]
     
     if playerdf.empty: # borrar log
         logger.warning(f"No se encontraron datos para el jugador {player_name}.") # borrar log
         return pd.DataFrame() # borrar log
 
-    # Ángulo matemático en radianes
-    playerdf['MathTheta'] = np.where(
-        playerdf['Bearing'] >= 0,
-        (np.pi / 2) - np.deg2rad(playerdf['Bearing']),
-        (np.pi / 2) + np.deg2rad(np.abs(playerdf['Bearing']))
-    )
-    logger.debug("Ángulo matemático (MathTheta) calculado.") # borrar log
-
-    t1, t2 = 0.6, 2.54
-    angles = np.linspace(t1, t2, 9)
-
-    def landing_zone_row(theta: float) -> int:
-        # normaliza theta al rango [0, pi]
-        th = theta
-        if th < 0:
-            th = np.pi - th
-        if 0 <= th < angles[1]:
-            return 1
-        for i in range(1, 8):
-            if angles[i] <= th < angles[i + 1]:
-                return i + 1
-        return 8
-
-    playerdf['landingZone'] = playerdf['MathTheta'].apply(landing_zone_row)
-    logger.debug("Zona de aterrizaje (landingZone) asignada.") # borrar log
-
-    # Infield / Outfield por distancia euclidiana
-    def infield_outfield_row(row):
-        x = row['Bearing']
-        y = row['Distance']
-        n = np.sqrt(x ** 2 + y ** 2)
-        return 'infield' if (0 <= n <= 165) else 'outfield'
-
-    playerdf['infieldOutfield'] = playerdf.apply(infield_outfield_row, axis=1)
-    logger.debug("Infield/outfield clasificado.") # borrar log
+    # reports ya las calcula para toda la liga; solo se recalculan si faltan
+    if not {'landingZone', 'infieldOutfield'}.issubset(playerdf.columns):
+        playerdf = add_landing_zone_columns(playerdf)
+        logger.debug("Zona de aterrizaje e infield/outfield clasificados.") # borrar log
 
-    playerdf.dropna(subset=['landingZone', 'infieldOutfield'], inplace=True)
+    playerdf = playerdf.dropna(subset=['landingZone', 'infieldOutfield'])
     logger.info(f"Clasificación de zonas completada. Filas restantes: {len(playerdf)}") # borrar log
     return playerdf
 
+def zone_counts_by_player(df: pd.DataFrame) -> pd.Series:
+    """
+    Conteo de lanzamientos por (Batter, PitcherThrows, Strikes, infieldOutfield, landingZone)
+    para toda la liga en un solo groupby. Sustituye a filtrar y contar por bateador/lado/strikes.
+    """
+    if not {'landingZone', 'infieldOutfield'}.issubset(df.columns):
+        df = add_landing_zone_columns(df)
+    # dropna=False: los lanzamientos sin Strikes cuentan en la gráfica general
+    counts = df.groupby(
+        ['Batter', 'PitcherThrows', 'Strikes', 'infieldOutfield', 'landingZone'], dropna=False, observed=True
+    ).size()
+    logger.debug(f"Conteos por zona calculados: {len(counts)} combinaciones") # borrar log
+    return counts
+
+def zone_probabilities_from_counts(counts: pd.Series, player_name: str, side: str, strikes=False):
+    """
+    Probabilidades (infield, outfield) por zona 1..8 a partir de zone_counts_by_player.
+    Regresa None si el bateador no tiene lanzamientos para ese brazo/strikes.
+    """
+    try:
+        sub = counts.loc[(player_name, side)]
+    except KeyError:
+        return None
+    if strikes:
+        sub = sub[sub.index.get_level_values('Strikes') == strikes]
+    if sub.empty:
+        return None
+    by_zone = sub.groupby(level=['infieldOutfield', 'landingZone']).sum()
+
+    probs = []
+    for part in ('infield', 'outfield'):
+        if part not in by_zone.index.get_level_values('infieldOutfield'):
+            probs.append(np.zeros(8))
+            continue
+        c = by_zone.loc[part].reindex(range(1, 9), fill_value=0)
+        probs.append((c / c.sum()).to_numpy())
+    return probs[0], probs[1]
+
 ###########################################################################################
 # Helpers de probabilidad / normalización
 ###########################################################################################
 
-def line_origin(m, x):
-    logger.debug("Calculando línea desde el origen.") # borrar log
-    return m * x
-
 def prob_renorm(probs: np.ndarray) -> np.ndarray:
     """Escala a [0,1] evitando división por cero cuando a==b."""
     logger.info("Normalizando las probabilidades.") # borrar log
@@ -151,12 +196,6 @@ def prob_renorm(probs: np.ndarray) -> np.ndarray:
 # INFIELD
 ###############################################################################################
 
-def zone_infield(t1, t2):
-    logger.debug("Calculando zona de infield.") # borrar log
-    a, b, u, v = 110, 165, 0, 0
-    t = np.linspace(t1, t2, 50)
-    return elipse_parametric(t, u, v, a, b)
-
 def zone_probabilities_infield(playerdf: pd.DataFrame) -> np.ndarray:
     logger.info("Calculando probabilidades para las zonas de infield.") # borrar log
     p = playerdf[playerdf['infieldOutfield'] == 'infield']
@@ -171,32 +210,12 @@ def zone_probabilities_infield(playerdf: pd.DataFrame) -> np.ndarray:
 
 def fill_zones_infield(probabilities: np.ndarray):
     logger.info("Rellenando zonas de infield con colores de probabilidad.") # borrar log
-    a, b, u, v = 110, 165, 0, 0
-    t1, t2 = 0.6, 2.54
-    angles = np.linspace(t1, t2, 9)
-    points = [elipse_parametric(t, u, v, a, b) for t in angles]
-
-    for i in range(len(angles) - 1):
-        z1x, z1y = zone_infield(angles[i], angles[i + 1])
-        x_down = np.linspace(0, points[i][0], 50)
-        y_down = line_origin(points[i][1] / points[i][0], x_down)
-        x_up = np.linspace(0, points[i + 1][0], 50)
-        y_up = line_origin(points[i + 1][1] / points[i + 1][0], x_up)
-        X = np.concatenate((x_down, z1x, x_up))
-        Y = np.concatenate((y_down, z1y, y_up))
-        plt.fill(X, Y, alpha=1, color=mycmap(probabilities[i]))
-    logger.debug("Relleno de zonas de infield completado.") # borrar log
+    return fill_zones(INFIELD_ZONES, probabilities, alpha=1)
 
 ###############################################################################################
 # OUTFIELD
 ###############################################################################################
 
-def zone_outfield(t1, t2):
-    logger.debug("Calculando zona de outfield.") # borrar log
-    a, b, u, v = 277, 410, 0, 0
-    t = np.linspace(t1, t2, 50)
-    return elipse_parametric(t, u, v, a, b)
-
 def zone_probabilities_outfield(playerdf: pd.DataFrame) -> np.ndarray:
     logger.info("Calculando probabilidades para las zonas de outfield.") # borrar log
     p = playerdf[playerdf['infieldOutfield'] == 'outfield']
@@ -211,18 +230,4 @@ def zone_probabilities_outfield(playerdf: pd.DataFrame) -> np.ndarray:
 
 def fill_zones_outfield(probabilities: np.ndarray):
     logger.info("Rellenando zonas de outfield con colores de probabilidad.") # borrar log
-    a, b, u, v = 277, 410, 0, 0
-    t1, t2 = 0.6, 2.54
-    angles = np.linspace(t1, t2, 9)
-    points = [elipse_parametric(t, u, v, a, b) for t in angles]
-
-    for i in range(len(angles) - 1):
-        z1x, z1y = zone_outfield(angles[i], angles[i + 1])
-        x_down = np.linspace(0, points[i][0], 50)
-        y_down = line_origin(points[i][1] / points[i][0], x_down)
-        x_up = np.linspace(0, points[i + 1][0], 50)
-        y_up = line_origin(points[i + 1][1] / points[i + 1][0], x_up)
-        X = np.concatenate((x_down, z1x, x_up))
-        Y = np.concatenate((y_down, z1y, y_up))
-        plt.fill(X, Y, alpha=0.5, color=mycmap(probabilities[i]))
-    logger.debug("Relleno de zonas de outfield completado.") # borrar log
\ No newline at end of file
+    return fill_zones(OUTFIELD_ZONES, probabilities, alpha=0.5)
@@ -12,9 +12,11 @@ from spray_chart_constructors_f import (
     zone_probabilities_outfield,
     fill_zones_infield,
     fill_zones_outfield,
+    zone_probabilities_from_counts,
     prob_renorm,
     draw_field
 )
+import debug_snapshot as ds
 
 # Configuración de logs
 logger = logging.getLogger(__name__) # borrar log
@@ -29,14 +31,10 @@ def _ensure_dir(p: str):
     os.makedirs(p, exist_ok=True)
     logger.info(f"Directorio asegurado: {p}") # borrar log
 
-def _save_input_df(df: pd.DataFrame, _dir_images_ignored: str, tag: str):
-    """Guarda el DataFrame original recibido en CSV en el directorio actual de ejecución."""
-    out_csv = os.path.join(os.getcwd(), f"{tag}_data.csv")
-    try: # borrar log
-        df.to_csv(out_csv, index=False)
-        logger.info(f"DataFrame de entrada guardado en: {out_csv}") # borrar log
-    except Exception as e: # borrar log
-        logger.error(f"Error al guardar el DataFrame de entrada como CSV: {e}") # borrar log
+def _snapshot_player(df: pd.DataFrame, playerName: str, tag: str):
+    """Snapshot de depuración del subconjunto del jugador (solo si está activado)."""
+    if ds.is_enabled():
+        ds.snapshot(df[df.Batter == playerName], tag=tag, player=playerName)
 
 # ================== Funciones públicas ==================
 
@@ -48,26 +46,41 @@ def spray_probability_conditional(
     strikes: Union[int, bool] = False,
     title: Optional[str] = None,
     display_title: bool = False,
-    fig_size=(9, 8)
+    fig_size=(9, 8),
+    zone_counts: Optional[pd.Series] = None,
+    save_png: bool = True
 ):
+    """
+    Spray chart de probabilidad por zona. Si se pasa `zone_counts`
+    (zone_counts_by_player de toda la liga) no se filtra `data`.
+    Con save_png=False no se escribe el PNG: el modo vectorial usa la figura que se regresa.
+    """
     logger.info(f"Generando spray chart de probabilidad para {playerName} (vs {side}). Strikes: {strikes}.") # borrar log
     dir_images = os.path.join(DIR_TEMP, team, playerName)
-    _ensure_dir(dir_images)
-    _save_input_df(data, dir_images, tag="spray_prob")  # guarda DF original en cwd
-
-    playerdf = data[data.Batter == playerName]
-    playerdf = playerdf[playerdf.PitcherThrows == side]
-    if strikes:
-        playerdf = playerdf[playerdf.Strikes == strikes]
-    
-    logger.debug(f"DataFrame filtrado. Número de filas: {len(playerdf)}") # borrar log
-    if playerdf.empty: # borrar log
-        logger.warning("El DataFrame del jugador está vacío después de aplicar los filtros.") # borrar log
-        return None # borrar log
-
-    playerdf = landing_zone_classifier(playerdf, playerName)
-    probs_infield = zone_probabilities_infield(playerdf)
-    probs_outfield = zone_probabilities_outfield(playerdf)
+    if save_png:
+        _ensure_dir(dir_images)
+    _snapshot_player(data, playerName, tag="spray_prob")
+
+    if zone_counts is not None:
+        probs = zone_probabilities_from_counts(zone_counts, playerName, side, strikes)
+        if probs is None: # borrar log
+            logger.warning("El DataFrame del jugador está vacío después de aplicar los filtros.") # borrar log
+            return None # borrar log
+        probs_infield, probs_outfield = probs
+    else:
+        playerdf = data[data.Batter == playerName]
+        playerdf = playerdf[playerdf.PitcherThrows == side]
+        if strikes:
+            playerdf = playerdf[playerdf.Strikes == strikes]
+        
+        logger.debug(f"DataFrame filtrado. Número de filas: {len(playerdf)}") # borrar log
+        if playerdf.empty: # borrar log
+            logger.warning("El DataFrame del jugador está vacío después de aplicar los filtros.") # borrar log
+            return None # borrar log
+
+        playerdf = landing_zone_classifier(playerdf, playerName)
+        probs_infield = zone_probabilities_infield(playerdf)
+        probs_outfield = zone_probabilities_outfield(playerdf)
     logger.debug("Probabilidades de zona de aterrizaje calculadas.") # borrar log
 
     probs_text_infield = (probs_infield * 100).round(2)
@@ -105,14 +118,15 @@ def spray_probability_conditional(
     plt.gca().axes.get_xaxis().set_visible(False)
     plt.gca().axes.get_yaxis().set_visible(False)
 
-    suffix = '_strikes_2' if strikes else ''
-    fname = f"spray_chart_general_{'left' if side=='Left' else 'right'}{suffix}.png"
-    out_path = os.path.join(dir_images, fname)
-    try: # borrar log
-        plt.savefig(out_path, bbox_inches='tight', pad_inches=0.0)
-        logger.info(f"Gráfico de probabilidad guardado en: {out_path}") # borrar log
-    except Exception as e: # borrar log
-        logger.error(f"Error al guardar el gráfico de probabilidad: {e}") # borrar log
+    if save_png:
+        suffix = '_strikes_2' if strikes else ''
+        fname = f"spray_chart_general_{'left' if side=='Left' else 'right'}{suffix}.png"
+        out_path = os.path.join(dir_images, fname)
+        try: # borrar log
+            plt.savefig(out_path, bbox_inches='tight', pad_inches=0.0)
+            logger.info(f"Gráfico de probabilidad guardado en: {out_path}") # borrar log
+        except Exception as e: # borrar log
+            logger.error(f"Error al guardar el gráfico de probabilidad: {e}") # borrar log
     plt.close()
     return fig
 
@@ -129,7 +143,7 @@ def spray_scatter(
     logger.info(f"Generando spray chart de dispersión para {playerName} (vs {side}). Strikes: {strikes}.") # borrar log
     dir_images = os.path.join(DIR_TEMP, team, playerName)
     _ensure_dir(dir_images)
-    _save_input_df(df, dir_images, tag="spray_scatter")  # guarda DF original en cwd
+    _snapshot_player(df, playerName, tag="spray_scatter")
 
     bat = df[(df.Batter == playerName) & (df.PitcherThrows == side)].copy()
     if strikes:
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import TextToPath
+from typing import NamedTuple, Tuple
+
+# Tablas de los reportes dibujadas directo con matplotlib.
+# Reemplaza el viaje Styler -> HTML -> dataframe_image (nbconvert / Chrome headless):
+# mismas reglas que los estilos CSS (th/td centrados, bordes de 2px y 1px,
+# font-size 200%) pero con el layout calculado aquí, en milisegundos.
+
+PX = 0.75  # puntos por px CSS
+
+
+class TableStyle(NamedTuple):
+    """Bordes por tipo de celda como en CSS: letras de 'TBLR' (arriba, abajo, izquierda, derecha)."""
+    header_edges: str = "TBLR"
+    cell_edges: str = "BLR"
+    header_lw: float = 2 * PX
+    cell_lw: float = 1 * PX
+    fontsize: float = 28.0  # font-size 200% sobre los 14 pt con los que exportaba dfi
+    bold_columns: Tuple[str, ...] = ()
+
+
+class StyledTable(NamedTuple):
+    """DataFrame (sin índice; lo que se ve son sus columnas) y el estilo con el que se dibuja."""
+    data: pd.DataFrame
+    style: TableStyle
+
+
+_text_to_path = TextToPath()
+
+
+def _text_width(text: str, prop: FontProperties) -> float:
+    width, _, _ = _text_to_path.get_text_width_height_descent(text, prop, ismath=False)
+    return width
+
+
+def _format_value(v) -> str:
+    # como Styler por defecto: flotantes con styler.format.precision decimales, NaN vacío
+    if isinstance(v, (float, np.floating)):
+        return "" if np.isnan(v) else f"{v:.{pd.get_option('styler.format.precision')}f}"
+    return str(v)
+
+
+def table_figure(table: StyledTable, pad: float = 0.6, row_height: float = 1.6):
+    """
+    Figure con la tabla a tamaño natural (1 unidad de datos = 1 punto).
+    `pad` (en em) es el margen horizontal de cada celda y `row_height` el alto de fila en em.
+    """
+    df, style = table
+    size = style.fontsize
+    header = [str(c) for c in df.columns]
+    body = [[_format_value(v) for v in row] for row in df.itertuples(index=False)]
+    bold = [c in style.bold_columns for c in df.columns]
+
+    prop = FontProperties(size=size)
+    prop_bold = FontProperties(size=size, weight="bold")
+    widths = []
+    for j, name in enumerate(header):
+        w = _text_width(name, prop_bold)
+        for row in body:
+            w = max(w, _text_width(row[j], prop_bold if bold[j] else prop))
+        widths.append(w + 2 * pad * size)
+    xs = np.concatenate([[0.0], np.cumsum(widths)])
+    rh = row_height * size
+    n_rows = len(body) + 1
+    total_w, total_h = xs[-1], n_rows * rh
+
+    # margen para que los bordes exteriores no queden cortados a la mitad
+    m = max(style.header_lw, style.cell_lw)
+    fig = plt.figure(figsize=((total_w + 2 * m) / 72, (total_h + 2 * m) / 72))
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(-m, total_w + m)
+    ax.set_ylim(total_h + m, -m)
+    ax.axis("off")
+
+    segments = {True: [], False: []}
+    for i, row in enumerate([header] + body):
+        is_header = i == 0
+        edges = style.header_edges if is_header else style.cell_edges
+        y0, y1 = i * rh, (i + 1) * rh
+        for j, txt in enumerate(row):
+            x0, x1 = xs[j], xs[j + 1]
+            ax.text((x0 + x1) / 2, (y0 + y1) / 2, txt, ha="center", va="center_baseline",
+                    fontproperties=prop_bold if (is_header or bold[j]) else prop)
+            cell = {"T": [(x0, y0), (x1, y0)], "B": [(x0, y1), (x1, y1)],
+                    "L": [(x0, y0), (x0, y1)], "R": [(x1, y0), (x1, y1)]}
+            segments[is_header].extend(cell[e] for e in edges)
+
+    for is_header, segs in segments.items():
+        if segs:
+            lw = style.header_lw if is_header else style.cell_lw
+            ax.add_collection(LineCollection(segs, colors="black", linewidths=lw,
+                                             capstyle="projecting"))
+    return fig
@@ -0,0 +1,10 @@
+# conftest.py
+import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+# los módulos de la app se importan planos desde backend/exe, igual que en gui_main
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
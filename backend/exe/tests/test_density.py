@@ -0,0 +1,71 @@
+# test_density.py
+import numpy as np
+import pytest
+
+import density
+
+kde = pytest.importorskip("seaborn.external.kde")
+
+
+def _grid_points(grid: density.DensityGrid) -> np.ndarray:
+    xx, yy = np.meshgrid(grid.x, grid.y)
+    return np.vstack([xx.ravel(), yy.ravel()])
+
+
+def _uncorrelated_sample(n: int, spread: float, seed: int):
+    """
+    Ubicaciones sin correlación muestral entre x y y. El evaluate de seaborn.external.kde
+    blanquea con el factor de Cholesky inferior, que solo es exacto si la covarianza es diagonal.
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0.0, spread, n)
+    y = rng.normal(2.5, spread, n) + 0.6 * x
+    y = y - np.cov(x, y)[0, 1] / np.var(x, ddof=1) * x
+    return x, y
+
+
+@pytest.mark.parametrize("n, spread", [(5, 1.0), (5, 2.0), (300, 2.0)])
+def test_kde_density_matches_seaborn_gaussian_kde(n, spread):
+    x, y = _uncorrelated_sample(n, spread, seed=n)
+    grid = density.ZONE_GRID
+
+    ours = density.kde_density(x, y)
+    ref = kde.gaussian_kde(np.vstack([x, y]), bw_method="scott")(_grid_points(grid)).reshape(ours.shape)
+
+    assert np.abs(ours - ref).max() <= 0.01 * ref.max()
+
+
+def test_points_outside_the_grid_still_add_density_near_its_edge():
+    x, y = _uncorrelated_sample(300, 2.0, seed=1)
+    assert ((x < -3) | (x > 3)).sum() > 10  # la muestra se sale de la malla por los lados
+    grid = density.ZONE_GRID
+
+    ours = density.kde_density(x, y)
+    ref = kde.gaussian_kde(np.vstack([x, y]), bw_method="scott")(_grid_points(grid)).reshape(ours.shape)
+
+    edges = np.r_[ours[:, 0], ours[:, -1]], np.r_[ref[:, 0], ref[:, -1]]
+    np.testing.assert_allclose(edges[0], edges[1], rtol=0.01, atol=1e-3 * ref.max())
+
+
+def test_kde_density_with_correlated_sample_uses_seaborn_bandwidth():
+    rng = np.random.default_rng(7)
+    x = rng.normal(0.0, 0.8, 40)
+    y = 2.5 + 0.7 * x + rng.normal(0.0, 0.4, 40)
+    grid = density.ZONE_GRID
+
+    ours = density.kde_density(x, y, bw_adjust=1.5)
+    k = kde.gaussian_kde(np.vstack([x, y]), bw_method="scott")
+    k.set_bandwidth(k.factor * 1.5)  # como sns.kdeplot(bw_adjust=1.5)
+
+    # densidad exacta con la covarianza del kernel de seaborn
+    diff = _grid_points(grid)[:, :, None] - k.dataset[:, None, :]
+    inv = np.linalg.inv(k.covariance)
+    q = np.einsum("ipn,ij,jpn->pn", diff, inv, diff)
+    exact = np.exp(-0.5 * q).sum(axis=1) / (k.n * 2 * np.pi * np.sqrt(np.linalg.det(k.covariance)))
+
+    assert np.abs(ours - exact.reshape(ours.shape)).max() <= 0.01 * exact.max()
+
+
+def test_kde_density_needs_two_points_and_spread():
+    assert density.kde_density([0.1], [2.0]) is None
+    assert density.kde_density([0.1, 0.1, 0.1], [1.0, 2.0, 3.0]) is None
@@ -0,0 +1,120 @@
+# test_trackman_cache.py
+import sys
+
+import pandas as pd
+import pytest
+
+import reports
+import trackman_cache as tc
+
+
+def _trackman_frame() -> pd.DataFrame:
+    """Filas crudas como las de trackman_table ('Apellido, Nombre')."""
+    rows = []
+    for i in range(24):
+        rows.append({
+            "Batter": f"Bat{i % 4}, Juan{i % 4}",
+            "BatterId": i % 4,
+            "Pitcher": f"Pit{i % 3}, Ana{i % 3}",
+            "PitcherId": 100 + i % 3,
+            "Temporada_Anio": "Verano-2025" if i % 2 else "Invierno-2024",
+            "Date": (pd.Timestamp("2025-04-01") + pd.Timedelta(days=i)).strftime("%Y-%m-%d"),
+            "fecha_carga": (pd.Timestamp("2025-04-02") + pd.Timedelta(days=i)).isoformat(),
+            "id_path": f"juego_{i // 2}",
+            "PitchCall": "InPlay",
+            "Strikes": i % 3,
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def no_google(monkeypatch):
+    """Simula un equipo sin google-cloud: cualquier import de google falla."""
+    monkeypatch.setitem(sys.modules, "google", None)
+    monkeypatch.setitem(sys.modules, "google.cloud", None)
+
+
+def test_filtered_load_with_local_client_does_not_import_google(no_google):
+    raw = _trackman_frame()
+    client = tc.LocalTrackmanClient(raw)
+
+    df = reports.load_trackman_dataframe(client=client, use_cache=False,
+                                         batters=["Juan1 Bat1"], seasons=["Verano-2025"],
+                                         date_from="2025-04-10")
+
+    expected = raw[(raw.Batter == "Bat1, Juan1") & (raw.Temporada_Anio == "Verano-2025")
+                   & (pd.to_datetime(raw.Date) >= "2025-04-10")]
+    assert len(df) == len(expected) > 0
+    assert set(df["Batter"].astype(str)) == {"Juan1 Bat1"}
+    assert sorted(df["id_path"].astype(str)) == sorted(expected["id_path"])
+
+
+def test_batter_and_pitcher_filters_are_combined_with_or(no_google):
+    raw = _trackman_frame()
+    client = tc.LocalTrackmanClient(raw)
+
+    df = reports.load_trackman_dataframe(client=client, use_cache=False,
+                                         batters=["Juan0 Bat0"], pitchers=["Ana2 Pit2"])
+
+    expected = raw[(raw.Batter == "Bat0, Juan0") | (raw.Pitcher == "Pit2, Ana2")]
+    assert len(df) == len(expected)
+
+
+def test_local_client_applies_neutral_params():
+    raw = _trackman_frame()
+    client = tc.LocalTrackmanClient(raw)
+    params = [("seasons", "STRING", ["Invierno-2024"]),
+              ("date_to", "DATE", pd.Timestamp("2025-04-05").date())]
+
+    df = client.query("SELECT 1", params=params).result().to_dataframe()
+
+    assert set(df["Temporada_Anio"]) == {"Invierno-2024"}
+    assert pd.to_datetime(df["Date"]).max() <= pd.Timestamp("2025-04-05")
+    assert client.queries == ["SELECT 1"]
+
+
+def test_bigquery_job_config_converts_scalars_and_arrays():
+    bigquery = pytest.importorskip("google.cloud.bigquery")
+    config = reports._bigquery_job_config([("seasons", "STRING", ["Verano-2025"]),
+                                           ("date_from", "DATE", pd.Timestamp("2025-04-01").date())])
+    seasons, date_from = config.query_parameters
+    assert isinstance(seasons, bigquery.ArrayQueryParameter) and seasons.values == ["Verano-2025"]
+    assert isinstance(date_from, bigquery.ScalarQueryParameter) and date_from.name == "date_from"
+
+
+def test_incremental_refresh_appends_exactly_the_new_rows(tmp_path, no_google):
+    raw = _trackman_frame()
+    seed, nuevas = raw.iloc[:18], raw.iloc[18:]
+
+    # arranque en frío: llena la caché con las primeras filas
+    df_seed = reports.load_trackman_dataframe(client=tc.LocalTrackmanClient(seed), cache_dir=str(tmp_path))
+    assert len(df_seed) == len(seed)
+    cache = tc.TrackmanCache(str(tmp_path), reports.BQ_DEFAULT_QUERY)
+    assert cache.is_valid()
+
+    # BigQuery ya tiene filas cargadas después de la marca de agua
+    client = tc.LocalTrackmanClient(raw)
+    df = reports.load_trackman_dataframe(client=client, cache_dir=str(tmp_path))
+
+    assert "@watermark" in client.queries[-1]
+    assert len(df) == len(raw)
+    assert sorted(df["fecha_carga"].astype(str)) == sorted(raw["fecha_carga"])
+    assert cache.watermark == pd.Timestamp(nuevas["fecha_carga"].max(), tz="UTC")
+    cached = cache.load()
+    assert len(cached) == len(raw)
+    assert cached["fecha_carga"].astype(str).isin(nuevas["fecha_carga"]).sum() == len(nuevas)
+
+
+def test_failed_delta_is_logged_as_error(tmp_path, caplog):
+    raw = _trackman_frame()
+    reports.load_trackman_dataframe(client=tc.LocalTrackmanClient(raw), cache_dir=str(tmp_path))
+
+    class _OfflineClient:
+        def query(self, sql, params=None, **kwargs):
+            raise ConnectionError("sin red")
+
+    with caplog.at_level("ERROR", logger=reports.logger.name):
+        df = reports.load_trackman_dataframe(client=_OfflineClient(), cache_dir=str(tmp_path))
+
+    assert len(df) == len(raw)  # se sigue con la caché en disco
+    assert any(r.levelname == "ERROR" and "delta" in r.getMessage() for r in caplog.records)
@@ -1,21 +1,122 @@
 import os
+import sys
 import pandas as pd
 import unicodedata
 import re
 from typing import List, Dict, Optional, Tuple
-import rapidfuzz
+import numpy as np
+from rapidfuzz import fuzz
+from rapidfuzz.process import cdist
 from itertools import zip_longest
-import pdfplumber
 import logging
 
-# BigQuery
-from google.cloud import bigquery
-import google.auth
-from google.cloud import bigquery_storage
+from catalog_cache import CatalogCache
+from alias_store import AliasStore
 
 # Logger del módulo
 logger = logging.getLogger(__name__)
 
+# Núcleos para rapidfuzz.process.cdist (-1 = todos)
+MATCH_WORKERS = int(os.environ.get("MATCH_WORKERS", "-1"))
+
+# Catálogo de nombres en disco, compartido por todos los procesos (TTL en horas)
+_CATALOG_BASE = os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else os.path.dirname(os.path.abspath(__file__))
+CATALOG_CACHE_DIR = os.environ.get("TRACKMAN_CATALOG_CACHE_DIR") or os.path.join(_CATALOG_BASE, "cache", "catalog")
+CATALOG_TTL_HOURS = float(os.environ.get("CATALOG_TTL_HOURS", "24"))
+
+# Alias confirmados desde la GUI (roster normalizado -> nombre Trackman)
+ALIAS_FILE = os.environ.get("TRACKMAN_ALIAS_FILE") or os.path.join(_CATALOG_BASE, "aliases.json")
+
+# Temporadas consultadas para el catálogo
+CATALOG_SEASONS = ("Invierno-2025", "Verano-2025", "Invierno-2024", "Verano-2024")
+
+
+# === Índice de bloques del catálogo Trackman ===
+def clave_fonetica(token: str) -> str:
+    """
+    Clave fonética aproximada para apellidos en español (token ya normalizado):
+    h muda, ll/y, qu/k/c, z/s/ce/ci, g/j, v/b, x/j; primera letra + consonantes sin repetir.
+    """
+    t = re.sub(r"[^a-z]", "", token)
+    if not t:
+        return ""
+    t = re.sub(r"(?<!c)h", "", t)
+    t = t.replace("ll", "y").replace("ch", "1").replace("qu", "k")
+    t = re.sub(r"g(?=[ei])", "j", t)
+    t = re.sub(r"gu(?=[ei])", "g", t)
+    t = re.sub(r"c(?=[ei])", "s", t)
+    t = t.replace("z", "s").replace("c", "k").replace("q", "k").replace("v", "b").replace("x", "j")
+    t = re.sub(r"y$", "i", t)
+    if not t:
+        return ""
+    cola = re.sub(r"[aeiouy]", "", t[1:])
+    return re.sub(r"(.)\1+", r"\1", t[0] + cola)
+
+def claves_bloque(nombre_norm: str) -> Tuple[List[str], List[str]]:
+    """
+    Claves de bloque de un nombre normalizado ('nombre apellido1 [apellido2]').
+    Regresa (estrechas, amplias): inicial+apellido; y apellido / clave fonética de cada apellido,
+    así "delgado uscanga" cae en los bloques de "delgado" y de "uscanga".
+    """
+    tokens = [re.sub(r"[^a-z]", "", tok) for tok in nombre_norm.split()]
+    tokens = [tok for tok in tokens if tok]
+    if not tokens:
+        return [], []
+    apellidos = [tok for tok in tokens[1:] if len(tok) > 1] or tokens[-1:]
+    inicial = tokens[0][0]
+    estrechas = [f"i:{inicial}{ap}" for ap in apellidos] if len(tokens) > 1 else []
+    amplias = [f"t:{ap}" for ap in apellidos]
+    amplias += [f"f:{k}" for k in {clave_fonetica(ap) for ap in apellidos} if len(k) > 1]
+    return estrechas, amplias
+
+class _CatalogoTrackman:
+    """
+    Catálogo Trackman preparado una sola vez por lista: originales, normalizados, simplificados
+    e índice de bloques (clave -> posiciones en el catálogo).
+    """
+
+    def __init__(self, originales: List[str], normalizados: List[str], simplificados: List[str]):
+        self.originales = originales
+        self.normalizados = normalizados
+        self.simplificados = simplificados
+        bloques: Dict[str, List[int]] = {}
+        for j, n in enumerate(normalizados):
+            estrechas, amplias = claves_bloque(n)
+            for k in estrechas + amplias:
+                bloques.setdefault(k, []).append(j)
+        self.bloques = {k: np.asarray(v) for k, v in bloques.items()}
+
+    def estado(self) -> Dict[str, object]:
+        """Estado serializable (para el catálogo en disco)."""
+        return {
+            "originales": self.originales,
+            "normalizados": self.normalizados,
+            "simplificados": self.simplificados,
+            "bloques": self.bloques,
+        }
+
+    @classmethod
+    def desde_estado(cls, estado: Dict[str, object]) -> "_CatalogoTrackman":
+        """Reconstruye el catálogo sin recalcular el índice de bloques."""
+        cat = cls.__new__(cls)
+        cat.originales = list(estado["originales"])
+        cat.normalizados = list(estado["normalizados"])
+        cat.simplificados = list(estado["simplificados"])
+        cat.bloques = {k: np.asarray(v, dtype=int) for k, v in estado["bloques"].items()}
+        return cat
+
+    def candidatos(self, nombre_norm: str) -> List[np.ndarray]:
+        """Niveles de candidatos, de más estrecho a más amplio (posiciones ordenadas)."""
+        niveles, vistos = [], np.array([], dtype=int)
+        for claves in claves_bloque(nombre_norm):
+            hits = [self.bloques[k] for k in claves if k in self.bloques]
+            if not hits:
+                continue
+            idx = np.unique(np.concatenate(hits + [vistos]))
+            if len(idx) > len(vistos):
+                niveles.append(idx)
+                vistos = idx
+        return niveles
 
 class Tools:
     def __init__(self, preview_rows: int = 5):
@@ -36,6 +137,9 @@ class Tools:
 
         # Cache opcional de nombres desde BigQuery por rol
         self._bq_names_cache: Optional[Dict[str, List[str]]] = None
+        # Catálogos normalizados/simplificados por lista de nombres Trackman
+        self._catalogos: Dict[Tuple[str, ...], _CatalogoTrackman] = {}
+        self.alias = AliasStore(ALIAS_FILE)
         # borrar log
         logger.info("Clase Tools inicializada.")
 
@@ -486,6 +590,7 @@ class Tools:
         logger.info(f"Extrayendo texto de PDF: {filepath}")
         TITULOS = self._TITULOS
         try:
+            import pdfplumber  # solo se necesita para rosters en PDF
             with pdfplumber.open(filepath) as pdf:
                 lines: List[str] = []
                 for page_num, page in enumerate(pdf.pages):
@@ -528,57 +633,60 @@ class Tools:
             return pd.DataFrame()
 
     # === PARTE 3: OBTENER NOMBRES DESDE TRACKMAN (BigQuery o CSV) ===
-    def _bq_get_distinct_names(self) -> Dict[str, List[str]]:
-        """
-        Consulta BigQuery y devuelve nombres distintos por rol:
-        {'batters': [...], 'pitchers': [...]}, limpios al estilo reports.clean_name.
-        Cachea el resultado en self._bq_names_cache.
-        """
-        if self._bq_names_cache is not None:
+    def _bq_dataframe(self, query: str) -> pd.DataFrame:
+        """Ejecuta una consulta en BigQuery (con BigQueryReadClient si está disponible)."""
+        # google.cloud se importa aquí: con CSV o catálogo en disco no hace falta
+        from google.cloud import bigquery, bigquery_storage
+        import google.auth
+
+        client = bigquery.Client()
+        job = client.query(query)
+        # borrar log
+        logger.debug("Consulta a BigQuery enviada.")
+        try:
+            credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+            bqstorageclient = bigquery_storage.BigQueryReadClient(credentials=credentials)
+            df = job.result().to_dataframe(bqstorage_client=bqstorageclient)
             # borrar log
-            logger.info("Devolviendo nombres de BigQuery desde la caché.")
-            return self._bq_names_cache
+            logger.debug("Resultados de BigQuery obtenidos usando BigQueryReadClient.")
+        except Exception as e_bq_storage:
+            logger.warning(f"Falló el uso de BigQueryReadClient: {e_bq_storage}. Intentando con to_dataframe() normal. borrar log")
+            df = job.result().to_dataframe()
+            # borrar log
+            logger.debug("Resultados de BigQuery obtenidos usando to_dataframe() normal.")
+        return df
+
+    def _bq_watermark(self) -> Optional[str]:
+        """Marca de agua del catálogo: max(fecha_carga) de las temporadas consultadas."""
+        seasons = ",".join(f'"{t}"' for t in CATALOG_SEASONS)
+        query = f"""
+        SELECT CAST(MAX(SAFE_CAST(fecha_carga AS TIMESTAMP)) AS STRING) AS watermark
+        FROM `baseballlmb.trackman_db.trackman_table`
+        WHERE Temporada_Anio IN ({seasons})
+        """
+        df = self._bq_dataframe(query)
+        if df.empty or pd.isna(df["watermark"].iloc[0]):
+            return None
+        return str(df["watermark"].iloc[0])
 
+    def _bq_query_distinct_names(self) -> Dict[str, List[str]]:
+        """Consulta BigQuery y limpia los nombres distintos por rol (lanza excepción si falla)."""
         logger.info("Consultando BigQuery para nombres distintos de Batter/Pitcher...")
-        query = """
+        seasons = ",".join(f'"{t}"' for t in CATALOG_SEASONS)
+        query = f"""
         SELECT DISTINCT Batter AS name, 'b' AS role
         FROM `baseballlmb.trackman_db.trackman_table`
-        WHERE Batter IS NOT NULL AND Batter != '-' AND Temporada_Anio IN (
-            "Invierno-2025","Verano-2025","Invierno-2024","Verano-2024"
-        )
+        WHERE Batter IS NOT NULL AND Batter != '-' AND Temporada_Anio IN ({seasons})
         UNION ALL
         SELECT DISTINCT Pitcher AS name, 'p' AS role
         FROM `baseballlmb.trackman_db.trackman_table`
-        WHERE Pitcher IS NOT NULL AND Pitcher != '-' AND Temporada_Anio IN (
-            "Invierno-2025","Verano-2025","Invierno-2024","Verano-2024"
-        )
+        WHERE Pitcher IS NOT NULL AND Pitcher != '-' AND Temporada_Anio IN ({seasons})
         """
-        # Ejecutar query
-        try:
-            client = bigquery.Client()
-            job = client.query(query)
-            # borrar log
-            logger.debug("Consulta a BigQuery enviada.")
-            try:
-                credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
-                bqstorageclient = bigquery_storage.BigQueryReadClient(credentials=credentials)
-                df = job.result().to_dataframe(bqstorage_client=bqstorageclient)
-                # borrar log
-                logger.debug("Resultados de BigQuery obtenidos usando BigQueryReadClient.")
-            except Exception as e_bq_storage:
-                logger.warning(f"Falló el uso de BigQueryReadClient: {e_bq_storage}. Intentando con to_dataframe() normal. borrar log")
-                df = job.result().to_dataframe()
-                # borrar log
-                logger.debug("Resultados de BigQuery obtenidos usando to_dataframe() normal.")
-        except Exception as e_query:
-            logger.error(f"Error al ejecutar la consulta BigQuery: {e_query} borrar log")
-            self._bq_names_cache = {"batters": [], "pitchers": []}
-            return self._bq_names_cache
+        df = self._bq_dataframe(query)
 
         if df.empty:
             logger.warning("BigQuery devolvió 0 nombres distintos.")
-            self._bq_names_cache = {"batters": [], "pitchers": []}
-            return self._bq_names_cache
+            return {"batters": [], "pitchers": []}
 
         # Limpieza consistente
         df["name"] = df["name"].astype(str).map(self._clean_name_reports_style)
@@ -588,10 +696,106 @@ class Tools:
 
         batters = sorted(df[df["role"] == "b"]["name"].unique().tolist())
         pitchers = sorted(df[df["role"] == "p"]["name"].unique().tolist())
-
-        self._bq_names_cache = {"batters": batters, "pitchers": pitchers}
         logger.info(f"BigQuery nombres: batters={len(batters)}, pitchers={len(pitchers)}")
-        return self._bq_names_cache
+        return {"batters": batters, "pitchers": pitchers}
+
+    def _usar_catalogo_disco(self, cargado: Dict[str, object]) -> Dict[str, List[str]]:
+        """Adopta el catálogo leído de disco: nombres en memoria + índices ya construidos."""
+        names = cargado["names"]
+        index = cargado.get("index") or {}
+        for rol, lista in names.items():
+            estado = index.get(rol)
+            if estado is None or not lista:
+                continue
+            try:
+                self._catalogos[tuple(lista)] = _CatalogoTrackman.desde_estado(estado)
+            except Exception as e:
+                # borrar log
+                logger.warning(f"Índice en disco inválido para {rol}: {e}. Se reconstruirá.")
+        self._bq_names_cache = names
+        return names
+
+    def _guardar_catalogo_disco(self, cache: CatalogCache, names: Dict[str, List[str]],
+                                watermark: Optional[str]) -> None:
+        index = {rol: self._catalogo(lista).estado() for rol, lista in names.items() if lista}
+        try:
+            cache.write(names, index, watermark)
+        except Exception as e:
+            logger.warning(f"No se pudo escribir el catálogo en {cache.cache_dir}: {e}")
+
+    def _bq_get_distinct_names(self, refresh: bool = False) -> Dict[str, List[str]]:
+        """
+        Devuelve nombres distintos por rol: {'batters': [...], 'pitchers': [...]},
+        limpios al estilo reports.clean_name.
+        Orden de consulta: self._bq_names_cache -> catálogo en disco (TTL) -> BigQuery.
+        Vencido el TTL, solo se vuelve a pedir la lista si cambió max(fecha_carga).
+        Un lock de archivo evita que varios procesos consulten BigQuery a la vez.
+        """
+        if self._bq_names_cache is not None and not refresh:
+            # borrar log
+            logger.info("Devolviendo nombres de BigQuery desde la caché.")
+            return self._bq_names_cache
+
+        cache = CatalogCache(CATALOG_CACHE_DIR, CATALOG_TTL_HOURS)
+        if not refresh and cache.is_fresh():
+            cargado = cache.load()
+            if cargado is not None:
+                # borrar log
+                logger.info(f"Catálogo de nombres leído de disco: {CATALOG_CACHE_DIR}")
+                return self._usar_catalogo_disco(cargado)
+
+        with cache.lock() as obtenido:
+            if not obtenido:
+                # otro proceso sigue consultando BigQuery: se usa lo que haya en disco, sin consultar en paralelo
+                cargado = cache.load()
+                if cargado is not None:
+                    logger.warning("Tiempo agotado esperando el lock del catálogo; se usa el catálogo en disco.")
+                    return self._usar_catalogo_disco(cargado)
+                raise RuntimeError(
+                    f"Tiempo agotado esperando el lock del catálogo ({cache.lock_path}) y no hay catálogo en disco."
+                )
+
+            # otro proceso pudo refrescarlo mientras esperábamos el lock
+            if not refresh and cache.is_fresh():
+                cargado = cache.load()
+                if cargado is not None:
+                    return self._usar_catalogo_disco(cargado)
+
+            try:
+                watermark = self._bq_watermark()
+            except Exception as e:
+                logger.warning(f"No se pudo obtener fecha_carga de BigQuery: {e} borrar log")
+                watermark = None
+
+            if not refresh and watermark is not None and watermark == cache.watermark:
+                cargado = cache.load()
+                if cargado is not None:
+                    # borrar log
+                    logger.info(f"Catálogo sin cambios (fecha_carga={watermark}); se renueva el TTL.")
+                    cache.touch()
+                    return self._usar_catalogo_disco(cargado)
+
+            try:
+                names = self._bq_query_distinct_names()
+            except Exception as e_query:
+                logger.error(f"Error al ejecutar la consulta BigQuery: {e_query} borrar log")
+                # un catálogo vencido es mejor que ninguno
+                cargado = cache.load()
+                if cargado is not None:
+                    logger.warning("Usando catálogo de nombres vencido en disco.")
+                    return self._usar_catalogo_disco(cargado)
+                self._bq_names_cache = {"batters": [], "pitchers": []}
+                return self._bq_names_cache
+
+            self._bq_names_cache = names
+            if names["batters"] or names["pitchers"]:
+                self._guardar_catalogo_disco(cache, names, watermark)
+            return names
+
+    def refrescar_catalogo(self) -> Dict[str, List[str]]:
+        """Fuerza la recarga del catálogo desde BigQuery y reescribe el caché en disco."""
+        self._bq_names_cache = None
+        return self._bq_get_distinct_names(refresh=True)
 
     def cargar_nombres_trackman(self, path_csv: Optional[str] = None) -> List[str]:
         """
@@ -647,11 +851,69 @@ class Tools:
         return bq_names_by_role
 
     # === PARTE 4: COMPARACIÓN CON TRACKMAN ===
-    def encontrar_similares(self, nombres_archivo: List[str], nombres_trackman: List[str], umbral: float = 90) -> List[Dict]:
+    def _catalogo(self, nombres_trackman: List[str]) -> _CatalogoTrackman:
+        """
+        Catálogo Trackman preparado una sola vez por lista.
+        Igual que el dict normalizado→original de antes: gana el último original de cada clave
+        y se conserva el orden de primera aparición.
+        """
+        key = tuple(nombres_trackman)
+        cat = self._catalogos.get(key)
+        if cat is None:
+            norm_to_orig = {self.normalizar_nombre(n): n for n in nombres_trackman}
+            originales = list(norm_to_orig.values())
+            cat = _CatalogoTrackman(originales, list(norm_to_orig.keys()),
+                                    [self.simplificar_nombre(n) for n in originales])
+            if len(self._catalogos) >= 8:
+                self._catalogos.pop(next(iter(self._catalogos)))
+            self._catalogos[key] = cat
+            # borrar log
+            logger.debug(f"Catálogo Trackman preparado con {len(originales)} nombres y {len(cat.bloques)} bloques.")
+        return cat
+
+    # === Alias confirmados ===
+    def encontrar_con_alias(self, nombres_archivo: List[str], nombres_trackman: List[str], rol: str,
+                            umbral: float = 90) -> List[Dict]:
+        """
+        Igual que encontrar_similares, pero primero consulta la tabla de alias del rol:
+        un alias exacto (y todavía presente en el catálogo) no pasa por rapidfuzz.
+        """
+        validos = set(nombres_trackman)
+        salida: List[Optional[Dict]] = [None] * len(nombres_archivo)
+        pendientes, posiciones = [], []
+        for i, nombre in enumerate(nombres_archivo):
+            alias = self.alias.get(rol, self.normalizar_nombre(nombre))
+            if alias and alias.get("trackman") in validos:
+                salida[i] = {
+                    "nombre_roster": nombre,
+                    "nombre_trackman": alias["trackman"],
+                    "coincidencia": True,
+                    "similitud": float(alias.get("score", 100.0)),
+                    "algoritmo": "alias"
+                }
+            else:
+                pendientes.append(nombre)
+                posiciones.append(i)
+        # borrar log
+        logger.info(f"Alias ({rol}): {len(nombres_archivo) - len(pendientes)} resueltos, {len(pendientes)} a rapidfuzz.")
+
+        if pendientes:
+            for i, c in zip(posiciones, self.encontrar_similares(pendientes, nombres_trackman, umbral=umbral)):
+                salida[i] = c
+        return salida
+
+    def registrar_alias(self, nombre_roster: str, nombre_trackman: str, rol: str, score: float = 100.0) -> None:
+        """Guarda un match confirmado (p. ej. desde la lista Matched de la GUI)."""
+        rol = "pitchers" if str(rol).lower().startswith("pitcher") else "batters"
+        self.alias.record(rol, self.normalizar_nombre(nombre_roster), nombre_trackman, score)
+        # borrar log
+        logger.info(f"Alias registrado ({rol}): '{nombre_roster}' -> '{nombre_trackman}'")
+
+    def encontrar_similares(self, nombres_archivo: List[str], nombres_trackman: List[str], umbral: float = 90,
+                            workers: int = MATCH_WORKERS) -> List[Dict]:
         logger.info(f"Buscando coincidencias entre {len(nombres_archivo)} nombres de roster y {len(nombres_trackman)} de Trackman con umbral {umbral:.1f}...")
         coincidencias = []
-        nombres_track_norm_to_orig = {self.normalizar_nombre(n): n for n in nombres_trackman}
-        
+
         if not nombres_trackman:
             logger.warning("La lista de nombres de Trackman está vacía, no se pueden realizar comparaciones. borrar log")
             for nombre in nombres_archivo:
@@ -663,38 +925,45 @@ class Tools:
                     "algoritmo": None
                 })
             return coincidencias
+        if not nombres_archivo:
+            return coincidencias
 
-        for nombre in nombres_archivo:
-            mejor_match = None
-            mejor_score = 0
-            algoritmo = None
-            normalizado = self.normalizar_nombre(nombre)
-            # borrar log
-            logger.debug(f"Evaluando nombre de roster: '{nombre}' (Normalizado: '{normalizado}')")
-
-            for track_norm, track_orig in nombres_track_norm_to_orig.items():
-                score = rapidfuzz.fuzz.ratio(normalizado, track_norm)
-                if score > mejor_score:
-                    mejor_score = score
-                    mejor_match = track_orig
-                    algoritmo = "rapidfuzz.ratio (normalizado)"
-                # borrar log
-                logger.debug(f" Comparando '{normalizado}' con '{track_norm}', score: {score:.1f}")
-
+        cat = self._catalogo(nombres_trackman)
+        originales, cat_norm, cat_simpl = cat.originales, cat.normalizados, cat.simplificados
+        n = len(nombres_archivo)
+        normalizados = [self.normalizar_nombre(x) for x in nombres_archivo]
+        idx = np.zeros(n, dtype=int)
+        mejor = np.zeros(n)
+        algoritmos = np.full(n, None, dtype=object)
+
+        # Bloques: solo se puntúan los candidatos; se acepta el primero que llegue al umbral
+        pendientes = []
+        for i, nombre in enumerate(nombres_archivo):
+            for cand in cat.candidatos(normalizados[i]):
+                s1 = cdist([normalizados[i]], [cat_norm[j] for j in cand], scorer=fuzz.ratio, dtype=np.float64)[0]
+                k = int(s1.argmax())
+                if s1[k] >= umbral:
+                    idx[i], mejor[i], algoritmos[i] = cand[k], s1[k], "rapidfuzz.ratio (normalizado)"
+                    break
+                s2 = cdist([self.simplificar_nombre(nombre)], [cat_simpl[j] for j in cand], scorer=fuzz.ratio, dtype=np.float64)[0]
+                k2 = int(s2.argmax())
+                if s2[k2] >= umbral and s2[k2] > s1[k]:
+                    idx[i], mejor[i], algoritmos[i] = cand[k2], s2[k2], "rapidfuzz.ratio (simplificado)"
+                    break
+            else:
+                pendientes.append(i)
+        # borrar log
+        logger.debug(f"Bloques: {n - len(pendientes)} resueltos, {len(pendientes)} a búsqueda completa.")
 
-            if mejor_score < umbral:
-                simplificado = self.simplificar_nombre(nombre)
-                # borrar log
-                logger.debug(f"Score inicial bajo ({mejor_score:.1f}), intentando con nombres simplificados. Simplificado: '{simplificado}'")
-                for track_norm, track_orig in nombres_track_norm_to_orig.items():
-                    score = rapidfuzz.fuzz.ratio(simplificado, self.simplificar_nombre(track_orig))
-                    if score > mejor_score:
-                        mejor_score = score
-                        mejor_match = track_orig
-                        algoritmo = "rapidfuzz.ratio (simplificado)"
-                    # borrar log
-                    logger.debug(f" Comparando simplificado '{simplificado}' con simplificado '{self.simplificar_nombre(track_orig)}', score: {score:.1f}")
+        if pendientes:
+            # Búsqueda completa solo para los que no se resolvieron por bloques
+            self._match_completo(np.asarray(pendientes), normalizados, nombres_archivo, cat,
+                                 umbral, workers, idx, mejor, algoritmos)
 
+        for i, nombre in enumerate(nombres_archivo):
+            mejor_score = float(mejor[i]) if mejor[i] > 0 else 0
+            mejor_match = originales[idx[i]] if mejor[i] > 0 else None
+            algoritmo = algoritmos[i]
 
             if mejor_score >= umbral:
                 logger.info(f"✓ Match: '{nombre}' ≈ '{mejor_match}' → {mejor_score:.1f} ({algoritmo})")
@@ -712,6 +981,33 @@ class Tools:
         logger.info(f"Finalizada la búsqueda de coincidencias. Total de coincidencias evaluadas: {len(coincidencias)}.")
         return coincidencias
 
+    def _match_completo(self, filas: np.ndarray, normalizados: List[str], nombres_archivo: List[str],
+                        cat: _CatalogoTrackman, umbral: float, workers: int,
+                        idx: np.ndarray, mejor: np.ndarray, algoritmos: np.ndarray) -> None:
+        """Búsqueda contra todo el catálogo (llena idx/mejor/algoritmos en las `filas` dadas)."""
+        # Pasada 1: roster normalizado contra todo el catálogo en una sola matriz
+        scores = cdist([normalizados[i] for i in filas], cat.normalizados, scorer=fuzz.ratio,
+                       dtype=np.float64, workers=workers)
+        best = scores.argmax(axis=1)  # primer máximo, como el '>' del ciclo original
+        idx[filas] = best
+        mejor[filas] = scores[np.arange(len(filas)), best]
+        algoritmos[filas] = np.where(mejor[filas] > 0, "rapidfuzz.ratio (normalizado)", None)
+
+        # Pasada 2: solo los que no llegan al umbral, con nombres simplificados
+        bajos = filas[mejor[filas] < umbral]
+        if len(bajos):
+            # borrar log
+            logger.debug(f"{len(bajos)} nombres bajo el umbral, intentando con nombres simplificados.")
+            simplificados = [self.simplificar_nombre(nombres_archivo[i]) for i in bajos]
+            scores2 = cdist(simplificados, cat.simplificados, scorer=fuzz.ratio, dtype=np.float64, workers=workers)
+            idx2 = scores2.argmax(axis=1)
+            mejor2 = scores2[np.arange(len(idx2)), idx2]
+            mejora = mejor2 > mejor[bajos]
+            sel = bajos[mejora]
+            idx[sel] = idx2[mejora]
+            mejor[sel] = mejor2[mejora]
+            algoritmos[sel] = "rapidfuzz.ratio (simplificado)"
+
     # === RESÚMENES Y PROCESAMIENTO FINAL (CLI/GUI) ===
     def obtener_preview(self, df: pd.DataFrame) -> List[Dict]:
         # borrar log
@@ -794,11 +1090,11 @@ class Tools:
             if roster_batters:
                 # borrar log
                 logger.info(f"Iniciando matching para {len(roster_batters)} bateadores.")
-                coincidencias += self.encontrar_similares(roster_batters, bq_names.get("batters", []), umbral=umbral)
+                coincidencias += self.encontrar_con_alias(roster_batters, bq_names.get("batters", []), "batters", umbral=umbral)
             if roster_pitchers:
                 # borrar log
                 logger.info(f"Iniciando matching para {len(roster_pitchers)} pitchers.")
-                coincidencias += self.encontrar_similares(roster_pitchers, bq_names.get("pitchers", []), umbral=umbral)
+                coincidencias += self.encontrar_con_alias(roster_pitchers, bq_names.get("pitchers", []), "pitchers", umbral=umbral)
 
             logger.info(f"Procesamiento completado: {len(coincidencias)} coincidencias evaluadas")
 
@@ -959,4 +1255,20 @@ def run_tools_from_pdf(path_pdf: str, trackman_csv: Optional[str] = None, umbral
         "pitchers_unmatched": pitchers_unmatched,
         "staff_unmatched": staff_unmatched,
         "totals": totals
-    }
\ No newline at end of file
+    }
+
+# -------------------------------
+# CLI: refresco explícito del catálogo en disco
+# -------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Catálogo de nombres Trackman (caché en disco).")
+    parser.add_argument("--refresh-catalog", action="store_true",
+                        help="Vuelve a consultar BigQuery y reescribe el catálogo en disco.")
+    args = parser.parse_args()
+
+    t = Tools()
+    names = t.refrescar_catalogo() if args.refresh_catalog else t._bq_get_distinct_names()
+    print(f"Catálogo en {CATALOG_CACHE_DIR}: batters={len(names['batters'])}, pitchers={len(names['pitchers'])}")
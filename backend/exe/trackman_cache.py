@@ -0,0 +1,256 @@
+# trackman_cache.py
+import os
+import re
+import json
+import hashlib
+import logging
+from typing import List, Optional, Dict, Any, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Constantes
+# -------------------------------
+
+# sube este número si cambia el formato de lo que se guarda (p. ej. la limpieza de nombres)
+CACHE_VERSION = 1
+META_FILE = "_meta.json"
+PARTITION_COL = "Temporada_Anio"
+WATERMARK_COL = "fecha_carga"
+
+# consulta incremental: solo filas cargadas después de la marca de agua
+DELTA_QUERY_TEMPLATE = """
+SELECT base.*
+FROM ({query}) AS base
+WHERE SAFE_CAST(base.fecha_carga AS TIMESTAMP) > @watermark
+"""
+
+def parquet_available() -> bool:
+    """Indica si hay motor de Parquet (pyarrow) instalado."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+def build_delta_query(query: str) -> str:
+    """Envuelve la consulta base para traer solo el delta posterior a @watermark."""
+    return DELTA_QUERY_TEMPLATE.format(query=query.strip().rstrip(";"))
+
+def _query_key(query: str) -> str:
+    """Huella de la consulta base; si cambia, la caché se reconstruye."""
+    normalized = " ".join(query.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+def _max_fecha_carga(df: pd.DataFrame) -> Optional[pd.Timestamp]:
+    """Máxima fecha_carga válida del DataFrame ('-' y vacíos se ignoran)."""
+    if WATERMARK_COL not in df.columns or df.empty:
+        return None
+    fechas = pd.to_datetime(df[WATERMARK_COL], errors="coerce", utc=True)
+    wm = fechas.max()
+    return None if pd.isna(wm) else wm
+
+# -------------------------------
+# Caché en disco
+# -------------------------------
+
+class TrackmanCache:
+    """
+    Almacén Parquet de trackman_table particionado por Temporada_Anio.
+    Un archivo por temporada más un _meta.json con la marca de agua (max fecha_carga).
+    """
+
+    def __init__(self, cache_dir: str, query: str):
+        self.cache_dir = cache_dir
+        self.query_key = _query_key(query)
+        self.meta_path = os.path.join(cache_dir, META_FILE)
+
+    # ---- metadatos ----
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _write_meta(self, partitions: List[str], watermark: Optional[pd.Timestamp]) -> None:
+        meta = {
+            "version": CACHE_VERSION,
+            "query_key": self.query_key,
+            "partitions": sorted(set(partitions)),
+            "watermark": watermark.isoformat() if watermark is not None else None,
+            "updated_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        }
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.meta_path)
+
+    def is_valid(self) -> bool:
+        """True si existe una caché completa generada con la misma consulta y versión."""
+        meta = self._read_meta()
+        if not meta:
+            return False
+        if meta.get("version") != CACHE_VERSION or meta.get("query_key") != self.query_key:
+            # borrar log
+            logger.info("TrackmanCache: caché de otra versión/consulta, se reconstruirá") # borrar log
+            return False
+        if meta.get("watermark") is None:
+            return False
+        return all(os.path.isfile(self._partition_path(p)) for p in meta.get("partitions", []))
+
+    @property
+    def watermark(self) -> Optional[pd.Timestamp]:
+        meta = self._read_meta() or {}
+        wm = meta.get("watermark")
+        return pd.Timestamp(wm) if wm else None
+
+    @property
+    def partitions(self) -> List[str]:
+        return list((self._read_meta() or {}).get("partitions", []))
+
+    # ---- particiones ----
+    def _partition_path(self, temporada: str) -> str:
+        safe = re.sub(r"[^\w.-]+", "_", str(temporada))
+        return os.path.join(self.cache_dir, f"{PARTITION_COL}={safe}.parquet")
+
+    def _write_partition(self, temporada: str, df_part: pd.DataFrame) -> None:
+        path = self._partition_path(temporada)
+        tmp = path + ".tmp"
+        df_part.reset_index(drop=True).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def _read_partition(self, temporada: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_parquet(self._partition_path(temporada), columns=columns)
+
+    # ---- API ----
+    def load(self, seasons: Optional[List[str]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Lee las particiones (opcionalmente solo algunas temporadas/columnas)."""
+        parts = self.partitions
+        if seasons is not None:
+            parts = [p for p in parts if p in set(seasons)]
+        if not parts:
+            return pd.DataFrame(columns=columns or [])
+        frames = [self._read_partition(p, columns=columns) for p in parts]
+        # borrar log
+        logger.debug(f"TrackmanCache.load: {len(parts)} particiones leídas") # borrar log
+        return pd.concat(frames, ignore_index=True, sort=False)
+
+    def write_full(self, df: pd.DataFrame) -> None:
+        """Reescribe la caché completa (arranque en frío)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for old in self.partitions:
+            try:
+                os.remove(self._partition_path(old))
+            except OSError:
+                pass
+        partitions = []
+        for temporada, df_part in df.groupby(df[PARTITION_COL].astype(str), sort=False):
+            self._write_partition(temporada, df_part)
+            partitions.append(temporada)
+        self._write_meta(partitions, _max_fecha_carga(df))
+        # borrar log
+        logger.info(f"TrackmanCache.write_full: {len(df)} filas en {len(partitions)} particiones") # borrar log
+
+    def merge_delta(self, delta: pd.DataFrame) -> int:
+        """
+        Integra filas nuevas en las particiones afectadas.
+        Si un id_path se recarga, sus filas anteriores se sustituyen por las nuevas.
+        Regresa el número de filas integradas.
+        """
+        if delta is None or delta.empty:
+            return 0
+        partitions = self.partitions
+        for temporada, df_new in delta.groupby(delta[PARTITION_COL].astype(str), sort=False):
+            if temporada in partitions:
+                df_old = self._read_partition(temporada)
+                if "id_path" in df_old.columns and "id_path" in df_new.columns:
+                    df_old = df_old[~df_old["id_path"].isin(df_new["id_path"].unique())]
+                df_part = pd.concat([df_old, df_new], ignore_index=True, sort=False)
+                if "id_path" not in df_part.columns:
+                    df_part = df_part.drop_duplicates()
+            else:
+                df_part = df_new
+                partitions.append(temporada)
+            self._write_partition(temporada, df_part)
+
+        wm_old, wm_new = self.watermark, _max_fecha_carga(delta)
+        watermark = max([w for w in (wm_old, wm_new) if w is not None], default=None)
+        self._write_meta(partitions, watermark)
+        # borrar log
+        logger.info(f"TrackmanCache.merge_delta: {len(delta)} filas nuevas, watermark={watermark}") # borrar log
+        return len(delta)
+
+# -------------------------------
+# Cliente local (sustituto de bigquery.Client)
+# -------------------------------
+
+class _LocalRowIterator:
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def to_dataframe(self, *args, **kwargs) -> pd.DataFrame:
+        return self._df.copy()
+
+class _LocalQueryJob:
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def result(self, *args, **kwargs) -> _LocalRowIterator:
+        return _LocalRowIterator(self._df)
+
+class LocalTrackmanClient:
+    """
+    Sustituto local de bigquery.Client respaldado por un CSV/Parquet o un DataFrame.
+    No interpreta el SQL: aplica con pandas los parámetros de la consulta
+    (@watermark, @seasons, @batters/@pitchers, @date_from/@date_to), que llegan
+    como tuplas (nombre, tipo, valor) igual que en reports._run_query.
+    Sirve para pruebas y para correr reportes sin acceso a BigQuery.
+    """
+
+    def __init__(self, source: Union[str, pd.DataFrame]):
+        if isinstance(source, pd.DataFrame):
+            self._df = source.copy()
+        elif str(source).lower().endswith(".parquet"):
+            self._df = pd.read_parquet(source)
+        else:
+            self._df = pd.read_csv(source, low_memory=False)
+        self.queries: List[str] = []
+
+    @staticmethod
+    def _params(params: Optional[List[Any]]) -> Dict[str, Any]:
+        return {name: value for name, _type, value in params or []}
+
+    def _apply_params(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        wm = params.get("watermark")
+        if wm is not None and WATERMARK_COL in df.columns:
+            fechas = pd.to_datetime(df[WATERMARK_COL], errors="coerce", utc=True)
+            wm = pd.Timestamp(wm)
+            wm = wm.tz_localize("UTC") if wm.tzinfo is None else wm.tz_convert("UTC")
+            df = df[fechas > wm]
+        if params.get("seasons") is not None and PARTITION_COL in df.columns:
+            df = df[df[PARTITION_COL].isin(params["seasons"])]
+        if "batters" in params or "pitchers" in params:
+            # mismo OR que la consulta parametrizada
+            by_name = pd.Series(False, index=df.index)
+            if "Batter" in df.columns:
+                by_name |= df["Batter"].isin(params.get("batters") or [])
+            if "Pitcher" in df.columns:
+                by_name |= df["Pitcher"].isin(params.get("pitchers") or [])
+            df = df[by_name]
+        if ("date_from" in params or "date_to" in params) and "Date" in df.columns:
+            fechas = pd.to_datetime(df["Date"], errors="coerce")
+            if params.get("date_from") is not None:
+                df = df[fechas >= pd.Timestamp(params["date_from"])]
+                fechas = fechas[df.index]
+            if params.get("date_to") is not None:
+                df = df[fechas <= pd.Timestamp(params["date_to"])]
+        return df
+
+    def query(self, sql: str, params: Optional[List[Any]] = None, **kwargs) -> _LocalQueryJob:
+        self.queries.append(sql)
+        df = self._apply_params(self._df, self._params(params))
+        return _LocalQueryJob(df)
@@ -0,0 +1,140 @@
+import io
+import matplotlib.image as mpimg
+import pypdfium2 as pdfium
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Backend vectorial de los reportes (--render-mode vector).
+# Imita el subconjunto de fpdf.FPDF que usan los create_report (add_page, set_font,
+# cell, image, output) con las mismas coordenadas en mm. Cada página es una Figure
+# de matplotlib (títulos e imágenes de disco); cada gráfica se guarda con savefig a
+# un PDF en memoria y se incrusta en su rectángulo como Form XObject (pypdfium2):
+# sin JPG/PNG intermedios.
+
+MM = 72 / 25.4  # puntos por mm
+PAGE_SIZES = {"P": (210.0, 297.0), "L": (297.0, 210.0)}  # A4, como fpdf
+MARGIN = 10.0  # margen por defecto de fpdf (mm)
+PAD_INCHES = 0.2  # mismo recorte que savefig(bbox_inches='tight')
+
+FONT_FAMILIES = {"times": "serif", "arial": "sans-serif", "helvetica": "sans-serif", "courier": "monospace"}
+
+RENDER_MODES = ("raster", "vector")
+
+
+class VectorChart(NamedTuple):
+    """Gráfica pendiente de dibujar: la Figure y el pad con el que el modo raster la habría recortado."""
+    figure: Figure
+    pad_inches: float = PAD_INCHES
+
+
+class Inset(NamedTuple):
+    """PDF de una gráfica y dónde va: página y (x0, y0, ancho, alto) en puntos desde la esquina inferior izquierda."""
+    page: int
+    data: bytes
+    rect: Tuple[float, float, float, float]
+
+
+def chart_pdf(chart: VectorChart) -> bytes:
+    """La gráfica como PDF de una página, recortada igual que el PNG/JPG del modo raster."""
+    buf = io.BytesIO()
+    chart.figure.savefig(buf, format="pdf", bbox_inches="tight", pad_inches=chart.pad_inches)
+    return buf.getvalue()
+
+
+class VectorPDF:
+    """
+    Sustituto de fpdf.FPDF para el modo vectorial.
+    `figures` mapea el nombre que create_report pide en image() a su VectorChart;
+    los nombres que no estén ahí se leen de disco como imagen (logos, tablas, home plate).
+    """
+
+    def __init__(self, figures: Optional[Dict[str, VectorChart]] = None):
+        self.figures = figures if figures is not None else {}
+        self.pages: List[Figure] = []
+        self.insets: List[Inset] = []
+        self.page_size = PAGE_SIZES["P"]
+        self.font = {"family": "serif", "weight": "normal", "style": "normal", "size": 12}
+        self.y = MARGIN
+        self._chart_pdfs: Dict[str, bytes] = {}
+
+    def add_page(self, orientation: str = "P"):
+        self.page_size = PAGE_SIZES[orientation.upper()[0]]
+        w, h = self.page_size
+        self.pages.append(Figure(figsize=(w / 25.4, h / 25.4)))
+        self.y = MARGIN
+
+    def set_font(self, family: str, style: str = "", size: int = 12):
+        style = style.upper()
+        self.font = {
+            "family": FONT_FAMILIES.get(family.lower(), family),
+            "weight": "bold" if "B" in style else "normal",
+            "style": "italic" if "I" in style else "normal",
+            "size": size,
+        }
+
+    def _fraction_rect(self, x, y, w, h):
+        # mm desde la esquina superior izquierda -> fracción de la página desde la inferior izquierda
+        pw, ph = self.page_size
+        return [x / pw, 1 - (y + h) / ph, w / pw, h / ph]
+
+    def cell(self, w, h=0, txt="", border=0, ln=0, align="", **kwargs):
+        # solo se usa para los títulos: w=0 ocupa de margen a margen
+        pw, ph = self.page_size
+        w = w or pw - 2 * MARGIN
+        xs = {"C": MARGIN + w / 2, "R": MARGIN + w}
+        self.pages[-1].text(xs.get(align.upper(), MARGIN) / pw, 1 - (self.y + h / 2) / ph, txt,
+                            color="black", ha={"C": "center", "R": "right"}.get(align.upper(), "left"), va="center",
+                            fontfamily=self.font["family"], fontweight=self.font["weight"],
+                            fontstyle=self.font["style"], fontsize=self.font["size"])
+        if ln:
+            self.y += h
+
+    def _chart_pdf(self, name) -> bytes:
+        if name not in self._chart_pdfs:
+            self._chart_pdfs[name] = chart_pdf(self.figures[name])
+        return self._chart_pdfs[name]
+
+    def _aspect(self, name) -> float:
+        """Alto/ancho con el que se dibujaría `name` (para image() con h=0, como fpdf)."""
+        if name in self.figures:
+            w, h = pdfium.PdfDocument(self._chart_pdf(name))[0].get_size()
+            return h / w
+        rows, cols = mpimg.imread(name).shape[:2]
+        return rows / cols
+
+    def image(self, name, x=None, y=None, w=0, h=0, **kwargs):
+        if not h:
+            # fpdf conserva la proporción cuando solo se da el ancho
+            h = w * self._aspect(name)
+        if name in self.figures:
+            # la gráfica se estira a su rectángulo igual que fpdf estira la imagen
+            pw, ph = self.page_size
+            rect = (x * MM, (ph - y - h) * MM, w * MM, h * MM)
+            self.insets.append(Inset(len(self.pages) - 1, self._chart_pdf(name), rect))
+            return
+        ax = self.pages[-1].add_axes(self._fraction_rect(x, y, w, h))
+        ax.imshow(mpimg.imread(name), aspect="auto")
+        ax.axis("off")
+
+    def output(self, name="", dest="F"):
+        buf = io.BytesIO()
+        with PdfPages(buf) as pdf:
+            for page in self.pages:
+                pdf.savefig(page)
+        doc = pdfium.PdfDocument(buf.getvalue())
+        sources = []  # los PDF de las gráficas deben seguir abiertos hasta doc.save
+        pages = {}
+        for inset in self.insets:
+            src = pdfium.PdfDocument(inset.data)
+            sources.append(src)
+            src_w, src_h = src[0].get_size()
+            x0, y0, w, h = inset.rect
+            obj = src.page_as_xobject(0, doc).as_pageobject()
+            obj.transform(pdfium.PdfMatrix().scale(w / src_w, h / src_h).translate(x0, y0))
+            if inset.page not in pages:
+                pages[inset.page] = doc[inset.page]
+            pages[inset.page].insert_obj(obj)
+        for page in pages.values():
+            page.gen_content()
+        doc.save(name)
@@ -0,0 +1,228 @@
+const path = require("path");
+const readline = require("readline");
+const { spawn } = require("child_process");
+const logger = require("../config/logger"); // Uso del logger centralizado
+
+// Pool de procesos Python de larga vida (extract_metadata.py --worker).
+// Cada worker importa pandas/rapidfuzz/pdfplumber una sola vez y conserva sus cachés;
+// se comunican por JSON delimitado por saltos de línea (una petición a la vez por worker).
+
+const PYTHON_EXECUTABLE =
+  process.env.PYTHON_EXECUTABLE ||
+  "/home/yael/Desktop/proyectos_web/baseball/Plataform_LMB/backend/back_app_baseball/env/bin/python3";
+const SCRIPT_PATH = path.resolve(
+  __dirname,
+  "python_scripts/extract_metadata.py"
+);
+const POOL_SIZE = parseInt(process.env.OCR_WORKERS || "2", 10);
+const REQUEST_TIMEOUT_MS = parseInt(
+  process.env.OCR_WORKER_TIMEOUT_MS || "600000",
+  10
+);
+// reinicios de un worker que no llega a arrancar: espera exponencial y un máximo
+const MAX_RESTARTS = parseInt(process.env.OCR_WORKER_MAX_RESTARTS || "5", 10);
+const RESTART_BASE_MS = 1000;
+const RESTART_MAX_MS = 30000;
+
+class PythonWorker {
+  constructor(index, onExit) {
+    this.index = index;
+    this.onExit = onExit;
+    this.pending = null;
+    this.nextId = 1;
+    this.alive = true;
+
+    this.process = spawn(PYTHON_EXECUTABLE, [SCRIPT_PATH, "--worker"], {
+      stdio: ["pipe", "pipe", "pipe"],
+    });
+
+    this.ready = new Promise((resolve, reject) => {
+      this._resolveReady = resolve;
+      this._rejectReady = reject;
+    });
+    // evita "unhandled rejection" si el worker muere antes de que alguien espere
+    this.ready.catch(() => {});
+
+    readline
+      .createInterface({ input: this.process.stdout })
+      .on("line", (line) => this._onLine(line));
+
+    this.process.stderr.on("data", (data) => {
+      logger.info(`[Python worker ${this.index}] ${data.toString().trim()}`);
+    });
+
+    this.process.on("error", (err) => {
+      logger.error(
+        `Falló al iniciar el worker de Python ${this.index}: ${err.message}`
+      );
+      this._die(new Error(`Falló al iniciar el script de Python: ${err.message}`));
+    });
+
+    this.process.on("close", (code) => {
+      logger.warn(`Worker de Python ${this.index} terminó con código ${code}`);
+      this._die(new Error(`El worker de Python terminó con código ${code}`));
+    });
+  }
+
+  _onLine(line) {
+    let msg;
+    try {
+      msg = JSON.parse(line);
+    } catch (err) {
+      logger.error(`[Python worker ${this.index}] salida no JSON: ${line}`);
+      return;
+    }
+    if (msg.ready) {
+      logger.info(`Worker de Python ${this.index} listo (pid ${msg.pid})`);
+      this._resolveReady();
+      return;
+    }
+    const job = this.pending;
+    if (!job || msg.id !== job.id) {
+      logger.warn(`[Python worker ${this.index}] respuesta inesperada: ${line}`);
+      return;
+    }
+    this.pending = null;
+    clearTimeout(job.timer);
+    if (msg.ok) {
+      job.resolve(msg.result);
+    } else {
+      job.reject(new Error(msg.error || "Error en el worker de Python"));
+    }
+  }
+
+  _die(err) {
+    if (!this.alive) return;
+    this.alive = false;
+    this._rejectReady(err);
+    if (this.pending) {
+      clearTimeout(this.pending.timer);
+      this.pending.reject(err);
+      this.pending = null;
+    }
+    this.onExit(this, err);
+  }
+
+  async run(payload) {
+    await this.ready;
+    return new Promise((resolve, reject) => {
+      const id = this.nextId++;
+      const timer = setTimeout(() => {
+        logger.error(`Worker de Python ${this.index}: tiempo agotado (id ${id})`);
+        this.process.kill();
+      }, REQUEST_TIMEOUT_MS);
+      this.pending = { id, resolve, reject, timer };
+      this.process.stdin.write(JSON.stringify({ id, ...payload }) + "\n");
+    });
+  }
+
+  stop() {
+    if (this.alive) this.process.stdin.end();
+  }
+}
+
+class PythonWorkerPool {
+  constructor(size) {
+    this.size = Math.max(1, size || 1);
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.started = false;
+    this.restarts = []; // reinicios seguidos por posición (vuelve a 0 cuando el worker arranca)
+    this.timers = [];
+    this.exhausted = new Set();
+    this.failed = null;
+  }
+
+  start() {
+    if (this.started) return;
+    this.started = true;
+    for (let i = 0; i < this.size; i++) this._spawn(i);
+  }
+
+  _spawn(index) {
+    const worker = new PythonWorker(index, (dead, err) =>
+      this._onWorkerExit(dead, err)
+    );
+    this.workers[index] = worker;
+    worker.ready.then(
+      () => {
+        this.restarts[index] = 0;
+      },
+      () => {}
+    );
+    this.idle.push(worker);
+    this._drain();
+  }
+
+  _onWorkerExit(worker, err) {
+    this.idle = this.idle.filter((w) => w !== worker);
+    if (!this.started || this.workers[worker.index] !== worker) return;
+
+    // se reemplaza el worker caído para mantener el tamaño del pool
+    const index = worker.index;
+    const attempt = (this.restarts[index] || 0) + 1;
+    if (attempt > MAX_RESTARTS) {
+      logger.error(
+        `Worker de Python ${index}: ${MAX_RESTARTS} reinicios seguidos sin arrancar; no se reintenta más`
+      );
+      this.exhausted.add(index);
+      if (this.exhausted.size === this.size) this._fail(err);
+      return;
+    }
+    this.restarts[index] = attempt;
+    const delay = Math.min(RESTART_BASE_MS * 2 ** (attempt - 1), RESTART_MAX_MS);
+    logger.warn(
+      `Reiniciando worker de Python ${index} en ${delay} ms (intento ${attempt}/${MAX_RESTARTS})`
+    );
+    this.timers[index] = setTimeout(
+      () => this.started && this._spawn(index),
+      delay
+    );
+  }
+
+  _fail(err) {
+    // ningún worker pudo arrancar: se rechaza lo pendiente y lo que llegue después
+    this.failed = err;
+    logger.error(`Pool de Python marcado como fallido: ${err.message}`);
+    const queued = this.queue;
+    this.queue = [];
+    queued.forEach(({ reject }) => reject(err));
+  }
+
+  _drain() {
+    while (this.idle.length && this.queue.length) {
+      const worker = this.idle.shift();
+      const { payload, resolve, reject } = this.queue.shift();
+      worker
+        .run(payload)
+        .then(resolve, reject)
+        .finally(() => {
+          if (worker.alive) this.idle.push(worker);
+          this._drain();
+        });
+    }
+  }
+
+  run(payload) {
+    if (this.failed) return Promise.reject(this.failed);
+    this.start();
+    return new Promise((resolve, reject) => {
+      this.queue.push({ payload, resolve, reject });
+      this._drain();
+    });
+  }
+
+  shutdown() {
+    this.started = false;
+    this.timers.forEach((t) => clearTimeout(t));
+    this.workers.forEach((w) => w && w.stop());
+  }
+}
+
+const pool = new PythonWorkerPool(POOL_SIZE);
+
+// Procesa un archivo de roster; regresa el mismo objeto que imprime extract_metadata.py
+const extractMetadata = (filePath) => pool.run({ path: filePath });
+
+module.exports = { pool, extractMetadata, PythonWorkerPool };
@@ -5,7 +5,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import fpdf
 from functools import reduce
-import dataframe_image as dfi
+
+import shared_modules  # noqa: F401  (agrega backend/exe a sys.path)
+import table_render
+import vector_pdf
 
 # === STUBS (gráficas vacías para no romper el flujo) ===
 def create_slogging_chart_all(*args, **kwargs):
@@ -32,12 +35,27 @@ def spray_probability_conditional(*args, **kwargs):
     return None
 
 # === Reporte PDF simple desde PNG existentes ===
-def create_report(batter_name, team, dir_images, dict_short, n_left, n_right, dir_homeplate=None):
+def create_report(batter_name, team, dir_images, dict_short, n_left, n_right, dir_homeplate=None,
+                  figures=None):
     from fpdf import FPDF
     out_dir = os.path.dirname(dir_images)
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, f"{batter_name}.pdf")
 
+    if figures is not None:
+        # modo vectorial: mismas páginas, con las Figures que save_fig dejó en `figures`
+        pdf = vector_pdf.VectorPDF(figures)
+        pdf.add_page()
+        pdf.set_font("Arial", 'B', 20)
+        pdf.cell(0, 12, f"Reporte de {batter_name}", ln=True, align='C')
+        pdf.set_font("Arial", '', 12)
+        pdf.cell(0, 6, f"Equipo: {team}", ln=True)
+        for img_path in sorted(figures, key=os.path.basename):
+            pdf.add_page()
+            pdf.image(img_path, x=10, y=10, w=190)
+        pdf.output(out_path)
+        return out_path
+
     if not os.path.isdir(dir_images):
         pdf = FPDF()
         pdf.add_page()
@@ -76,16 +94,20 @@ def create_report(batter_name, team, dir_images, dict_short, n_left, n_right, di
 # ----------------------------------------------------------------------
 # BIGQUERY
 # ----------------------------------------------------------------------
-from google.cloud import bigquery
-import google.auth
-from google.cloud import bigquery_storage
-
 # os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "baseballlmb-key.json"
-credentials, your_project_id = google.auth.default(
-    scopes=["https://www.googleapis.com/auth/cloud-platform"]
-)
-bqstorageclient = bigquery_storage.BigQueryReadClient(credentials=credentials)
-client = bigquery.Client()
+# clientes perezosos (igual que pitcher_tools): importar el módulo no autentica
+_clients = None
+
+def _get_clients():
+    global _clients
+    if _clients is None:
+        from google.cloud import bigquery, bigquery_storage
+        import google.auth
+        credentials, your_project_id = google.auth.default(
+            scopes=["https://www.googleapis.com/auth/cloud-platform"]
+        )
+        _clients = (bigquery.Client(), bigquery_storage.BigQueryReadClient(credentials=credentials))
+    return _clients
 
 def _external_load_batter_games():
     # Ajusta el nombre de tabla si tu dataset difiere
@@ -101,6 +123,7 @@ def _external_load_batter_games():
             Date
         FROM baseballlmb.trackman_db.batters_stats_2025
     '''
+    client, bqstorageclient = _get_clients()
     return client.query(query).result().to_dataframe(bqstorage_client=bqstorageclient)
 
 # ----------------------------------------------------------------------
@@ -170,34 +193,26 @@ def get_stats_of_player(name_batter: str, df_stats: pd.DataFrame):
 # ----------------------------------------------------------------------
 # ESTILOS Y EXPORTACIÓN
 # ----------------------------------------------------------------------
+# th: borde de 2px en los cuatro lados; td: 1px izquierda/derecha/abajo; texto centrado al 200%
+BATTER_TABLE_STYLE = table_render.TableStyle(header_edges="TBLR", cell_edges="BLR")
+
 def create_style_batter(df_temp: pd.DataFrame):
-    styles = [
-        dict(selector="th", props=[("font-size", "200%"),
-                                   ("text-align", "center"),
-                                   ('border-top', '2px solid black'),
-                                   ('border-bottom', '2px solid black'),
-                                   ('border-left', '2px solid black'),
-                                   ('border-right', '2px solid black')]),
-        dict(selector="td", props=[("font-size", "200%"),
-                                   ("text-align", "center"),
-                                   ('border-left', '1px solid black'),
-                                   ('border-right', '1px solid black'),
-                                   ('border-bottom', '1px solid black')]),
-        dict(selector="caption", props=[("caption-side", "bottom")])
-    ]
-    return df_temp.style.set_table_styles(styles).hide(axis='index')
-
-def from_df_to_tablepng(batter_name, team, dir_temp, html_temp, name):
-    dir_team = os.path.join(dir_temp, team, batter_name)
-    _ensure_dir(dir_team)
-    dfi.export(html_temp, os.path.join(dir_team, f"{name}.png"), table_conversion="matplotlib")
+    return table_render.StyledTable(df_temp, BATTER_TABLE_STYLE)
 
-def save_fig(dir_temp, team, batter_name, chart, chart_name, dpi=210):
+def from_df_to_tablepng(batter_name, team, dir_temp, table, name, figures=None):
+    return save_fig(dir_temp, team, batter_name, table_render.table_figure(table), name, figures=figures)
+
+def save_fig(dir_temp, team, batter_name, chart, chart_name, dpi=210, figures=None):
     dir_team = os.path.join(dir_temp, team, batter_name)
+    out_path = os.path.join(dir_team, f"{chart_name}.png")
+    if figures is not None:
+        # modo vectorial: la Figure queda bajo la ruta que el PNG habría tenido
+        figures[out_path] = vector_pdf.VectorChart(chart, 0.2)
+        plt.close(chart)
+        return out_path
     _ensure_dir(dir_team)
     if chart_name == 'slugging_general_left':
         dpi = 150
-    out_path = os.path.join(dir_team, f"{chart_name}.png")
     chart.savefig(out_path, dpi=dpi, bbox_inches='tight', pad_inches=0.2)
     plt.close(chart)
     return out_path
@@ -209,48 +224,60 @@ def create_report_full(batter_name,
                        dict_short: dict,
                        dir_temp: str = _DEFAULT_DIR_TEMP,
                        dir_homeplate: str = _DEFAULT_DIR_HOMEPLATE,
-                       img_csv_path: str = _DEFAULT_IMG_CSV):
+                       img_csv_path: str = _DEFAULT_IMG_CSV,
+                       df_stats: pd.DataFrame = None,
+                       df_games: pd.DataFrame = None,
+                       work_dir: str = None,
+                       render_mode: str = 'raster'):
     """
-    Genera el reporte PDF del bateador usando únicamente datos de BigQuery.
+    Genera el reporte PDF del bateador.
+    Si no se pasan `df_games`/`df_stats` (reports.py ya los trae), los carga de BigQuery.
+    Con `work_dir` los archivos van a <work_dir>/Batter en lugar de `dir_temp`.
+    Con render_mode='vector' las gráficas no pasan a PNG: se dibujan como vectores en el PDF.
     """
-    # Carga externa
-    df_games = _external_load_batter_games()
-    df_stats = create_stats_table(df_games)
+    if df_games is None:
+        df_games = _external_load_batter_games()
+    if df_stats is None:
+        df_stats = create_stats_table(df_games)
+    if work_dir:
+        dir_temp = os.path.join(work_dir, 'Batter')
 
     # Tabla de stats
     table, team = get_stats_of_player(batter_name, df_stats)
     table['BatterTeam'] = table['BatterTeam'].map(lambda t: dict_short.get(t, t))
 
     dir_images = os.path.join(dir_temp, team, batter_name)
-    _ensure_dir(dir_images)
+    figures = {} if render_mode == 'vector' else None
+    if figures is None:
+        _ensure_dir(dir_images)
 
     # Tabla 1
-    html_temp = create_style_batter(table)
-    from_df_to_tablepng(batter_name, team, dir_temp, html_temp, 'table_1')
+    table_1 = create_style_batter(table)
+    from_df_to_tablepng(batter_name, team, dir_temp, table_1, 'table_1', figures=figures)
 
     # Slugging general
     fig1 = create_slogging_chart_all(batter_name, 'Left', df_games)
-    save_fig(dir_temp, team, batter_name, fig1, 'slugging_general_left')
+    save_fig(dir_temp, team, batter_name, fig1, 'slugging_general_left', figures=figures)
     fig2 = create_slogging_chart_all(batter_name, 'Right', df_games)
-    save_fig(dir_temp, team, batter_name, fig2, 'slugging_general_right')
+    save_fig(dir_temp, team, batter_name, fig2, 'slugging_general_right', figures=figures)
 
     # Slugging por tipo
     fig3, n_launch_left = create_slogging_chart_by_type(batter_name, 'Left', df_games)
-    save_fig(dir_temp, team, batter_name, fig3, 'slugging_by_launch_left')
+    save_fig(dir_temp, team, batter_name, fig3, 'slugging_by_launch_left', figures=figures)
     fig4, n_launch_right = create_slogging_chart_by_type(batter_name, 'Right', df_games)
-    save_fig(dir_temp, team, batter_name, fig4, 'slugging_by_launch_right')
+    save_fig(dir_temp, team, batter_name, fig4, 'slugging_by_launch_right', figures=figures)
 
     # Tablas xAVG
     fig5 = avg_hit_chart(batter_name, 'Left', df_games)
-    save_fig(dir_temp, team, batter_name, fig5, 'table_hit_left')
+    save_fig(dir_temp, team, batter_name, fig5, 'table_hit_left', figures=figures)
     fig6 = avg_hit_chart(batter_name, 'Right', df_games)
-    save_fig(dir_temp, team, batter_name, fig6, 'table_hit_right')
+    save_fig(dir_temp, team, batter_name, fig6, 'table_hit_right', figures=figures)
 
     # KDEs
     fig7 = create_heatmap_hit(df_games, batter_name, 'Left')
-    save_fig(dir_temp, team, batter_name, fig7, 'kde_hit_left')
+    save_fig(dir_temp, team, batter_name, fig7, 'kde_hit_left', figures=figures)
     fig8 = create_heatmap_hit(df_games, batter_name, 'Right')
-    save_fig(dir_temp, team, batter_name, fig8, 'kde_hit_right')
+    save_fig(dir_temp, team, batter_name, fig8, 'kde_hit_right', figures=figures)
 
     # Spray charts (stubs)
     spray_probability_conditional(df_games, batter_name, team, side='Left',
@@ -264,5 +291,6 @@ def create_report_full(batter_name,
 
     # PDF final
     out_pdf = create_report(batter_name, team, dir_images, dict_short,
-                            n_launch_left, n_launch_right, dir_homeplate=dir_homeplate)
+                            n_launch_left, n_launch_right, dir_homeplate=dir_homeplate,
+                            figures=figures)
     return out_pdf
@@ -0,0 +1,57 @@
+import os
+import sys
+import glob
+import json
+import time
+import statistics
+import subprocess
+
+# Benchmark de arranque de main.py: `--help` y una corrida solo Tools con CSV de nombres.
+# También revisa que la ruta solo Tools no importe BigQuery, matplotlib/seaborn ni dataframe_image.
+# Uso: python bench_startup.py [roster.xlsx|.csv|.pdf] [repeticiones]
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(SCRIPT_DIR, "main.py")
+TRACKMAN_CSV = os.path.join(SCRIPT_DIR, "nombres_trackman.csv")
+
+# módulos que la ruta solo Tools no debería cargar
+PESADOS = ["google.cloud.bigquery", "google.auth", "matplotlib.pyplot", "seaborn",
+           "dataframe_image", "pdfplumber", "reports"]
+
+def medir(cmd, repeticiones: int):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=SCRIPT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        tiempos.append(time.perf_counter() - t0)
+        if proc.returncode not in (0, 2):
+            err = proc.stderr.decode(errors="replace").strip().splitlines()
+            raise RuntimeError(f"{' '.join(cmd)} terminó con {proc.returncode}: {err[-1] if err else ''}")
+    return statistics.median(tiempos), min(tiempos)
+
+def modulos_cargados(roster: str):
+    # importa main y corre la etapa Tools en el mismo proceso para ver qué quedó en sys.modules
+    codigo = (
+        "import sys, json, main\n"
+        f"main.extract_and_preview({roster!r}, {TRACKMAN_CSV!r}, 90.0)\n"
+        f"print(json.dumps([m for m in {PESADOS!r} if m in sys.modules]))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", codigo], cwd=SCRIPT_DIR,
+                          capture_output=True, text=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]) if proc.returncode == 0 else None
+
+if __name__ == "__main__":
+    roster = sys.argv[1] if len(sys.argv) > 1 else sorted(glob.glob(os.path.join(SCRIPT_DIR, "*.xlsx")))[0]
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    t_help, m_help = medir([sys.executable, MAIN, "--help"], n)
+    t_tools, m_tools = medir([sys.executable, MAIN, roster, "--solo-tools", "--trackman-csv", TRACKMAN_CSV], n)
+    t_bare, _ = medir([sys.executable, "-c", "pass"], n)
+    cargados = modulos_cargados(roster)
+
+    print(f"Roster: {os.path.basename(roster)}  Repeticiones: {n}")
+    print(f"python -c pass:              {t_bare:7.3f} s")
+    print(f"main.py --help:              {t_help:7.3f} s  (mín {m_help:.3f})")
+    print(f"main.py --solo-tools (CSV):  {t_tools:7.3f} s  (mín {m_tools:.3f})")
+    print(f"Módulos pesados cargados en solo Tools: {cargados if cargados is not None else 'error'}")
+    sys.exit(0 if cargados == [] else 1)
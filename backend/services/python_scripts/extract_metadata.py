@@ -4,7 +4,6 @@ import sys
 import logging
 
 from tools import Tools  # Importa la clase desde tools.py
-from backend.services.python_scripts.reports import main as reports_main  # Integración de reportes
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,44 +11,110 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+EXTENSIONES = ('.xlsx', '.xls', '.csv', '.pdf')
+
+# Una sola instancia por proceso: en modo --worker conserva sus cachés entre archivos
+_tools = None
+
+def get_tools() -> Tools:
+    global _tools
+    if _tools is None:
+        _tools = Tools()
+    return _tools
+
 def extract_and_preview(filepath: str) -> dict:
-    tools = Tools()
-    return tools.procesar_archivo(filepath)
+    return get_tools().procesar_archivo(filepath)
+
+def generar_reportes(input_path: str, resultado: dict) -> None:
+    """Genera reportes Batter y Pitcher para las coincidencias Trackman del archivo."""
+    try:
+        # Integración de reportes (import perezoso: es lo más pesado de cargar)
+        from backend.services.python_scripts.reports import main as reports_main
+
+        base = os.path.basename(input_path)
+        datos = resultado.get(base, {}).get("datos_extraidos", {})
+        coincidencias = datos.get("coincidencias_trackman", []) or []
+
+        nombres_filtrados = sorted({
+            c.get("nombre_trackman")
+            for c in coincidencias
+            if c.get("coincidencia") and c.get("nombre_trackman")
+        })
+
+        if nombres_filtrados:
+            logger.info(f"Generando reportes para {len(nombres_filtrados)} coincidencias.")
+            reports_main(
+                batter_filter=nombres_filtrados,
+                pitcher_filter=nombres_filtrados,
+            )
+        else:
+            logger.info("Sin coincidencias válidas. Se omite generación de reportes.")
+    except Exception as e:
+        logger.error(f"Error al generar reportes: {e}")
+
+# --------------------------
+# Modo worker (NDJSON por stdin/stdout)
+# --------------------------
+# Entrada, una línea por archivo: {"id": 1, "path": "/ruta/roster.xlsx", "reports": true}
+# Salida, una línea por petición:  {"id": 1, "ok": true, "result": {...}}
+#                                  {"id": 1, "ok": false, "error": "..."}
+# Al arrancar se emite {"ready": true, "pid": ...}. El proceso termina con EOF en stdin.
+
+def handle_request(req: dict) -> dict:
+    input_path = req.get("path")
+    if not input_path:
+        return {"ok": False, "error": "No se proporcionó la ruta del archivo."}
+    if not input_path.lower().endswith(EXTENSIONES):
+        return {"ok": False, "error": "Solo se permiten archivos .xlsx, .xls, .csv o .pdf en esta ejecución."}
+    resultado = extract_and_preview(input_path)
+    if req.get("reports", True):
+        generar_reportes(input_path, resultado)
+    return {"ok": True, "result": resultado}
+
+def run_worker() -> int:
+    # stdout queda reservado al protocolo; cualquier print va a stderr
+    out = sys.stdout
+    sys.stdout = sys.stderr
+
+    def send(obj: dict) -> None:
+        out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        out.flush()
+
+    get_tools()
+    send({"ready": True, "pid": os.getpid()})
+    logger.info("Worker de metadatos listo.")
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get("id")
+            resp = handle_request(req)
+        except Exception as e:
+            logger.error(f"Error procesando petición {req_id}: {e}")
+            resp = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        send({"id": req_id, **resp})
+    return 0
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        sys.exit(run_worker())
+
     if len(sys.argv) > 1:
         input_path = sys.argv[1]
         ext = input_path.lower()
 
-        if ext.endswith(('.xlsx', '.xls', '.csv', '.pdf')):
+        if ext.endswith(EXTENSIONES):
             try:
                 # 1) Procesamiento inicial
                 resultado = extract_and_preview(input_path)
                 print(json.dumps(resultado, indent=4, ensure_ascii=False))
 
-                # 2) Construcción de filtros a partir de coincidencias Trackman
-                try:
-                    base = os.path.basename(input_path)
-                    datos = resultado.get(base, {}).get("datos_extraidos", {})
-                    coincidencias = datos.get("coincidencias_trackman", []) or []
-
-                    nombres_filtrados = sorted({
-                        c.get("nombre_trackman")
-                        for c in coincidencias
-                        if c.get("coincidencia") and c.get("nombre_trackman")
-                    })
-
-                    if nombres_filtrados:
-                        logger.info(f"Generando reportes para {len(nombres_filtrados)} coincidencias.")
-                        # 3) Ejecución de reportes Batter y Pitcher
-                        reports_main(
-                            batter_filter=nombres_filtrados,
-                            pitcher_filter=nombres_filtrados,
-                        )
-                    else:
-                        logger.info("Sin coincidencias válidas. Se omite generación de reportes.")
-                except Exception as e:
-                    logger.error(f"Error al generar reportes: {e}")
+                # 2) y 3) Filtros a partir de coincidencias Trackman y reportes Batter/Pitcher
+                generar_reportes(input_path, resultado)
 
             except Exception as e:
                 logger.error(f"Error procesando archivo {input_path}: {e}")
@@ -4,11 +4,11 @@ import sys
 import json
 import time
 import argparse
+import multiprocessing
 import logging
 from typing import Optional, List, Dict, Any
 
 from tools import Tools
-import reports
 
 # --------------------------
 # Configuración de logging
@@ -32,19 +32,32 @@ def extract_and_preview(filepath: str, trackman_csv: Optional[str], umbral: floa
 # --------------------------
 # Etapa Reports
 # --------------------------
+def _reports():
+    """reports arrastra matplotlib/seaborn y BigQuery: solo se importa si corre esa etapa."""
+    import reports
+    return reports
+
 def run_reports(df: Optional[Any] = None,
                 local_file: Optional[str] = None,
                 batter_filter: Optional[List[str]] = None,
                 pitcher_filter: Optional[List[str]] = None,
                 work_dir: Optional[str] = None,
-                clean_temp: bool = True) -> dict:
-    return reports.main(
+                clean_temp: bool = True,
+                debug_snapshot: bool = False,
+                run_id: Optional[str] = None,
+                workers: int = 1,
+                render_mode: str = "raster") -> dict:
+    return _reports().main(
         df=df,
         local_file=local_file,
         batter_filter=batter_filter,
         pitcher_filter=pitcher_filter,
         work_dir=work_dir,
-        clean_temp=clean_temp
+        clean_temp=clean_temp,
+        debug_snapshot=debug_snapshot,
+        run_id=run_id,
+        workers=workers,
+        render_mode=render_mode
     )
 
 # --------------------------
@@ -91,6 +104,12 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--pitcher", nargs="*", default=None, help="Lista de pitchers a filtrar en Reports")
     p.add_argument("--work-dir", default=None, help="Directorio base para artefactos (PNG/PDF)")
     p.add_argument("--no-clean-temp", action="store_true", help="No limpiar PNG temporales al final de Reports")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Procesos para generar reportes (0 = todos los núcleos)")
+    p.add_argument("--render-mode", choices=["raster", "vector"], default="raster",
+                   help="raster: imágenes JPG/PNG + FPDF; vector: PDF con gráficas vectoriales (matplotlib)")
+    p.add_argument("--debug-snapshot", action="store_true",
+                   help="Guarda en Parquet el subconjunto de cada jugador (también REPORTS_DEBUG_SNAPSHOT=1)")
     p.add_argument("--solo-tools", action="store_true", help="Ejecuta solo la etapa Tools")
     p.add_argument("--solo-reports", action="store_true", help="Ejecuta solo la etapa Reports")
     p.add_argument("--output", default=None, help="Archivo donde guardar el JSON final")
@@ -116,6 +135,9 @@ def main() -> int:
         if args.trackman_csv and not os.path.isfile(args.trackman_csv):
             logger.error(f"No existe --trackman-csv: {args.trackman_csv}")
             return 1
+    if args.workers < 0:
+        logger.error("--workers debe ser 0 o mayor")
+        return 1
     if args.local_trackman and not os.path.isfile(args.local_trackman):
         logger.error(f"No existe --local-trackman: {args.local_trackman}")
         return 1
@@ -147,7 +169,11 @@ def main() -> int:
                 batter_filter=args.batter,
                 pitcher_filter=args.pitcher,
                 work_dir=args.work_dir,
-                clean_temp=not args.no_clean_temp
+                clean_temp=not args.no_clean_temp,
+                debug_snapshot=args.debug_snapshot,
+                run_id=run_id,
+                workers=args.workers,
+                render_mode=args.render_mode
             )
         except Exception as e:
             logger.exception(f"Fallo en etapa Reports: {e}")
@@ -177,4 +203,5 @@ def main() -> int:
     return exit_code
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     sys.exit(main())
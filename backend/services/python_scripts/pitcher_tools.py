@@ -2,24 +2,34 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from PIL import Image
 import os
+import io
 import fpdf
-import dataframe_image as dfi
-from html2image import Html2Image
+
+import shared_modules  # noqa: F401  (agrega backend/exe a sys.path)
+import density
+import vector_pdf
+import table_render
 
 # -------------------------------------------
 # Conecta BigQuery y descarga datos (solo externo)
 # -------------------------------------------
-from google.cloud import bigquery
-import google.auth
-from google.cloud import bigquery_storage
 
 # os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "baseballlmb-key.json"
-credentials, your_project_id = google.auth.default(
-    scopes=["https://www.googleapis.com/auth/cloud-platform"]
-)
-bqstorageclient = bigquery_storage.BigQueryReadClient(credentials=credentials)
-client = bigquery.Client()
+# clientes perezosos: solo el proceso que consulta importa google.cloud y se autentica
+_clients = None
+
+def _get_clients():
+    global _clients
+    if _clients is None:
+        from google.cloud import bigquery, bigquery_storage
+        import google.auth
+        credentials, your_project_id = google.auth.default(
+            scopes=["https://www.googleapis.com/auth/cloud-platform"]
+        )
+        _clients = (bigquery.Client(), bigquery_storage.BigQueryReadClient(credentials=credentials))
+    return _clients
 
 def _external_load_pitcher_stats():
     query = '''
@@ -40,8 +50,18 @@ def _external_load_pitcher_stats():
             auto_pitch_type_2
         FROM baseballlmb.trackman_db.pitchers_stats_2025
     '''
+    client, bqstorageclient = _get_clients()
     return client.query(query).result().to_dataframe(bqstorage_client=bqstorageclient)
 
+# Estadísticas de pitchers: una consulta por proceso
+_pitcher_stats = None
+
+def load_pitcher_stats(refresh=False):
+    global _pitcher_stats
+    if _pitcher_stats is None or refresh:
+        _pitcher_stats = _external_load_pitcher_stats()
+    return _pitcher_stats
+
 # -------------------------------------------
 
 dir_temp = 'Pitcher\\'                    # Carpeta temporal
@@ -52,12 +72,48 @@ def get_last_games(df_games, pitcher):
     last_games = sorted(d_t.id_path.unique())[-5:]
     return d_t[d_t['id_path'].isin(last_games)]
 
+def get_last_games_all(df_games, n=5):
+    """Igual que get_last_games pero para todos los pitchers a la vez."""
+    d_t = df_games.sort_index()
+    games = d_t[['Pitcher','id_path']].drop_duplicates().sort_values(['Pitcher','id_path'])
+    games = games[games.groupby('Pitcher').cumcount(ascending=False) < n]
+    keep = pd.MultiIndex.from_frame(d_t[['Pitcher','id_path']]).isin(pd.MultiIndex.from_frame(games))
+    return d_t[keep]
+
+def precompute_pitcher_aggregates(df_games):
+    """
+    Calcula una sola vez, para toda la liga, lo que create_report_full necesita:
+    últimos juegos, equipo, % de uso y rangos de velocidad/spin por pitcher.
+    """
+    last = get_last_games_all(df_games)
+    df_team = last.sort_values(['Pitcher', 'fecha_carga'], ascending=[True, False]).drop_duplicates(subset='Pitcher', keep='first')
+    df_perc = (last.groupby('Pitcher').AutoPitchType.value_counts()/last.groupby('Pitcher').size()*100).round(2).unstack()
+    # cuantiles y medias vectorizados por (Pitcher, AutoPitchType), sin lambdas por grupo
+    grupos = last.groupby(['Pitcher','AutoPitchType'], observed=True)
+    df_rango = grupos.RelSpeed.quantile([0.1, 0.9]).unstack()
+    df_rango.columns = ['min','max']
+    df_medias = grupos.agg({'RelSpeed':'mean', 'SpinRate':'median'})
+    df_medias.columns = ['mean','Spin']
+    df_range_mean_2 = df_rango.join(df_medias).fillna(0).round().astype(int)
+    df_range_mean_2['rango'] = df_range_mean_2['min'].astype(str)+'-'+df_range_mean_2['max'].astype(str)
+    return {
+        'last_games': last,
+        'rows': last.groupby('Pitcher', sort=False).indices,
+        'teams': df_team.set_index('Pitcher')['PitcherTeam'],
+        'perc': df_perc,
+        'range_mean': df_range_mean_2,
+    }
+
+def get_pitcher_games(aggregates, pitcher):
+    """Últimos juegos del pitcher a partir de los agregados de liga."""
+    return aggregates['last_games'].iloc[aggregates['rows'][pitcher]]
+
 def get_perc_shot(pitcher, df_perc):
     return df_perc.loc[pitcher].dropna()
 
 def get_range_mean(pitcher, df_range_mean_2):
-    temp = df_range_mean_2.query('Pitcher == @pitcher').drop(['min','max'],axis=1)
-    return temp[['rango','mean','Spin']]
+    # [[pitcher]] conserva el nivel Pitcher que usa get_table_1
+    return df_range_mean_2.loc[[pitcher], ['rango','mean','Spin']]
 
 def get_table_1(t1,t2):
     t3 = t2.join(t1).rename(columns={'rango':'Range','mean':'Común',t2.index[0][0]:'%Uso'})
@@ -86,7 +142,26 @@ def scatter_pitcher(df_table, pitcher, auto_all, colours):
     plt.xlabel('')
     return fig1
 
-def pie_charts(dict_df_cond, dict_cond, pitcher, side):
+def pitch_mix_by_condition(df_table, dict_cond):
+    """
+    Conteos de AutoPitchType por situación en un solo groupby.
+    dict_cond: {título: máscara booleana}; una fila cuenta en cada situación que cumple.
+    Regresa índice (Pitcher, Situacion, AutoPitchType) y columnas BatterSide; por pitcher se lee con .loc.
+    """
+    flags = [f'_cond{i}' for i in range(len(dict_cond))]
+    df_keys = df_table[['Pitcher', 'AutoPitchType', 'BatterSide']].assign(
+        **{flag: mask.to_numpy() for flag, mask in zip(flags, dict_cond.values())})
+    counts = df_keys.groupby(['Pitcher', 'AutoPitchType', 'BatterSide'] + flags, observed=True).size()
+
+    # cada situación suma las combinaciones donde su bandera es True
+    por_situacion = [counts[counts.index.get_level_values(flag)]
+                     .groupby(level=['Pitcher', 'AutoPitchType', 'BatterSide'], observed=True).sum()
+                     for flag in flags]
+    mix = pd.concat(por_situacion, keys=list(dict_cond.keys()), names=['Situacion'])
+    mix = mix.reorder_levels(['Pitcher', 'Situacion', 'AutoPitchType', 'BatterSide'])
+    return mix.unstack('BatterSide').sort_index()
+
+def pie_charts(pitch_mix, dict_cond, pitcher, side):
     dict_colors = {'Sinker': 'royalblue', 'Cambios': 'darkorange', 'Cutter': 'g', 'Slider': 'firebrick',
                    'Rectas': 'mediumpurple', 'Curva': 'saddlebrown', 'Splitter': 'grey', 'Other': 'white', np.nan:'white'}
     plt.rcParams['font.size'] = 25
@@ -95,9 +170,10 @@ def pie_charts(dict_df_cond, dict_cond, pitcher, side):
     fig = plt.figure(figsize=(20,10))
     for i in range(1,4):
         ax = plt.subplot(1,3,i)
-        df_div = dict_df_cond[i]
-        df_query = df_div.query('Pitcher == @pitcher').droplevel(0)
-        df_plot = df_query[side].dropna()
+        try:
+            df_plot = pitch_mix.loc[(pitcher, list_title[i-1]), side].dropna()
+        except KeyError:
+            df_plot = pd.Series(dtype=float)
         total = df_plot.sum()
         serie_temp = df_plot/total
         idx_drop = serie_temp[serie_temp < 0.03].index
@@ -149,36 +225,49 @@ def pitcher_view_scatter(df_table, pitcher, side, colours):
         plt.ylim(y_low - 0.5, y_high + 0.5)
         plt.axis('off')
         if len(df_filtered) > 0:
-            sns.kdeplot(x=df_filtered["PlateLocSide"], y=df_filtered["PlateLocHeight"], fill=True,
-                        cmap='coolwarm', alpha=0.6, bw_adjust=0.4, thresh=0.1, ax=ax)
+            density.kde_fill(ax, df_filtered["PlateLocSide"], df_filtered["PlateLocHeight"],
+                             cmap='coolwarm', alpha=0.6, bw_adjust=0.4, thresh=0.1)
             ax.tick_params(axis='both',which='both',bottom=False,top=False,left=False,right=False,
                            labelbottom=False,labelleft=False)
             sns.despine(top=True, right=True, left=True, bottom=True, ax=ax)
         plt.tight_layout()
     return fig
 
+# th: 2px arriba/izquierda/derecha; td: 1px izquierda/derecha/abajo; columna Pitches en negritas
+PITCHER_TABLE_STYLE = table_render.TableStyle(header_edges="TLR", cell_edges="BLR", bold_columns=('Pitches',))
+
 def create_style_launcherbyteam(df_temp):
-    styles = [dict(selector="th", props=[("font-size","200%"),("text-align","center"),
-                                         ('border-top','2px solid black'),('border-left','2px solid black'),
-                                         ('border-right','2px solid black')]),
-              dict(selector="td", props=[("font-size","200%"),("text-align","center"),
-                                         ('border-left','1px solid black'),('border-right','1px solid black'),
-                                         ('border-bottom','1px solid black')]),
-              dict(selector="caption", props=[("caption-side","bottom")]),
-              dict(selector="table", props=[('border-collapse','collapse'),('width','100%')])]
     df_temp = df_temp.reset_index().rename(columns={'index': 'Pitches'})
-    return df_temp.style.set_table_styles(styles).applymap(lambda v: 'font-weight: bold', subset=['Pitches'])
+    return table_render.StyledTable(df_temp, PITCHER_TABLE_STYLE)
 
-def from_df_to_tablepng(pitcher_name, dir_temp, df_temp, name):
-    os.makedirs(dir_temp, exist_ok=True)
+def _savefig_rgb(fig, path, **kwargs):
+    # PNG sin canal alfa (el fondo es opaco): fpdf separa el alfa de un RGBA en Python
+    # píxel por píxel, y eso se llevaba ~90% del tiempo de cada reporte
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', **kwargs)
+    buf.seek(0)
+    Image.open(buf).convert('RGB').save(path, format='PNG')
+
+def from_df_to_tablepng(pitcher_name, dir_temp, table, name, figures=None):
+    fig = table_render.table_figure(table)
     output_path = os.path.join(dir_temp, name + ".png")
-    df_temp = df_temp.hide(axis='index')
-    dfi.export(df_temp, output_path, table_conversion="html2image", fontsize=14)
+    if figures is not None:
+        figures[output_path] = vector_pdf.VectorChart(fig, 0)
+        plt.close(fig)
+        return
+    os.makedirs(dir_temp, exist_ok=True)
+    _savefig_rgb(fig, output_path, dpi=200, bbox_inches='tight', pad_inches=0)
+    plt.close(fig)
 
-def save_fig(dir_temp, pitcher_name, chart, chart_name, dpi=200):
+def save_fig(dir_temp, pitcher_name, chart, chart_name, dpi=200, figures=None):
     dir_ = os.path.join(dir_temp, pitcher_name)
+    if figures is not None:
+        # modo vectorial: la Figure queda bajo la misma ruta que create_report pediría a disco
+        figures[os.path.join(dir_, chart_name+'.png')] = vector_pdf.VectorChart(chart, 0)
+        plt.close(chart)
+        return
     os.makedirs(dir_, exist_ok=True)
-    chart.savefig(os.path.join(dir_, chart_name), dpi=dpi, bbox_inches='tight', pad_inches=0)
+    _savefig_rgb(chart, os.path.join(dir_, chart_name+'.png'), dpi=dpi, bbox_inches='tight', pad_inches=0)
     plt.close(chart)
 
 def get_img_team(team_name):
@@ -188,9 +277,9 @@ def get_img_team(team_name):
     else:
         return df_temp[df_temp.equipo_abreviado == team_name]['ruta'].iloc[0]
 
-def create_report(pitcher_name, team, dir_images, output_path, tt, dict_short):
+def create_report(pitcher_name, team, dir_images, output_path, tt, dict_short, figures=None):
     team_temp = dict_short.get(team, team)
-    pdf = fpdf.FPDF()
+    pdf = vector_pdf.VectorPDF(figures) if figures is not None else fpdf.FPDF()
     pdf.add_page()
     pdf.set_font('Times', 'B', 22)
     pdf.cell(0, 8, 'Pitcher: '+pitcher_name+', '+team_temp, border=0, ln=2, align='C')
@@ -202,47 +291,56 @@ def create_report(pitcher_name, team, dir_images, output_path, tt, dict_short):
     pdf.image(os.path.join(dir_homeplate,'home_plate.jpg'), x=90, y=235, w=40, h=12)
     pdf.image(os.path.join(dir_images,'scatter_right.png'), x=1, y=250, w=210, h=45)
     dir_output = os.path.dirname(dir_images)
+    os.makedirs(dir_output, exist_ok=True)  # en modo vectorial no se escribió nada antes
     pdf.output(os.path.join(dir_output, pitcher_name+'.pdf'), dest='F')
     return os.path.join(output_path, pitcher_name+'.pdf')
 
 # -------------------------------------------
-# SOLO EXTERNO: create_report_full carga desde BigQuery
+# create_report_full: usa agregados de liga precalculados
 # -------------------------------------------
-def create_report_full(pitcher_name, dict_df_cond, dict_cond, dict_short):
-    # Carga externa
-    df_table_all = _external_load_pitcher_stats()
-    # Subconjunto del pitcher y últimos juegos
-    df_table = get_last_games(df_table_all, pitcher_name)
+def create_report_full(pitcher_name, pitch_mix, dict_cond, dict_short,
+                       df_table=None, work_dir=None, aggregates=None, render_mode='raster'):
+    """
+    Genera el PDF de un pitcher. `pitch_mix` viene de pitch_mix_by_condition y
+    `aggregates` de precompute_pitcher_aggregates;
+    si no se pasa, se calcula (y se consulta BigQuery) una sola vez por proceso.
+    `df_table` se acepta por compatibilidad: la tabla y los scatter salen de pitchers_stats.
+    Con render_mode='vector' las gráficas no pasan a PNG: se dibujan como vectores en el PDF.
+    """
+    if aggregates is None:
+        aggregates = _league_aggregates()
+    base_dir = os.path.join(work_dir, 'Pitcher') if work_dir else dir_temp
 
-    # Equipo más reciente
-    df_team = df_table.sort_values(['Pitcher', 'fecha_carga'], ascending=[True, False]).drop_duplicates(subset='Pitcher', keep='first')
-    team = df_team.loc[df_team['Pitcher'] == pitcher_name, 'PitcherTeam'].values[0]
+    # Subconjunto del pitcher (últimos juegos) y equipo más reciente
+    df_pitcher = get_pitcher_games(aggregates, pitcher_name)
+    team = aggregates['teams'].loc[pitcher_name]
 
     # Tabla de % uso y rangos
-    df_perc = (df_table.groupby('Pitcher').AutoPitchType.value_counts()/df_table.groupby('Pitcher').size()*100).round(2).unstack()
-    t1 = get_perc_shot(pitcher_name, df_perc)
-
-    df_range_mean_2 = df_table.groupby(['Pitcher','AutoPitchType']).agg({'RelSpeed':[lambda x: np.quantile(x,0.1),
-                                                                                     lambda x: np.quantile(x,0.9),
-                                                                                     'mean'],
-                                                                         'SpinRate':'median'}).fillna(0).round().astype(int)
-    df_range_mean_2.columns = ['min','max','mean','Spin']
-    df_range_mean_2['rango'] = df_range_mean_2['min'].astype(str)+'-'+df_range_mean_2['max'].astype(str)
-    t2 = get_range_mean(pitcher_name, df_range_mean_2)
+    t1 = get_perc_shot(pitcher_name, aggregates['perc'])
+    t2 = get_range_mean(pitcher_name, aggregates['range_mean'])
 
-    html_temp = create_style_launcherbyteam(get_table_1(t1,t2))
-    from_df_to_tablepng(pitcher_name, os.path.join(dir_temp, team, pitcher_name), html_temp, 'table_1')
+    figures = {} if render_mode == 'vector' else None
+    table_1 = create_style_launcherbyteam(get_table_1(t1,t2))
+    from_df_to_tablepng(pitcher_name, os.path.join(base_dir, team, pitcher_name), table_1, 'table_1', figures=figures)
 
-    auto_all = df_table.AutoPitchType.unique().tolist()
+    auto_all = df_pitcher.AutoPitchType.unique().tolist()
     colours = dict(zip(auto_all, plt.cm.tab10.colors[:len(auto_all)]))
 
-    save_fig(os.path.join(dir_temp, team), pitcher_name, scatter_pitcher(df_table,pitcher_name,auto_all,colours), 'scatter_mov')
-    save_fig(os.path.join(dir_temp, team), pitcher_name, pie_charts(dict_df_cond,dict_cond,pitcher_name,'Left'), 'pie_left')
-    save_fig(os.path.join(dir_temp, team), pitcher_name, pie_charts(dict_df_cond,dict_cond,pitcher_name,'Right'), 'pie_right')
-    save_fig(os.path.join(dir_temp, team), pitcher_name, pitcher_view_scatter(df_table,pitcher_name,'Left',colours), 'scatter_left')
-    save_fig(os.path.join(dir_temp, team), pitcher_name, pitcher_view_scatter(df_table,pitcher_name,'Right',colours), 'scatter_right')
+    save_fig(os.path.join(base_dir, team), pitcher_name, scatter_pitcher(df_pitcher,pitcher_name,auto_all,colours), 'scatter_mov', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pie_charts(pitch_mix,dict_cond,pitcher_name,'Left'), 'pie_left', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pie_charts(pitch_mix,dict_cond,pitcher_name,'Right'), 'pie_right', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pitcher_view_scatter(df_pitcher,pitcher_name,'Left',colours), 'scatter_left', figures=figures)
+    save_fig(os.path.join(base_dir, team), pitcher_name, pitcher_view_scatter(df_pitcher,pitcher_name,'Right',colours), 'scatter_right', figures=figures)
 
-    num_pitches = df_table[df_table.Pitcher == pitcher_name].AutoPitchType.nunique()
+    num_pitches = df_pitcher.AutoPitchType.nunique()
     tt = 60 if num_pitches <= 4 else num_pitches*12
-    dir_images = os.path.join(dir_temp, team, pitcher_name)
-    return create_report(pitcher_name, team, dir_images, dir_images, tt, dict_short)
+    dir_images = os.path.join(base_dir, team, pitcher_name)
+    return create_report(pitcher_name, team, dir_images, dir_images, tt, dict_short, figures)
+
+_aggregates = None
+
+def _league_aggregates():
+    global _aggregates
+    if _aggregates is None:
+        _aggregates = precompute_pitcher_aggregates(load_pitcher_stats())
+    return _aggregates
@@ -1,19 +1,22 @@
 # reports.py
 import os
 import glob
-import unicodedata
-from typing import List, Optional, Dict, Any
+import shutil
+import tempfile
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
 
 import pandas as pd
 import numpy as np
 import logging
 
-from google.cloud import bigquery
-import google.auth
-from google.cloud import bigquery_storage
-
 import batter_tools as bt
 import pitcher_tools as pt
+import shared_modules  # noqa: F401  (agrega backend/exe a sys.path)
+import debug_snapshot as ds
+from player_names import clean_name, clean_name_series
+import vector_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -21,19 +24,6 @@ logger = logging.getLogger(__name__)
 # Utilidades
 # -------------------------------
 
-def clean_name(name: str) -> str:
-    if not name:
-        return "Sin_nombre"
-    parts = [p.strip() for p in str(name).split(",")]
-    if len(parts) >= 2:
-        rearranged = f"{parts[-1]} {parts[0]}".strip()
-    else:
-        rearranged = parts[0]
-    rearranged = " ".join(rearranged.title().split())
-    normalized = unicodedata.normalize("NFKD", rearranged)
-    return "".join(c for c in normalized if not unicodedata.combining(c))
-
-
 def clean_directory(base_subdir: str, base_path: Optional[str] = None) -> None:
     """
     Elimina PNG temporales generados en los reportes.
@@ -72,6 +62,10 @@ def clean_directory(base_subdir: str, base_path: Optional[str] = None) -> None:
                         except OSError:
                             pass
 
+def _snapshot_player(df: pd.DataFrame, column: str, name: str, tag: str) -> None:
+    """Snapshot de depuración del subconjunto del jugador (solo si está activado)."""
+    if ds.is_enabled():
+        ds.snapshot(df[df[column] == name], tag=tag, player=name)
 
 def _normalize_person_list(names: Optional[List[str]]) -> Optional[List[str]]:
     """
@@ -194,6 +188,9 @@ def load_trackman_dataframe(query: str = BQ_DEFAULT_QUERY) -> pd.DataFrame:
     Carga datos desde BigQuery.
     Requiere GOOGLE_APPLICATION_CREDENTIALS o entorno autenticado.
     """
+    from google.cloud import bigquery, bigquery_storage
+    import google.auth
+
     client = bigquery.Client()
     query_job = client.query(query)
 
@@ -208,14 +205,184 @@ def load_trackman_dataframe(query: str = BQ_DEFAULT_QUERY) -> pd.DataFrame:
     if df.empty:
         raise RuntimeError("BigQuery no devolvió registros.")
 
+    return _normalize_names(df)
+
+def load_local_dataframe(path: str) -> pd.DataFrame:
+    """Carga datos de juego desde un CSV/Parquet local con las mismas columnas que la consulta."""
+    if path.lower().endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, low_memory=False)
+
+    if df.empty:
+        raise RuntimeError(f"El archivo local no tiene registros: {path}")
+
+    return _normalize_names(df)
+
+def _normalize_names(df: pd.DataFrame) -> pd.DataFrame:
     # Normalización de nombres
     if "Batter" in df.columns:
-        df["Batter"] = df["Batter"].apply(clean_name)
+        df["Batter"] = clean_name_series(df["Batter"])
     if "Pitcher" in df.columns:
-        df["Pitcher"] = df["Pitcher"].apply(clean_name)
-
+        df["Pitcher"] = clean_name_series(df["Pitcher"])
     return df
 
+# -------------------------------
+# Pool de procesos
+# -------------------------------
+
+# entradas compartidas del pool: con fork se heredan, con spawn se leen de archivos Arrow
+_POOL_STATE: Dict[str, Any] = {}
+
+def _batter_report_one(nombre: str, inputs: Dict[str, Any], work_dir: Optional[str],
+                       render_mode: str = "raster") -> Optional[str]:
+    _snapshot_player(inputs["df_games"], "Batter", nombre, tag="batter_report")
+    return bt.create_report_full(
+        nombre, dict_baseball_teams_short,
+        df_stats=inputs["df_stats"],
+        df_games=inputs["df_games"],
+        work_dir=work_dir,
+        render_mode=render_mode,
+    )
+
+def _pitcher_report_one(name: str, inputs: Dict[str, Any], work_dir: Optional[str],
+                        render_mode: str = "raster") -> Optional[str]:
+    _snapshot_player(inputs["df_table"], "Pitcher", name, tag="pitcher_report")
+    return pt.create_report_full(
+        pitcher_name=name,
+        pitch_mix=inputs["pitch_mix"],
+        dict_cond=inputs["dict_cond"],
+        dict_short=dict_baseball_teams_short,
+        df_table=inputs["df_table"],
+        work_dir=work_dir,
+        aggregates=inputs["aggregates"],
+        render_mode=render_mode,
+    )
+
+# tipo de reporte -> (generación de un reporte, error con el que se omite al jugador)
+_POOL_KINDS = {
+    "batter": (_batter_report_one, FileNotFoundError),
+    "pitcher": (_pitcher_report_one, KeyError),
+}
+
+def _effective_workers(workers: Optional[int], n_players: int) -> int:
+    """Número de procesos a usar: 0/None = todos los núcleos; nunca más que jugadores."""
+    if not workers:
+        workers = os.cpu_count() or 1
+    return max(1, min(int(workers), n_players))
+
+def _write_arrow_inputs(value: Any, tmp_dir: str) -> Any:
+    """
+    Copia de `value` donde cada DataFrame/Series (también dentro de dicts) se
+    reemplaza por un archivo Arrow IPC; índice y nombres se guardan para reconstruirlo.
+    """
+    if isinstance(value, dict):
+        return {key: _write_arrow_inputs(v, tmp_dir) for key, v in value.items()}
+    if not isinstance(value, (pd.DataFrame, pd.Series)):
+        return value
+    is_series = isinstance(value, pd.Series)
+    frame = value.to_frame("__values") if is_series else value
+    index_cols = [f"__index_{i}" for i in range(frame.index.nlevels)]
+    path = os.path.join(tmp_dir, f"{len(os.listdir(tmp_dir))}.arrow")
+    frame.rename_axis(index_cols).reset_index().to_feather(path)
+    return {"__arrow__": path, "index_cols": index_cols, "index_names": list(value.index.names),
+            "columns_name": None if is_series else value.columns.name,
+            "series_name": value.name if is_series else None, "is_series": is_series}
+
+def _read_arrow_inputs(value: Any) -> Any:
+    """Inverso de _write_arrow_inputs (se ejecuta en cada worker)."""
+    if not isinstance(value, dict):
+        return value
+    if "__arrow__" not in value:
+        return {key: _read_arrow_inputs(v) for key, v in value.items()}
+    frame = pd.read_feather(value["__arrow__"]).set_index(value["index_cols"])
+    frame = frame.rename_axis(value["index_names"])
+    if value["is_series"]:
+        return frame["__values"].rename(value["series_name"])
+    frame.columns.name = value["columns_name"]
+    return frame
+
+def _init_pool_worker(kind: str, arrow_inputs: Optional[Dict[str, Any]], work_dir: Optional[str],
+                      render_mode: str, snapshot_enabled: bool, run_id: Optional[str]) -> None:
+    """Initializer del pool. Con fork el estado ya viene heredado; con spawn se lee de los archivos Arrow."""
+    ds.enable(snapshot_enabled)
+    ds.start_run(run_id)
+    if arrow_inputs is not None:
+        _POOL_STATE.update(_read_arrow_inputs(arrow_inputs))
+    _POOL_STATE["kind"] = kind
+    _POOL_STATE["work_dir"] = work_dir
+    _POOL_STATE["render_mode"] = render_mode
+
+def _pool_worker(name: str) -> Tuple[str, Optional[str], bool]:
+    """Genera un reporte dentro del pool. Regresa (nombre, ruta, omitido)."""
+    report_one, skip_error = _POOL_KINDS[_POOL_STATE["kind"]]
+    try:
+        return name, report_one(name, _POOL_STATE, _POOL_STATE["work_dir"], _POOL_STATE["render_mode"]), False
+    except skip_error:
+        return name, None, True
+
+def _run_reports(kind: str,
+                 names: List[str],
+                 inputs: Dict[str, Any],
+                 work_dir: Optional[str],
+                 workers: int = 1,
+                 render_mode: str = "raster") -> Tuple[int, List[str]]:
+    """
+    Genera los reportes de `names` en orden; regresa (generados, rutas).
+    Con `workers` > 1 los reparte en un ProcessPoolExecutor sin serializar los DataFrames:
+    con fork los workers heredan `inputs`; con spawn se escriben una vez a archivos
+    Arrow IPC y cada worker los lee.
+    """
+    report_one, skip_error = _POOL_KINDS[kind]
+    generated = 0
+    artefactos: List[str] = []
+    workers = _effective_workers(workers, len(names))
+
+    use_fork = "fork" in mp.get_all_start_methods()
+    tmp_dir, arrow_inputs = None, None
+    if workers > 1 and not use_fork:
+        tmp_dir = tempfile.mkdtemp(prefix=f"{kind}_pool_")
+        try:
+            arrow_inputs = _write_arrow_inputs(inputs, tmp_dir)
+        except Exception as e:
+            # columnas con tipos mezclados que Arrow no acepta: se sigue en serie
+            logger.warning(f"_run_reports: no se pudo escribir el archivo Arrow ({e}); se generará en serie")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir, workers = None, 1
+
+    if workers <= 1:
+        for name in names:
+            try:
+                path = report_one(name, inputs, work_dir, render_mode)
+            except skip_error:
+                continue
+            if path:
+                artefactos.append(path)
+            generated += 1
+        return generated, artefactos
+
+    if use_fork:
+        _POOL_STATE.update(inputs)
+    # borrar log
+    logger.info(f"_run_reports: {len(names)} reportes ({kind}) en {workers} procesos (fork={use_fork})") # borrar log
+    try:
+        ctx = mp.get_context("fork" if use_fork else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_pool_worker,
+                                 initargs=(kind, arrow_inputs, work_dir, render_mode,
+                                           ds.is_enabled(), ds.current_run())) as pool:
+            for name, path, skipped in pool.map(_pool_worker, names):
+                if skipped:
+                    continue
+                if path:
+                    artefactos.append(path)
+                generated += 1
+    finally:
+        _POOL_STATE.clear()
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return generated, artefactos
+
 # -------------------------------
 # Flujo Batter
 # -------------------------------
@@ -223,7 +390,9 @@ def load_trackman_dataframe(query: str = BQ_DEFAULT_QUERY) -> pd.DataFrame:
 def run_batter_reports(df: pd.DataFrame,
                        batter_filter: Optional[List[str]] = None,
                        work_dir: Optional[str] = None,
-                       clean_temp: bool = True) -> Dict[str, Any]:
+                       clean_temp: bool = True,
+                       workers: int = 1,
+                       render_mode: str = "raster") -> Dict[str, Any]:
     df_games = df.copy()
     df_games.dropna(subset=["BatterId"], inplace=True)
 
@@ -256,28 +425,9 @@ def run_batter_reports(df: pd.DataFrame,
     df_games.dropna(subset=["auto_pitch_type_2"], inplace=True)
 
     nombres = df_stats.index.tolist()
-    generated = 0
-    artefactos: List[str] = []
-
-    for nombre in nombres:
-        try:
-            path = bt.create_report_full(
-                nombre, df_stats, df_games, dict_baseball_teams_short,
-                work_dir=work_dir
-            )
-            if path:
-                artefactos.append(path)
-            generated += 1
-        except TypeError:
-            try:
-                path = bt.create_report_full(nombre, df_stats, df_games, dict_baseball_teams_short)
-                if path:
-                    artefactos.append(path)
-                generated += 1
-            except FileNotFoundError:
-                continue
-        except FileNotFoundError:
-            continue
+    generated, artefactos = _run_reports(
+        "batter", nombres, {"df_stats": df_stats, "df_games": df_games}, work_dir, workers, render_mode
+    )
 
     if clean_temp:
         base = os.path.join(work_dir, "Batter") if work_dir else None
@@ -291,7 +441,9 @@ def run_batter_reports(df: pd.DataFrame,
 def run_pitcher_reports(df: pd.DataFrame,
                         pitcher_filter: Optional[List[str]] = None,
                         work_dir: Optional[str] = None,
-                        clean_temp: bool = True) -> Dict[str, Any]:
+                        clean_temp: bool = True,
+                        workers: int = 1,
+                        render_mode: str = "raster") -> Dict[str, Any]:
     df_games = df.copy()
 
     pitcher_filter = _normalize_person_list(pitcher_filter)
@@ -320,14 +472,7 @@ def run_pitcher_reports(df: pd.DataFrame,
     cond3 = df_table["Strikes"] == 2
 
     dict_cond = {"1er Pitcheo": cond1, "General": cond2, "2 Strikes": cond3}
-    dict_df_cond: Dict[int, pd.DataFrame] = {}
-    for i, cond in enumerate(dict_cond.values(), start=1):
-        df_cond = df_table[cond]
-        if df_cond.empty:
-            dict_df_cond[i] = pd.DataFrame()
-            continue
-        df_temp_num = df_cond.groupby(["Pitcher", "BatterSide", "AutoPitchType"]).size()
-        dict_df_cond[i] = df_temp_num.unstack(1)
+    pitch_mix = pt.pitch_mix_by_condition(df_table, dict_cond)
 
     df_table["team_pitcher"] = df_table.PitcherTeam.map(dict_baseball_teams)
     dict_pitchtype = {
@@ -342,28 +487,14 @@ def run_pitcher_reports(df: pd.DataFrame,
     df_table["auto_pitch_type_2"] = df_table.AutoPitchType.map(dict_pitchtype)
 
     name_pitchers = sorted(df_table.Pitcher.dropna().unique().tolist())
-    generated = 0
-    artefactos: List[str] = []
-
-    for name in name_pitchers:
-        try:
-            path = pt.create_report_full(
-                df_table, name, dict_df_cond, dict_cond, dict_baseball_teams_short,
-                work_dir=work_dir
-            )
-            if path:
-                artefactos.append(path)
-            generated += 1
-        except TypeError:
-            try:
-                path = pt.create_report_full(df_table, name, dict_df_cond, dict_cond, dict_baseball_teams_short)
-                if path:
-                    artefactos.append(path)
-                generated += 1
-            except KeyError:
-                continue
-        except KeyError:
-            continue
+    # agregados de liga (pitchers_stats) una sola vez en el proceso padre
+    inputs = {
+        "df_table": df_table,
+        "pitch_mix": pitch_mix,
+        "dict_cond": dict_cond,
+        "aggregates": pt.precompute_pitcher_aggregates(pt.load_pitcher_stats()),
+    }
+    generated, artefactos = _run_reports("pitcher", name_pitchers, inputs, work_dir, workers, render_mode)
 
     if clean_temp:
         base = os.path.join(work_dir, "Pitcher") if work_dir else None
@@ -379,16 +510,35 @@ def main(df: Optional[pd.DataFrame] = None,
          batter_filter: Optional[List[str]] = None,
          pitcher_filter: Optional[List[str]] = None,
          work_dir: Optional[str] = None,
-         clean_temp: bool = True) -> Dict[str, Dict[str, Any]]:
+         clean_temp: bool = True,
+         debug_snapshot: bool = False,
+         run_id: Optional[str] = None,
+         local_file: Optional[str] = None,
+         workers: int = 1,
+         render_mode: str = "raster") -> Dict[str, Dict[str, Any]]:
     """
     Retorna un resumen con cantidades procesadas y generadas por tipo de reporte.
-    Si df es None, carga datos vía BigQuery.
+    Si df es None, carga `local_file` (CSV/Parquet) o, sin él, datos vía BigQuery.
+    `debug_snapshot` guarda en Parquet el subconjunto de cada jugador (una vez por `run_id`).
+    `workers` > 1 genera los reportes de bateadores y lanzadores en un pool de procesos (0 = todos los núcleos).
+    `render_mode` = "vector" arma los PDF con gráficas vectoriales; "raster" usa PNG + FPDF.
     """
-    if df is None:
+    if render_mode not in vector_pdf.RENDER_MODES:
+        raise ValueError(f"render_mode inválido: {render_mode!r} (opciones: {', '.join(vector_pdf.RENDER_MODES)})")
+    if debug_snapshot:
+        ds.enable(True)
+    ds.start_run(run_id)
+    if df is None and local_file:
+        df = load_local_dataframe(local_file)
+    elif df is None:
         df = load_trackman_dataframe(query=query)
 
-    batter_summary = run_batter_reports(df, batter_filter=batter_filter, work_dir=work_dir, clean_temp=clean_temp)
-    pitcher_summary = run_pitcher_reports(df, pitcher_filter=pitcher_filter, work_dir=work_dir, clean_temp=clean_temp)
+    batter_summary = run_batter_reports(df, batter_filter=batter_filter, work_dir=work_dir,
+                                        clean_temp=clean_temp, workers=workers,
+                                        render_mode=render_mode)
+    pitcher_summary = run_pitcher_reports(df, pitcher_filter=pitcher_filter, work_dir=work_dir,
+                                          clean_temp=clean_temp, workers=workers,
+                                          render_mode=render_mode)
 
     return {
         "batter": {
@@ -0,0 +1,16 @@
+# shared_modules.py
+import os
+import sys
+
+# -------------------------------
+# Módulos compartidos con la app de escritorio
+# -------------------------------
+# debug_snapshot, density, player_names, table_render y vector_pdf viven una sola vez en backend/exe
+# (de ahí los empaqueta PyInstaller). Este árbol los importa de esa carpeta en lugar
+# de mantener copias. Se agrega al final de sys.path para que los módulos propios de
+# python_scripts (reports, batter_tools, pitcher_tools, tools) sigan teniendo prioridad.
+
+EXE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "exe"))
+
+if EXE_DIR not in sys.path:
+    sys.path.append(EXE_DIR)
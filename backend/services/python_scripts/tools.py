@@ -3,9 +3,10 @@ import pandas as pd
 import unicodedata
 import re
 from typing import List, Dict
-import rapidfuzz
+import numpy as np
+from rapidfuzz import fuzz
+from rapidfuzz.process import cdist
 from itertools import zip_longest
-import pdfplumber
 import logging
 
 # Solo obtiene logger, sin configurar global aquí
@@ -16,6 +17,10 @@ class Tools:
     def __init__(self, preview_rows: int = 5):
         self.preview_rows = preview_rows
         self.section_title_pattern = re.compile(r"(catchers|pitchers|infielders|outfielders)", re.IGNORECASE)
+        # nombres Trackman ya normalizados por (ruta, mtime); útil en procesos de larga vida
+        self._cache_nombres_trackman = {}
+        # catálogo Trackman normalizado/simplificado para el matcher
+        self._catalogos = {}
 
     # === normalizar y simplificar ===
     def normalizar_nombre(self, nombre: str) -> str:
@@ -147,6 +152,7 @@ class Tools:
     # === PARTE 2: EXTRACCIÓN DE NOMBRES DESDE PDF ===
     def cargar_pdf(self, filepath: str) -> pd.DataFrame:
         logger.info(f"Extrayendo texto de PDF: {filepath}")
+        import pdfplumber  # solo se necesita para rosters en PDF
         with pdfplumber.open(filepath) as pdf:
             lines = []
             for page in pdf.pages:
@@ -178,40 +184,62 @@ class Tools:
 
     # === PARTE 3: COMPARACIÓN CON TRACKMAN ===
     def cargar_nombres_trackman(self, path_csv: str) -> List[str]:
+        key = (os.path.abspath(path_csv), os.path.getmtime(path_csv))
+        if key in self._cache_nombres_trackman:
+            return list(self._cache_nombres_trackman[key])
         logger.info(f"Cargando nombres de Trackman desde: {path_csv}")
         df = pd.read_csv(path_csv)
         if 'nombre' not in df.columns:
             raise ValueError("El archivo CSV debe contener una columna llamada 'nombre'")
         nombres = [self.normalizar_nombre(n) for n in df['nombre'].astype(str).tolist()]
         logger.info(f"{len(nombres)} nombres cargados desde Trackman")
-        return nombres
-
-    def encontrar_similares(self, nombres_archivo: List[str], nombres_trackman: List[str], umbral: float = 90) -> List[Dict]:
+        self._cache_nombres_trackman = {key: nombres}
+        return list(nombres)
+
+    def _catalogo(self, nombres_trackman: List[str]):
+        """(originales, normalizados, simplificados) del catálogo Trackman, preparados una vez por lista."""
+        key = tuple(nombres_trackman)
+        if key not in self._catalogos:
+            norm_to_orig = {self.normalizar_nombre(n): n for n in nombres_trackman}
+            originales = list(norm_to_orig.values())
+            self._catalogos = {key: (originales, list(norm_to_orig.keys()),
+                                     [self.simplificar_nombre(n) for n in originales])}
+        return self._catalogos[key]
+
+    def encontrar_similares(self, nombres_archivo: List[str], nombres_trackman: List[str], umbral: float = 90,
+                            workers: int = -1) -> List[Dict]:
         logger.info(f"Buscando coincidencias entre {len(nombres_archivo)} nombres de roster y Trackman...")
         coincidencias = []
-        nombres_trackman_normalizados = {self.normalizar_nombre(n): n for n in nombres_trackman}
-
-        for nombre in nombres_archivo:
-            mejor_match = None
-            mejor_score = 0
-            algoritmo = None
-
-            normalizado = self.normalizar_nombre(nombre)
-            for nombre_track_norm, nombre_track_orig in nombres_trackman_normalizados.items():
-                score = rapidfuzz.fuzz.ratio(normalizado, nombre_track_norm)
-                if score > mejor_score:
-                    mejor_score = score
-                    mejor_match = nombre_track_orig
-                    algoritmo = "rapidfuzz.ratio (normalizado)"
-
-            if mejor_score < umbral:
-                simplificado = self.simplificar_nombre(nombre)
-                for nombre_track_norm, nombre_track_orig in nombres_trackman_normalizados.items():
-                    score = rapidfuzz.fuzz.ratio(simplificado, self.simplificar_nombre(nombre_track_orig))
-                    if score > mejor_score:
-                        mejor_score = score
-                        mejor_match = nombre_track_orig
-                        algoritmo = "rapidfuzz.ratio (simplificado)"
+        n = len(nombres_archivo)
+        originales, cat_norm, cat_simpl = self._catalogo(nombres_trackman)
+        idx = np.zeros(n, dtype=int)
+        mejor = np.zeros(n)
+        algoritmos = np.full(n, None, dtype=object)
+
+        if n and originales:
+            # matriz roster × catálogo; argmax toma el primer máximo, como el '>' del ciclo
+            scores = cdist([self.normalizar_nombre(x) for x in nombres_archivo], cat_norm,
+                           scorer=fuzz.ratio, dtype=np.float64, workers=workers)
+            idx = scores.argmax(axis=1)
+            mejor = scores[np.arange(n), idx]
+            algoritmos[mejor > 0] = "rapidfuzz.ratio (normalizado)"
+
+            bajos = np.flatnonzero(mejor < umbral)
+            if len(bajos):
+                scores2 = cdist([self.simplificar_nombre(nombres_archivo[i]) for i in bajos], cat_simpl,
+                                scorer=fuzz.ratio, dtype=np.float64, workers=workers)
+                idx2 = scores2.argmax(axis=1)
+                mejor2 = scores2[np.arange(len(bajos)), idx2]
+                mejora = mejor2 > mejor[bajos]
+                sel = bajos[mejora]
+                idx[sel] = idx2[mejora]
+                mejor[sel] = mejor2[mejora]
+                algoritmos[sel] = "rapidfuzz.ratio (simplificado)"
+
+        for i, nombre in enumerate(nombres_archivo):
+            mejor_score = float(mejor[i]) if mejor[i] > 0 else 0
+            mejor_match = originales[idx[i]] if mejor[i] > 0 else None
+            algoritmo = algoritmos[i]
 
             if mejor_score >= umbral:
                 logger.info(f"✓ Match: '{nombre}' ≈ '{mejor_match}' → {mejor_score:.1f} ({algoritmo})")